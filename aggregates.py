@@ -0,0 +1,301 @@
+# aggregates.py
+"""
+지점-일 병합 테이블의 사전 집계 큐브 (손실 계산 / 대시보드 공용)
+
+- (공간: 지점 | 시도 | 지역구분 | 전국) × (시간: 일 | 월 | 시즌 | 연) × 변수 → sum / count / min / max
+  mean 은 조회할 때 sum / count
+- 지점 × 일 칸만 원본에서 집계하고 나머지는 더 작은 칸을 합쳐서 만듦 (합계/개수는 더하고, min/max 는 다시 min/max)
+- 모든 시간 단위가 연도 안에 들어가므로 연도별로 저장
+  → 원본이 바뀌면 병합 캐시의 연도 파티션 중 내용이 바뀐 연도만 다시 집계
+  → 원본 CSV 서명이 그대로면 manifest 만 보고 병합 테이블은 읽지 않음
+- 조회 결과는 (공간, 시간, 변수, by) 별로 메모리에 보관 → 같은 조회는 dict 조회 + 복사
+
+    cube = load_cube()
+    cube.query("지역구분", "월", LOSS_IRR_COL)                       # loss_engine.monthly_sums 와 같은 표
+    cube.query("전국", "월", "예측발전량_PR가변(kWh)", by=["연도", "월"])   # 월 합계 (장마/비장마로 나뉜 달도 합침)
+    cube.season_ranges(months=(6, 7, 8))                             # 연도별 장마철 시작/종료일
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from artifacts import fingerprint
+from data_store import (DATA_MAP, DATA_POWER, DATA_WEATHER, POWER_COL, POWER_ROW_COL,
+                        cache_path, file_signature, merged_cache, partition_years, read_cache,
+                        resolve_path, sources_fresh)
+from loss_engine import IRR_COL, LOSS_IRR_COL, monsoon_labels, tag_region
+from profiling import stage
+
+CUBE_VERSION = 4
+
+VARIABLES = [IRR_COL, "일강수량(mm)", "평균기온(°C)", POWER_COL, LOSS_IRR_COL]
+
+# 파생 변수 → (값 컬럼, 조건 컬럼): 조건 컬럼이 False 인 행은 값도 결측으로
+DERIVED = {LOSS_IRR_COL: (IRR_COL, POWER_ROW_COL)}
+
+# 공간 단위 → 키 컬럼 (상위 단위 키를 같이 들고 있어야 합쳐 올릴 수 있음)
+SPACE = {
+    "지점":     ["지역구분", "시도", "지점명"],
+    "시도":     ["지역구분", "시도"],
+    "지역구분": ["지역구분"],
+    "전국":     [],
+}
+
+# 시간 단위 → 키 컬럼. 장마철 여부는 지점·일마다 다를 수 있으므로 월/시즌 칸을 나눔
+TIME = {
+    "일":   ["연도", "월", "일시", "장마철여부"],
+    "월":   ["연도", "월", "장마철여부"],
+    "시즌": ["연도", "장마철여부"],
+    "연":   ["연도"],
+}
+
+STATS = ["sum", "count", "min", "max"]
+
+# 프로세스 안에서 연 큐브 (큐브 폴더 → AggregateCube)
+_OPEN = {}
+
+
+# ---------------------------------------------------------
+# 집계
+# ---------------------------------------------------------
+def rollup(cells, keys):
+    """칸들을 keys 기준으로 합침 (sum/count 는 합, min/max 는 min/max)"""
+    if not keys:
+        keys = ["_전체"]
+        cells = cells.assign(_전체=0)
+    out = (
+        cells.groupby(keys, observed=True, dropna=False, sort=True)
+        .agg(sum=("sum", "sum"), count=("count", "sum"), min=("min", "min"), max=("max", "max"))
+        .reset_index()
+    )
+    return out.drop(columns=["_전체"], errors="ignore")
+
+
+def source_columns(variables):
+    """변수 목록을 만드는 데 필요한 병합 테이블 컬럼"""
+    cols = []
+    for var in variables:
+        for col in DERIVED.get(var, (var,)):
+            if col not in cols:
+                cols.append(col)
+    return cols
+
+
+def variable_values(part, var):
+    """변수 값 배열 (파생 변수는 조건 컬럼이 있는 행만)"""
+    if var in DERIVED:
+        col, cond = DERIVED[var]
+        values = pd.to_numeric(part[col], errors="coerce").where(part[cond].astype(bool))
+    else:
+        values = pd.to_numeric(part[var], errors="coerce")
+    return values.to_numpy(dtype="float64")
+
+
+def station_days(part, variables):
+    """병합 테이블 (한 연도) → 지점 × 일 × 변수 칸 (long 형식)"""
+    # monthly_sums 와 같은 기준: 날짜/장마철여부가 없는 행은 제외
+    part = part[part["일시"].notna() & part["장마철여부"].notna()]
+
+    # 지역구분은 시도 종류 수만큼만 tag_region 호출 (시도 NaN → 기타)
+    sido = part["시도"].astype("category")
+    labels = np.array([tag_region(c) for c in sido.cat.categories] + ["기타"], dtype=object)
+
+    keys = pd.DataFrame({
+        "지역구분": labels[sido.cat.codes.to_numpy()],
+        "시도": sido.astype(object).to_numpy(),
+        "지점명": part["지점명"].astype(str).to_numpy(),
+        "연도": part["일시"].dt.year.to_numpy(dtype="int64"),
+        "월": part["일시"].dt.month.to_numpy(dtype="int64"),
+        "일시": part["일시"].dt.normalize().to_numpy(),
+        "장마철여부": monsoon_labels(part["장마철여부"]),
+    })
+    frames = []
+    for var in variables:
+        values = variable_values(part, var)
+        cell = keys.assign(변수=var, sum=np.nan_to_num(values), count=(~np.isnan(values)).astype("int64"),
+                           min=values, max=values)
+        frames.append(cell)
+    cells = pd.concat(frames, ignore_index=True)
+    # 같은 지점·일이 여러 행이면 합침 (보통은 한 행)
+    return rollup(cells, SPACE["지점"] + TIME["일"] + ["변수"])
+
+
+def build_year(part, variables):
+    """한 연도 → {(공간, 시간): 칸}. 지점×일에서 시작해 공간 → 시간 순으로 합쳐 올림"""
+    base = station_days(part, variables)
+    cells = {}
+    for space, space_keys in SPACE.items():
+        cur = base if space == "지점" else rollup(base, space_keys + TIME["일"] + ["변수"])
+        for time, time_keys in TIME.items():
+            if time != "일":
+                cur = rollup(cur, space_keys + time_keys + ["변수"])
+            cells[(space, time)] = cur
+    return cells
+
+
+# ---------------------------------------------------------
+# 큐브
+# ---------------------------------------------------------
+class AggregateCube:
+    """연도별 Parquet 칸 + 조회 메모. 칸은 처음 조회할 때 읽음"""
+
+    def __init__(self, cube_dir, years, variables):
+        self.cube_dir = cube_dir
+        self.years = list(years)
+        self.variables = list(variables)
+        self._cells = {}   # (공간, 시간) → {변수: 칸}
+        self._memo = {}    # (공간, 시간, 변수, by) → 조회 결과
+
+    def _path(self, year, space, time):
+        return os.path.join(self.cube_dir, "cells", str(year), f"{space}_{time}.parquet")
+
+    def _cuboid(self, space, time):
+        if (space, time) not in self._cells:
+            frames = [pd.read_parquet(self._path(y, space, time)) for y in self.years]
+            cells = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+                columns=SPACE[space] + TIME[time] + ["변수"] + STATS)
+            self._cells[(space, time)] = {
+                var: part.drop(columns="변수").reset_index(drop=True)
+                for var, part in cells.groupby("변수", sort=False)
+            }
+        return self._cells[(space, time)]
+
+    def query(self, space, time, variable, by=None):
+        """
+        (공간, 시간) 칸의 sum/count/min/max/mean 표.
+        by 를 주면 그 키들로 다시 합침 (예: 월 칸을 by=["월"] → 연도를 합친 동월 합계)
+        """
+        if space not in SPACE or time not in TIME:
+            raise KeyError(f"공간 {list(SPACE)} / 시간 {list(TIME)} 중 하나: {space}, {time}")
+        key = (space, time, variable, tuple(by) if by is not None else None)
+        if key not in self._memo:
+            cells = self._cuboid(space, time).get(variable)
+            if cells is None:
+                raise KeyError(f"큐브에 없는 변수: {variable} (있는 변수: {self.variables})")
+            if by is not None:
+                cells = rollup(cells, list(by))
+            cells = cells.assign(mean=cells["sum"] / cells["count"].where(cells["count"] > 0))
+            self._memo[key] = cells
+        return self._memo[key].copy()
+
+    def season_ranges(self, months=None):
+        """연도별 장마철 첫날/마지막날 (index 연도, start/end). months 를 주면 그 달 안에서만"""
+        days = self.query("전국", "일", self.variables[0])
+        days = days[days["장마철여부"] == "장마철"]
+        if months is not None:
+            days = days[days["월"].isin(list(months))]
+        return (
+            days.groupby("연도")["일시"].agg(["min", "max"])
+            .rename(columns={"min": "start", "max": "end"})
+        )
+
+
+# ---------------------------------------------------------
+# 생성 / 증분 갱신
+# ---------------------------------------------------------
+def _read_json(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json(path, obj):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+
+
+def write_year(cube_dir, year, cells):
+    """한 연도 칸들을 임시 폴더에 쓰고 교체"""
+    final = os.path.join(cube_dir, "cells", str(year))
+    tmp = final + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    for (space, time), df in cells.items():
+        df.to_parquet(os.path.join(tmp, f"{space}_{time}.parquet"), index=False)
+    shutil.rmtree(final, ignore_errors=True)
+    os.replace(tmp, final)
+
+
+@stage("집계 큐브 갱신")
+def refresh(cube_dir, sources, variables, manifest):
+    """병합 캐시의 연도 파티션 중 지문이 바뀐 연도만 다시 집계 → 새 manifest"""
+    merged_dir = merged_cache(*sources)
+    # 원본이 없으면 merged_cache 에서 예외 → 빈 큐브 폴더를 남기지 않도록 그 뒤에 생성
+    os.makedirs(cube_dir, exist_ok=True)
+    old = (manifest or {}).get("years", {})
+    years = {}
+    for year in partition_years(merged_dir):
+        part = read_cache(merged_dir, filters=[("연도", "==", year)])
+        present = [v for v in variables
+                   if all(c in part.columns for c in DERIVED.get(v, (v,)))]
+        part = part[["지점명", "시도", "일시", "장마철여부"] + source_columns(present)]
+        digest = fingerprint(part, present, CUBE_VERSION)
+        years[str(year)] = {"fingerprint": digest, "variables": present}
+        if old.get(str(year), {}).get("fingerprint") == digest:
+            continue
+        with stage(f"{year}년"):
+            write_year(cube_dir, year, build_year(part, present))
+        print(f"🧊 집계 큐브 {year}년 갱신")
+
+    # 병합 테이블에서 사라진 연도는 삭제
+    for year in set(old) - set(years):
+        shutil.rmtree(os.path.join(cube_dir, "cells", year), ignore_errors=True)
+
+    return {
+        "version": CUBE_VERSION,
+        "variables": list(variables),
+        "sources": {p: file_signature(p) for p in sources},
+        "years": years,
+    }
+
+
+def load_cube(weather_path=DATA_WEATHER, power_path=DATA_POWER, mapping_path=DATA_MAP,
+              variables=VARIABLES):
+    """큐브를 최신 상태로 맞춰서 반환 (원본이 그대로면 manifest 비교만)"""
+    sources = [resolve_path(p) for p in (weather_path, power_path, mapping_path)]
+    cube_dir = cache_path(f"cube-{fingerprint(sources, list(variables))[:12]}")
+    manifest_path = os.path.join(cube_dir, "manifest.json")
+
+    manifest = _read_json(manifest_path)
+    if manifest and manifest.get("version") == CUBE_VERSION:
+        fresh, sigs = sources_fresh(manifest["sources"], sources)
+        if fresh:
+            if sigs != manifest["sources"]:
+                manifest["sources"] = sigs
+                _write_json(manifest_path, manifest)
+            if cube_dir not in _OPEN:
+                _OPEN[cube_dir] = _open(cube_dir, manifest)
+            return _OPEN[cube_dir]
+    else:
+        manifest = None
+
+    manifest = refresh(cube_dir, sources, variables, manifest)
+    _write_json(manifest_path, manifest)
+    _OPEN[cube_dir] = _open(cube_dir, manifest)
+    return _OPEN[cube_dir]
+
+
+def _open(cube_dir, manifest):
+    years = sorted(int(y) for y in manifest["years"])
+    present = [v for v in manifest["variables"]
+               if any(v in e["variables"] for e in manifest["years"].values())]
+    return AggregateCube(cube_dir, years, present)
+
+
+if __name__ == "__main__":
+    import time
+
+    cube = load_cube()
+    print(f"연도 {cube.years} / 변수 {cube.variables}")
+    for space in SPACE:
+        for time_unit in TIME:
+            cube.query(space, time_unit, cube.variables[0])
+            t0 = time.perf_counter()
+            out = cube.query(space, time_unit, cube.variables[0])
+            took = (time.perf_counter() - t0) * 1e6
+            print(f"  {space:<5}× {time_unit:<3}{len(out):>9,}칸  조회 {took:,.0f}µs")
@@ -0,0 +1,138 @@
+# animated_map.py
+"""
+장마철/연간 전체를 재생하는 시간 슬라이더 지도 (Plotly animation frames)
+
+- 지점-일 테이블을 (일 × 지점) float32 배열로 한 번만 펼침 (station_day.StationDayCube)
+- 프레임에는 값이 바뀌는 marker.color / marker.size 만 넣고, 지점 좌표·이름은 기본 trace 에 한 번만
+  → Plotly 가 numpy 배열을 base64 typed array 로 직렬화하므로 365일 × 지점 수도 HTML 하나에 작게 들어감
+- 슬라이더/재생은 브라우저 안에서만 동작 (서버 왕복 없음)
+
+    python animated_map.py 2023                       # 2023 장마 기간, 일강수량
+    python animated_map.py 2023 --period year --value 합계 일사량(MJ/m2)
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from monsoon import MonsoonCalendar
+from station_day import StationDayCube
+
+OUTPUT_DIR = "output"
+
+# 값 컬럼 → (라벨, 단위, 색상 스케일)
+VALUES = {
+    "일강수량(mm)":           ("일강수량", "mm", [[0, "#9ecae1"], [0.4, "#3182bd"], [1, "#08306b"]]),
+    "합계 일사량(MJ/m2)":     ("일사량", "MJ/m²", [[0, "#ffffcc"], [0.5, "#fd8d3c"], [1, "#bd0026"]]),
+    "예측발전량_PR가변(kWh)": ("예측 발전량", "kWh", [[0, "#fed976"], [0.5, "#fd8d3c"], [1, "#bd0026"]]),
+}
+
+
+def period_range(year, period="monsoon", calendar=None):
+    """(시작, 종료). monsoon 이면 data/장마기간.csv 의 참고 기간"""
+    if period == "year":
+        return pd.Timestamp(year, 1, 1), pd.Timestamp(year, 12, 31)
+    calendar = calendar or MonsoonCalendar.load(basis="참고")
+    start, end = calendar.periods()[year]
+    return pd.Timestamp(start), pd.Timestamp(end)
+
+
+# ---------------------------------------------------------
+# 애니메이션 그림
+# ---------------------------------------------------------
+def marker_sizes(arr, vmax, smin=6, smax=40):
+    """값 → 마커 크기 (NaN 은 가장 작게)"""
+    size = np.clip(np.nan_to_num(arr, nan=0.0) / (vmax or 1.0) * (smax - smin) + smin, smin, smax)
+    return size.astype("float32")
+
+
+def build_animation(cube, value_col, title=None, frame_ms=300):
+    import plotly.graph_objects as go
+
+    label, unit, scale = VALUES.get(value_col, (value_col, "", "Viridis"))
+    arr = cube.values[value_col]
+    finite = arr[np.isfinite(arr)]
+    # 모든 프레임 같은 색 범위 (극단값 1% 제외)
+    vmax = float(np.percentile(finite, 99)) if finite.size else 1.0
+    sizes = marker_sizes(arr, vmax)
+    labels = cube.dates.strftime("%Y-%m-%d")
+
+    hover = f"<b>%{{text}}</b><br>{label} : %{{marker.color:.1f}} {unit}<extra></extra>"
+    base = go.Scattermap(
+        lat=cube.lat, lon=cube.lon, text=cube.stations, mode="markers",
+        hovertemplate=hover,
+        marker=dict(color=arr[0], size=sizes[0], colorscale=scale, cmin=0, cmax=vmax,
+                    opacity=0.9, colorbar=dict(title=unit)),
+    )
+    frames = [
+        go.Frame(name=d, data=[go.Scattermap(marker=dict(color=arr[i], size=sizes[i]))], traces=[0])
+        for i, d in enumerate(labels)
+    ]
+
+    play = dict(frame=dict(duration=frame_ms, redraw=True), transition=dict(duration=0),
+                fromcurrent=True, mode="immediate")
+    jump = dict(frame=dict(duration=0, redraw=True), transition=dict(duration=0), mode="immediate")
+    fig = go.Figure(data=[base], frames=frames)
+    fig.update_layout(
+        title=dict(text=title or f"{label} — {labels[0]} ~ {labels[-1]}", font=dict(size=22)),
+        map=dict(style="open-street-map", center=dict(lat=36, lon=128), zoom=6),
+        height=900,
+        margin=dict(l=20, r=20, t=80, b=20),
+        updatemenus=[dict(
+            type="buttons", direction="left", x=0.02, y=0.02, xanchor="left", yanchor="bottom",
+            buttons=[
+                dict(label="▶ 재생", method="animate", args=[None, play]),
+                dict(label="⏸ 정지", method="animate", args=[[None], jump]),
+            ],
+        )],
+        sliders=[dict(
+            active=0, x=0.15, len=0.83, y=0.02, yanchor="bottom",
+            currentvalue=dict(prefix="날짜 : "),
+            steps=[dict(label=d[5:], method="animate", args=[[d], jump]) for d in labels],
+        )],
+    )
+    return fig
+
+
+# ---------------------------------------------------------
+# 실행
+# ---------------------------------------------------------
+def output_path(year, period, value_col):
+    label = VALUES.get(value_col, (value_col,))[0].replace(" ", "_")
+    kind = "장마" if period == "monsoon" else "연간"
+    return os.path.join(OUTPUT_DIR, f"애니메이션_{label}_{kind}_{year}.html")
+
+
+def main(argv=None):
+    from artifacts import BuildGraph
+    from data_store import load_merged
+
+    parser = argparse.ArgumentParser(description="시간 슬라이더 지도 (장마 기간 / 연간)")
+    parser.add_argument("year", type=int)
+    parser.add_argument("--period", choices=["monsoon", "year"], default="monsoon")
+    parser.add_argument("--value", default="일강수량(mm)", choices=list(VALUES))
+    parser.add_argument("--frame-ms", type=int, default=300, help="재생 시 프레임 간격 (ms)")
+    args = parser.parse_args(argv)
+
+    start, end = period_range(args.year, args.period)
+    merged = load_merged(columns=["지점명", "일시", "위도", "경도", args.value], years=[args.year])
+    cube = StationDayCube.from_frame(merged, [args.value], start, end)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    path = output_path(args.year, args.period, args.value)
+    graph = BuildGraph(os.path.join(OUTPUT_DIR, ".build_manifest.json"))
+    graph.target(
+        path,
+        [cube.values[args.value], cube.stations, cube.lat, cube.lon, list(cube.dates.strftime("%Y%m%d")),
+         args.frame_ms, build_animation, marker_sizes],
+        lambda: build_animation(cube, args.value, frame_ms=args.frame_ms)
+        .write_html(path, include_plotlyjs="cdn", auto_play=False),
+    )
+    graph.finish()
+    print(f"🎞️ {len(cube.dates)}일 × {len(cube.stations)}개 지점 → {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,25 +2,31 @@ import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import os
+import sys
 import numpy as np
 
+from artifacts import fingerprint
+from data_store import BASE_DIR, load_table
+from image_batch import ImageJob, render_batch
+from monsoon import MonsoonCalendar
+
 # ===== 경로 설정 =====
-base_path = r"C:\Users\UserK\Documents\GitHub\climate_project\data"
+base_path = os.path.join(BASE_DIR, "data")  # 저장소 data/ (어느 경로에서 실행해도 동일)
 output_dir = os.path.join(base_path, "slides")
-os.makedirs(output_dir, exist_ok=True)
+manifest_path = os.path.join(output_dir, ".render_manifest.json")
+
 
-# ===== 데이터 불러오기 =====
-weather = pd.read_csv(f"{base_path}\\2020~2024.csv", encoding="utf-8")
-pred = pd.read_csv(f"{base_path}\\예측발전량_PR고정_수정.csv", encoding="utf-8")
-coords = pd.read_csv(f"{base_path}\\좌표.csv", encoding="utf-8")
+# ===== 데이터 불러오기 (Parquet 캐시, 일시는 datetime 으로 저장됨) =====
+def load_merged_maps():
+    weather = load_table(os.path.join(base_path, "2020~2024.csv"))
+    pred = load_table(os.path.join(base_path, "예측발전량_PR고정_수정.csv"))
+    coords = load_table(os.path.join(base_path, "좌표.csv"))
 
-# ===== 날짜 처리 =====
-weather["일시"] = pd.to_datetime(weather["일시"], errors="coerce")
-pred["일시"] = pd.to_datetime(pred["일시"], errors="coerce")
+    # ===== 병합 =====
+    merged = pd.merge(pred, weather, on=["지점명", "일시"], how="left")
+    merged = pd.merge(merged, coords, on="지점명", how="left")
+    return merged
 
-# ===== 병합 =====
-merged = pd.merge(pred, weather, on=["지점명", "일시"], how="left")
-merged = pd.merge(merged, coords, on="지점명", how="left")
 
 # ===== 장마철 직접 지정 날짜 =====
 rainy_days_fixed = {
@@ -32,13 +38,7 @@ rainy_days_fixed = {
 }
 
 # ===== 장마 기간 참고용 (비장마 구분용) =====
-rainy_periods = {
-    2020: ("2020-06-24", "2020-08-16"),
-    2021: ("2021-07-03", "2021-07-26"),
-    2022: ("2022-06-23", "2022-07-26"),
-    2023: ("2023-06-25", "2023-07-30"),
-    2024: ("2024-06-23", "2024-07-28"),
-}
+rainy_periods = MonsoonCalendar.load(basis="참고").periods()  # data/장마기간.csv
 
 # ===== 색상 스케일 (진한 색상 적용) =====
 rain_scale = [[0, "#9ecae1"], [0.4, "#3182bd"], [1, "#08306b"]]  # 파랑 계열
@@ -58,7 +58,7 @@ def make_map(data, date, label):
     fig.add_trace(
         go.Scattermap(
             lat=data["위도"], lon=data["경도"],
-            text=[f"{r['지점명']} : {r['일강수량(mm)']}mm" for _, r in data.iterrows()],
+            text=data["지점명"].astype(str) + " : " + data["일강수량(mm)"].astype(str) + "mm",
             hoverinfo="text",
             marker=dict(
                 size=np.clip(data["일강수량(mm)"] / data["일강수량(mm)"].max() * 45 + 6, 6, 45),
@@ -77,7 +77,7 @@ def make_map(data, date, label):
     fig.add_trace(
         go.Scattermap(
             lat=data["위도"], lon=data["경도"],
-            text=[f"{r['지점명']} : {r['예측발전량_PR고정(kWh)']:.2f}kWh" for _, r in data.iterrows()],
+            text=data["지점명"].astype(str) + " : " + data["예측발전량_PR고정(kWh)"].map("{:.2f}".format) + "kWh",
             hoverinfo="text",
             marker=dict(
                 size=np.clip(data["예측발전량_PR고정(kWh)"] / data["예측발전량_PR고정(kWh)"].max() * 45 + 6, 6, 45),
@@ -106,29 +106,51 @@ def make_map(data, date, label):
         margin=dict(l=20, r=20, t=80, b=20)
     )
 
+    return fig
+
+
+# ===== 렌더링 작업 목록 =====
+MAP_COLS = ["지점명", "위도", "경도", "일강수량(mm)", "예측발전량_PR고정(kWh)"]
+
+def map_job(data, date, label):
+    """지도 1장 = (저장 경로, 입력 지문, 그림 생성 함수)"""
     save_path = os.path.join(output_dir, f"{label.replace('-', '_')}.png")
-    fig.write_image(save_path, scale=2)
-    print(f"✅ 저장 완료: {save_path}")
-
-# ===== 지도 생성 =====
-for year, date_str in rainy_days_fixed.items():
-    date = pd.to_datetime(date_str)
-    rain_data = merged[merged["일시"].dt.date == date.date()]
-    if not rain_data.empty:
-        make_map(rain_data, date, f"장마_{year}-{date.month:02d}-{date.day:02d}")
-
-    # 비장마철 구간
-    start, end = pd.to_datetime(rainy_periods[year][0]), pd.to_datetime(rainy_periods[year][1])
-    non_rainy = merged[
-        (merged["일시"].dt.year == year) &
-        ((merged["일시"] < start) | (merged["일시"] > end)) &
-        (merged["일강수량(mm)"].between(0.5, 5))
-    ]
-
-    if not non_rainy.empty:
-        random_day = non_rainy["일시"].sample(1, random_state=42).iloc[0]
-        non_rainy_data = merged[merged["일시"] == random_day]
-        make_map(non_rainy_data, random_day, f"비장마_{year}-{random_day.month:02d}-{random_day.day:02d}")
-
-print("\n🎉 지정한 장마철 및 비장마철 지도 이미지가 모두 생성되었습니다!")
-print(f"📁 저장 위치: {output_dir}")
+    key = fingerprint(data[MAP_COLS], label, rain_scale, power_scale, make_map)
+    return ImageJob(save_path, key, lambda: make_map(data, date, label))
+
+
+def collect_jobs(merged):
+    jobs = []
+    for year, date_str in rainy_days_fixed.items():
+        date = pd.to_datetime(date_str)
+        rain_data = merged[merged["일시"].dt.date == date.date()]
+        if not rain_data.empty:
+            jobs.append(map_job(rain_data, date, f"장마_{year}-{date.month:02d}-{date.day:02d}"))
+
+        # 비장마철 구간
+        start, end = pd.to_datetime(rainy_periods[year][0]), pd.to_datetime(rainy_periods[year][1])
+        non_rainy = merged[
+            (merged["일시"].dt.year == year) &
+            ((merged["일시"] < start) | (merged["일시"] > end)) &
+            (merged["일강수량(mm)"].between(0.5, 5))
+        ]
+
+        if not non_rainy.empty:
+            random_day = non_rainy["일시"].sample(1, random_state=42).iloc[0]
+            non_rainy_data = merged[merged["일시"] == random_day]
+            jobs.append(map_job(non_rainy_data, random_day,
+                                f"비장마_{year}-{random_day.month:02d}-{random_day.day:02d}"))
+    return jobs
+
+
+# ===== 지도 생성 (바뀐 이미지만, 프로세스 풀로 병렬 렌더링) =====
+#   python app.py [워커 수]
+if __name__ == "__main__":
+    os.makedirs(output_dir, exist_ok=True)
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+
+    jobs = collect_jobs(load_merged_maps())
+    render_batch(jobs, manifest_path, workers=workers, scale=2)
+
+    print("\n🎉 지정한 장마철 및 비장마철 지도 이미지가 모두 생성되었습니다!")
+    print(f"📁 저장 위치: {output_dir}")
@@ -0,0 +1,115 @@
+# artifacts.py
+"""
+출력물(이미지/HTML/CSV) 재생성 판단용 지문 + manifest
+
+- fingerprint(): DataFrame/dict/문자열 등 입력을 sha256 하나로 요약
+- Manifest: output 폴더에 {출력 경로: 입력 지문} 을 JSON 으로 기록,
+  지문이 같고 파일이 남아 있으면 다시 만들지 않음
+"""
+
+import hashlib
+import inspect
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+def _update(h, obj):
+    if isinstance(obj, pd.DataFrame):
+        h.update(json.dumps([str(c) for c in obj.columns], ensure_ascii=False).encode("utf-8"))
+        h.update(pd.util.hash_pandas_object(obj, index=False).to_numpy().tobytes())
+    elif isinstance(obj, pd.Series):
+        h.update(str(obj.name).encode("utf-8"))
+        h.update(pd.util.hash_pandas_object(obj, index=False).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        # 배열은 dtype/shape + 원본 바이트 (str() 은 큰 배열을 ... 로 줄여 버림)
+        h.update(f"{obj.dtype.str}{obj.shape}".encode("utf-8"))
+        if obj.dtype == object:
+            h.update(json.dumps(obj.tolist(), ensure_ascii=False, default=str).encode("utf-8"))
+        else:
+            h.update(np.ascontiguousarray(obj).tobytes())
+    elif callable(obj):
+        # 함수는 소스 코드 기준 (스타일 함수가 바뀌면 다시 생성)
+        h.update(inspect.getsource(obj).encode("utf-8"))
+    elif isinstance(obj, (bytes, bytearray)):
+        h.update(obj)
+    else:
+        h.update(json.dumps(obj, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8"))
+
+
+def fingerprint(*parts):
+    """입력들을 순서대로 해시한 sha256 hex"""
+    h = hashlib.sha256()
+    for part in parts:
+        _update(h, part)
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class Manifest:
+    """output 폴더의 {출력 경로: 지문} 기록"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def _key(self, output):
+        return os.path.relpath(output, os.path.dirname(os.path.abspath(self.path)))
+
+    def is_fresh(self, outputs, fp):
+        """모든 출력 파일이 있고 지문이 같으면 True"""
+        if isinstance(outputs, str):
+            outputs = [outputs]
+        return all(
+            os.path.exists(o) and self.entries.get(self._key(o)) == fp
+            for o in outputs
+        )
+
+    def record(self, outputs, fp):
+        if isinstance(outputs, str):
+            outputs = [outputs]
+        for o in outputs:
+            self.entries[self._key(o)] = fp
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+class BuildGraph:
+    """출력물 단위 빌드: 입력 지문이 바뀐 출력물만 다시 만들고 manifest 갱신
+
+    graph.target(["a.html", "a.png"], [df, 스타일함수], lambda: ...)
+    """
+
+    def __init__(self, manifest_path):
+        self.manifest = Manifest(manifest_path)
+        self.built = []
+        self.skipped = []
+
+    def target(self, outputs, inputs, build):
+        if isinstance(outputs, str):
+            outputs = [outputs]
+        fp = fingerprint(*inputs)
+        if self.manifest.is_fresh(outputs, fp):
+            self.skipped.extend(outputs)
+            return False
+
+        build()
+        self.manifest.record(outputs, fp)
+        self.built.extend(outputs)
+        return True
+
+    def finish(self):
+        self.manifest.save()
+        print(f"🔁 재생성 {len(self.built)}개 / ⏭️ 변경 없음 {len(self.skipped)}개")
+        for path in self.built:
+            print(f"   - {path}")
@@ -1,10 +1,14 @@
 # base_map.py
 
-import folium
+import numpy as np
 import pandas as pd
 import os
 import re
 
+# 좌표 테이블은 프로세스 전체에서 한 번만 읽고 SolarMap/RainMap 인스턴스가 공유
+_LOCATION_CACHE = {}
+
+
 class BaseMap:
     def __init__(self, data_path: str, location_csv: str = "data/좌표.csv"):
         """CSV나 리스트 데이터를 로드"""
@@ -12,6 +16,7 @@ class BaseMap:
         self.location_csv = location_csv
         self.location_data = self.load_location_data(location_csv)
         self.df = self.load_data(data_path)
+        self.build_date_index()
 
     def load_location_data(self, location_csv):
         """지점좌표 CSV 파일에서 지역명-위도/경도 정보를 불러옴"""
@@ -22,9 +27,18 @@ class BaseMap:
         if not os.path.exists(abs_path):
             raise FileNotFoundError(f"좌표 파일이 존재하지 않습니다: {abs_path}")
 
-        loc_df = pd.read_csv(abs_path, encoding="utf-8-sig")
-        loc_dict = {row["지역명"]: [row["위도"], row["경도"]] for _, row in loc_df.iterrows()}
-        return loc_dict
+        key = (abs_path, os.path.getmtime(abs_path))
+        if key not in _LOCATION_CACHE:
+            loc_df = pd.read_csv(abs_path, encoding="utf-8-sig")
+            name_col = "지역명" if "지역명" in loc_df.columns else "지점명"
+            # 지역명 → (위도, 경도) 테이블. 중복 지역명은 마지막 값 사용
+            loc_df = (
+                loc_df.drop_duplicates(subset=name_col, keep="last")
+                .set_index(name_col)[["위도", "경도"]]
+                .astype(float)
+            )
+            _LOCATION_CACHE[key] = loc_df
+        return _LOCATION_CACHE[key]
 
     def load_data(self, data_path):
         """CSV 또는 리스트 형태 데이터 읽기 및 자동 구조 변환"""
@@ -56,9 +70,12 @@ class BaseMap:
         if "지점명" in cols:
             df.rename(columns={"지점명": "지역"}, inplace=True)
 
-        # 좌표 자동 매핑
-        df["위도"] = df["지역"].map(lambda x: self.location_data.get(x, [None, None])[0])
-        df["경도"] = df["지역"].map(lambda x: self.location_data.get(x, [None, None])[1])
+        # 좌표 자동 매핑 (지역명 위치 인덱스로 좌표 배열을 한 번에 조회)
+        idx = self.location_data.index.get_indexer(df["지역"])
+        coords = self.location_data.to_numpy()
+        found = idx >= 0
+        df["위도"] = np.where(found, coords[idx, 0], np.nan)
+        df["경도"] = np.where(found, coords[idx, 1], np.nan)
 
         # 값 자동 식별
         for key in ["일사", "강수", "온도"]:
@@ -70,13 +87,53 @@ class BaseMap:
         df = df.dropna(subset=["위도", "경도"])
         return df
 
+    def build_date_index(self):
+        """날짜순 정렬 + 날짜별 (시작, 끝) 위치 인덱스 생성 (조회 시 전체 스캔 없이 슬라이스)"""
+        df = self.df
+        try:
+            dates = pd.to_datetime(
+                pd.DataFrame({"year": df["연도"], "month": df["월"], "day": df["일"]}),
+                errors="coerce",
+            ).to_numpy()
+        except (TypeError, ValueError):
+            dates = np.full(len(df), np.datetime64("NaT"), dtype="datetime64[ns]")
+
+        # NaT 는 정렬 시 맨 뒤로 가므로 유효 날짜 구간만 인덱스로 사용
+        order = np.argsort(dates, kind="stable")
+        self.df = df.iloc[order].reset_index(drop=True)
+        dates = dates[order]
+        self._dates = dates[: int((~np.isnat(dates)).sum())]
+
+        uniq, starts = np.unique(self._dates, return_index=True)
+        stops = np.append(starts[1:], len(self._dates))
+        self._date_slices = {pd.Timestamp(d): (a, b) for d, a, b in zip(uniq, starts, stops)}
+
     def filter_data(self, year, month, day):
-        return self.df[
-            (self.df["연도"].astype(int) == year)
-            & (self.df["월"].astype(int) == month)
-            & (self.df["일"].astype(int) == day)
-        ]
+        """특정 날짜 데이터 (정렬된 프레임의 위치 슬라이스). 없는 날짜(2월 30일 등)는 빈 프레임"""
+        try:
+            key = pd.Timestamp(year, month, day)
+        except (TypeError, ValueError):
+            return self.df.iloc[0:0]
+        a, b = self._date_slices.get(key, (0, 0))
+        return self.df.iloc[a:b]
+
+    def filter_range(self, start, end):
+        """start ~ end (양끝 포함) 기간 데이터"""
+        a = np.searchsorted(self._dates, pd.Timestamp(start).to_datetime64(), side="left")
+        b = np.searchsorted(self._dates, pd.Timestamp(end).to_datetime64(), side="right")
+        return self.df.iloc[a:b]
+
+    def filter_dates(self, dates):
+        """여러 날짜를 한 번에 조회 → {Timestamp: 데이터}"""
+        result = {}
+        for d in dates:
+            d = pd.Timestamp(d)
+            a, b = self._date_slices.get(d, (0, 0))
+            result[d] = self.df.iloc[a:b]
+        return result
 
     def create_map(self, lat=36.5, lon=127.8, zoom=7):
         """기본 지도 생성"""
+        import folium
+
         return folium.Map(location=[lat, lon], zoom_start=zoom, control_scale=True)
@@ -0,0 +1,7 @@
+"""
+성능 기준선 측정용 벤치마크 (python -m benchmarks.run)
+
+- synthetic: 실제 스키마와 같은 합성 데이터 (지점 수 × 배율)
+- cases: 로드/병합/손실 집계/BaseMap/지도 마커/이미지 렌더링 측정 함수
+- run: 배율별 실행 → benchmarks/results/*.json 저장 + 직전 결과 대비 회귀 표시
+"""
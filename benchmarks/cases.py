@@ -0,0 +1,127 @@
+# benchmarks/cases.py
+"""
+측정 대상 (핫 패스)
+
+각 case 는 ctx(합성 데이터 경로/작업 폴더) 를 받아 준비 작업을 한 뒤
+시간을 잴 인자 없는 함수를 돌려줌. 준비 시간은 측정에 포함하지 않음.
+"""
+
+import os
+import shutil
+
+import pandas as pd
+
+import data_store
+
+
+# ---------------------------------------------------------
+# 데이터 로드 / 병합
+# ---------------------------------------------------------
+def _merged_args(ctx):
+    p = ctx["paths"]
+    return p["weather"], p["power"], p["mapping"]
+
+
+def load_cold(ctx):
+    """CSV 파싱 + 병합 + Parquet 캐시 기록 (캐시 없음)"""
+    def run():
+        shutil.rmtree(data_store.CACHE_DIR, ignore_errors=True)
+        return data_store.load_merged(*_merged_args(ctx))
+    return run
+
+
+def load_warm(ctx):
+    """캐시된 연도 파티션 Parquet 읽기"""
+    data_store.load_merged(*_merged_args(ctx))
+    return lambda: data_store.load_merged(*_merged_args(ctx))
+
+
+def merge(ctx):
+    """기상 + 발전량 + 관측소 매핑 병합 (CSV 는 미리 읽어 둠)"""
+    p = ctx["paths"]
+    weather = data_store.clean_columns(pd.read_csv(p["weather"], encoding="utf-8-sig"))
+    power = data_store.clean_columns(pd.read_csv(p["power"], encoding="utf-8-sig"))
+    mapping = data_store.clean_columns(pd.read_csv(p["mapping"], encoding="utf-8-sig"))
+    weather["일시"] = pd.to_datetime(weather["일시"])
+    power["일시"] = pd.to_datetime(power["일시"])
+
+    def run():
+        merged = weather.merge(power[["지점명", "일시", data_store.POWER_COL]],
+                               on=["지점명", "일시"], how="left")
+        return merged.merge(mapping, on="지점명", how="left")
+    return run
+
+
+# ---------------------------------------------------------
+# 손실 집계 (nat / rg)
+# ---------------------------------------------------------
+def loss(ctx):
+    """월별 합계 집계 → 시즌별 전국/지역 손실 테이블"""
+    import loss_engine
+
+    p = ctx["paths"]
+    merged, cap = loss_engine.load_inputs(p["weather"], p["power"], p["mapping"], p["cap"])
+
+    def run():
+        result = loss_engine.compute_losses(loss_engine.monthly_sums(merged), cap)
+        return loss_engine.national(result, "전체"), loss_engine.regional(result, "전체")
+    return run
+
+
+# ---------------------------------------------------------
+# 지도
+# ---------------------------------------------------------
+def basemap(ctx):
+    """BaseMap 생성 (CSV 읽기 + 구조 변환 + 좌표 매핑 + 날짜 인덱스)"""
+    from base_map import BaseMap
+
+    path = ctx["paths"]["weather"]
+    BaseMap(path)  # 좌표 테이블 캐시는 프로세스 공용이므로 미리 채워 둠
+    return lambda: BaseMap(path)
+
+
+def markers(ctx):
+    """하루치 지점 마커 레이어 생성 + HTML 렌더링"""
+    import folium
+
+    from station_layer import add_circle_markers
+
+    merged = data_store.load_merged(*_merged_args(ctx))
+    day = merged[merged["일시"] == merged["일시"].iloc[len(merged) // 2]]
+
+    def run():
+        m = folium.Map(location=[36.0, 128.7], zoom_start=7)
+        add_circle_markers(m, day, "합계 일사량(MJ/m2)", "☀")
+        return m.get_root().render()
+    return run
+
+
+# ---------------------------------------------------------
+# 이미지 렌더링
+# ---------------------------------------------------------
+def render(ctx):
+    """손실 그래프 1장 write_image (kaleido). 환경에 없으면 준비 단계에서 예외 → skip"""
+    import loss_engine
+
+    p = ctx["paths"]
+    result = loss_engine.run(weather_path=p["weather"], power_path=p["power"],
+                             mapping_path=p["mapping"], cap_path=p["cap"])
+    rg = loss_engine.regional(result, "전체")
+    rg = rg[rg["지역구분"].isin(["남부", "중북부"])]
+    fig = loss_engine.make_fig(rg, "bar", "손실량(kWh/MW)", "지역구분",
+                               "지역별 손실량", "손실량 (kWh/MW)", lambda f, *_: f)
+    out = os.path.join(ctx["work_dir"], "render.png")
+
+    fig.write_image(out, scale=1)  # kaleido / Chrome 확인
+    return lambda: fig.write_image(out, scale=1)
+
+
+CASES = {
+    "load_cold": load_cold,
+    "load_warm": load_warm,
+    "merge": merge,
+    "loss": loss,
+    "basemap": basemap,
+    "markers": markers,
+    "render": render,
+}
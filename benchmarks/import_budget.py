@@ -0,0 +1,101 @@
+# benchmarks/import_budget.py
+"""
+공용 모듈 import 시간 예산 검사
+
+    python -m benchmarks.import_budget            # 예산 초과/무거운 의존성 로드 시 종료 코드 1
+    python -m benchmarks.import_budget --repeat 5
+
+- 모듈마다 새 인터프리터에서 import → (import 시간 - pandas/numpy 기준 시간) 을 예산과 비교
+- 표 계산용 모듈이 시각화/내보내기 의존성(plotly, folium, kaleido, sklearn ...)을 끌어오면 실패
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+import data_store
+
+# 표 계산만 하는 모듈이 import 시점에 로드하면 안 되는 패키지
+HEAVY = ["plotly", "kaleido", "folium", "branca", "streamlit", "streamlit_folium",
+         "sklearn", "lightgbm", "fiona", "shapely", "pyproj", "matplotlib", "seaborn", "pyinstrument"]
+
+# 모듈 → pandas/numpy 대비 추가 import 시간 예산 (초)
+BUDGETS = {
+    "profiling": 0.05,
+    "data_store": 0.10,
+    "artifacts": 0.10,
+    "streaming": 0.10,
+    "regression": 0.10,
+    "conditional_effect": 0.10,
+    "loss_bootstrap": 0.15,
+    "forecast": 0.15,
+    "station_day": 0.10,
+    "monsoon": 0.10,
+    "imputation": 0.10,
+    "station_names": 0.10,
+    "ingest": 0.10,
+    "loss_engine": 0.15,
+    "aggregates": 0.15,
+    "spatial_index": 0.10,
+    "base_map": 0.10,
+}
+
+PROBE = """
+import json, sys, time
+import numpy, pandas
+t0 = time.perf_counter()
+{stmt}
+t1 = time.perf_counter()
+print(json.dumps({{"module": t1 - t0,
+                  "loaded": sorted(m for m in {heavy!r} if m in sys.modules)}}))
+"""
+
+
+def probe(module):
+    """새 인터프리터에서 import. 실패하면 {"error": 마지막 오류 줄}"""
+    code = PROBE.format(stmt=f"import {module}", heavy=HEAVY)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                         cwd=data_store.BASE_DIR)
+    if out.returncode != 0:
+        return {"error": (out.stderr.strip().splitlines() or ["?"])[-1]}
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="공용 모듈 import 시간 예산 검사")
+    parser.add_argument("--repeat", type=int, default=3, help="모듈별 측정 횟수 (최솟값 사용)")
+    parser.add_argument("--scale", type=float, default=1.0, help="느린 머신용 예산 배율")
+    args = parser.parse_args(argv)
+
+    failed = []
+    print(f"{'모듈':<16}{'import(s)':>10}{'예산(s)':>9}  결과")
+    for module, budget in BUDGETS.items():
+        runs = [probe(module) for _ in range(args.repeat)]
+        if "error" in runs[0]:
+            print(f"{module:<16}{'-':>10}{budget * args.scale:>9.2f}  ❌ import 실패: {runs[0]['error']}")
+            failed.append(module)
+            continue
+        took = min(r["module"] for r in runs)
+        loaded = sorted(set().union(*(r["loaded"] for r in runs)))
+        limit = budget * args.scale
+
+        problems = []
+        if took > limit:
+            problems.append("예산 초과")
+        if loaded:
+            problems.append("무거운 의존성: " + ", ".join(loaded))
+        status = "❌ " + " / ".join(problems) if problems else "✅"
+        print(f"{module:<16}{took:>10.3f}{limit:>9.2f}  {status}")
+        if problems:
+            failed.append(module)
+
+    if failed:
+        print(f"\n❌ {len(failed)}개 모듈 실패: {', '.join(failed)}")
+        return 1
+    print("\n✅ 모든 모듈 예산 이내")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+# benchmarks/run.py
+"""
+벤치마크 실행
+
+    python -m benchmarks.run                       # 1×, 10×, 100× 전체
+    python -m benchmarks.run --scales 1,10 --cases loss,markers
+    python -m benchmarks.run --baseline benchmarks/results/20250101-120000.json --fail
+
+- 배율마다 임시 폴더에 합성 CSV 생성, Parquet 캐시도 그 폴더로 돌림 (data/cache 는 건드리지 않음)
+- case 별 반복 측정 → 중앙값/최솟값을 benchmarks/results/<시각>.json 에 기록
+- 기준 결과(기본: 가장 최근 결과 파일)보다 중앙값이 threshold 배 이상 느려지면 회귀로 표시
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import data_store
+from benchmarks.cases import CASES
+from benchmarks.synthetic import write_dataset
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+MIN_DELTA = 0.01  # 이보다 작은 차이(초)는 측정 잡음으로 보고 회귀 판정에서 제외
+
+
+# ---------------------------------------------------------
+# 측정
+# ---------------------------------------------------------
+def measure(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def run_scale(scale, case_names, repeat, verbose=True):
+    rows = []
+    with tempfile.TemporaryDirectory(prefix=f"climate_bench_{scale}x_") as work_dir:
+        t0 = time.perf_counter()
+        paths, n = write_dataset(os.path.join(work_dir, "data"), scale)
+        if verbose:
+            print(f"\n📦 {scale}× : {n:,}행 합성 ({time.perf_counter() - t0:.1f}s)")
+
+        cache_dir = data_store.CACHE_DIR
+        data_store.CACHE_DIR = os.path.join(work_dir, "cache")
+        try:
+            ctx = {"paths": paths, "work_dir": work_dir, "rows": n}
+            for name in case_names:
+                row = {"case": name, "scale": scale, "rows": n}
+                try:
+                    fn = CASES[name](ctx)
+                except Exception as e:  # 선택 의존성(kaleido 등) 없음 → 건너뜀
+                    msg = (str(e).strip().splitlines() or [""])[0]
+                    row["skipped"] = f"{type(e).__name__}: {msg}"[:200]
+                    rows.append(row)
+                    if verbose:
+                        print(f"  ⏭️ {name:<10} skip ({row['skipped']})")
+                    continue
+
+                times = measure(fn, repeat)
+                row.update(median_s=statistics.median(times), min_s=min(times), runs=times)
+                rows.append(row)
+                if verbose:
+                    print(f"  ⏱️ {name:<10} {row['median_s']:8.3f}s (min {row['min_s']:.3f}s)")
+        finally:
+            data_store.CACHE_DIR = cache_dir
+    return rows
+
+
+# ---------------------------------------------------------
+# 결과 저장 / 비교
+# ---------------------------------------------------------
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=data_store.BASE_DIR).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def latest_result(exclude=None):
+    files = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")))
+    files = [f for f in files if f != exclude]
+    return files[-1] if files else None
+
+
+def compare(results, baseline, threshold):
+    """(case, scale) 별 중앙값 비교 → 회귀 목록"""
+    base = {(r["case"], r["scale"]): r for r in baseline["results"] if "median_s" in r}
+    regressions = []
+    for r in results:
+        b = base.get((r["case"], r["scale"]))
+        if b is None or "median_s" not in r:
+            continue
+        ratio = r["median_s"] / b["median_s"] if b["median_s"] > 0 else float("inf")
+        r["baseline_s"], r["ratio"] = b["median_s"], ratio
+        if ratio >= threshold and r["median_s"] - b["median_s"] >= MIN_DELTA:
+            regressions.append(r)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="데이터 로드/병합/집계/렌더링 벤치마크")
+    parser.add_argument("--scales", default="1,10,100", help="지점 수 배율 (쉼표 구분)")
+    parser.add_argument("--cases", default=",".join(CASES), help="실행할 case (쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="결과 JSON 경로 (기본: benchmarks/results/<시각>.json)")
+    parser.add_argument("--baseline", help="비교 기준 JSON (기본: 가장 최근 결과)")
+    parser.add_argument("--threshold", type=float, default=1.2, help="회귀 판정 배율")
+    parser.add_argument("--fail", action="store_true", help="회귀가 있으면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    scales = [int(s) for s in args.scales.split(",") if s]
+    case_names = [c for c in args.cases.split(",") if c]
+    unknown = set(case_names) - set(CASES)
+    if unknown:
+        parser.error(f"알 수 없는 case: {', '.join(sorted(unknown))} (가능: {', '.join(CASES)})")
+
+    out = args.out or os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    baseline_path = args.baseline or latest_result(exclude=os.path.abspath(out))
+
+    results = []
+    for scale in scales:
+        results.extend(run_scale(scale, case_names, args.repeat))
+
+    regressions = []
+    if baseline_path:
+        with open(baseline_path, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "baseline": os.path.relpath(baseline_path, data_store.BASE_DIR) if baseline_path else None,
+        "threshold": args.threshold,
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 {out}")
+
+    if baseline_path:
+        print(f"📏 기준: {report['baseline']} (×{args.threshold} 이상이면 회귀)")
+        for r in regressions:
+            print(f"  🔺 {r['case']} {r['scale']}×: {r['baseline_s']:.3f}s → {r['median_s']:.3f}s "
+                  f"(×{r['ratio']:.2f})")
+        if not regressions:
+            print("  ✅ 회귀 없음")
+    return 1 if regressions and args.fail else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
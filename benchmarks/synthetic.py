@@ -0,0 +1,102 @@
+# benchmarks/synthetic.py
+"""
+실제 CSV 와 같은 스키마의 합성 데이터 생성
+
+- 관측소: data/관측소_시도매핑.csv 97개 지점을 scale 배로 복제 (이름 뒤 번호, 좌표 약간 이동)
+- 기상: 지점 × 2020~2024 일자, 일사량은 계절 주기 + 잡음, 강수는 30% 확률 지수분포
+  풍속은 감마분포, 전운량은 일사량이 낮을수록 큼 (0~10)
+- 발전량: 일사량 × PR 로 계산한 예측발전량_PR가변(kWh)
+"""
+
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from data_store import resolve_path
+
+MONSOON = {
+    2020: ("2020-06-24", "2020-08-16"),
+    2021: ("2021-07-03", "2021-07-26"),
+    2022: ("2022-06-23", "2022-07-26"),
+    2023: ("2023-06-25", "2023-07-29"),
+    2024: ("2024-06-21", "2024-07-23"),
+}
+
+FILES = {
+    "weather": "2020~2024_revised_monsoon.csv",
+    "power": "예측발전량_PR가변_수정.csv",
+    "mapping": "관측소_시도매핑.csv",
+    "cap": "2020~2024_설비용량.csv",
+}
+
+
+def stations(scale, seed=0):
+    """관측소 매핑 (지점명, 위도, 경도, 시도) × scale"""
+    base = pd.read_csv(resolve_path("data/관측소_시도매핑.csv"), encoding="utf-8-sig")
+    rng = np.random.default_rng(seed)
+    parts = []
+    for k in range(scale):
+        p = base.copy()
+        if k:
+            p["지점명"] = p["지점명"] + str(k)
+            p["위도"] = p["위도"] + rng.normal(0, 0.05, len(p))
+            p["경도"] = p["경도"] + rng.normal(0, 0.05, len(p))
+        parts.append(p)
+    return pd.concat(parts, ignore_index=True)
+
+
+def weather(station_df, start="2020-01-01", end="2024-12-31", seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, end)
+    names = station_df["지점명"].to_numpy()
+    n = len(names) * len(dates)
+
+    d = np.tile(dates.to_numpy(), len(names))
+    doy = np.tile(dates.dayofyear.to_numpy(), len(names))
+    irr = np.clip(15 + 7 * np.sin((doy - 80) / 365 * 2 * np.pi) + rng.normal(0, 4, n), 0, None)
+
+    df = pd.DataFrame({
+        "지점": np.repeat(np.arange(len(names)) + 90, len(dates)),
+        "지점명": np.repeat(names, len(dates)),
+        "일시": pd.DatetimeIndex(d).strftime("%Y-%m-%d"),
+        "평균기온(°C)": (12 + 12 * np.sin((doy - 100) / 365 * 2 * np.pi) + rng.normal(0, 2, n)).round(1),
+        "일강수량(mm)": np.where(rng.random(n) < 0.3, rng.exponential(12, n), 0).round(1),
+        "평균 풍속(m/s)": rng.gamma(4, 0.5, n).round(1),
+        "합계 일사량(MJ/m2)": irr.round(2),
+        "평균 전운량(1/10)": np.clip(10 - irr / 3 + rng.normal(0, 1.5, n), 0, 10).round(1),
+    })
+
+    # 장마 기간 표시 + 장마철 일사량 감소
+    ts = pd.DatetimeIndex(d)
+    start_ = pd.to_datetime(pd.Series(ts.year).map(lambda y: MONSOON.get(y, ("1900-01-01",))[0])).to_numpy()
+    end_ = pd.to_datetime(pd.Series(ts.year).map(lambda y: MONSOON.get(y, (None, "1900-01-01"))[1])).to_numpy()
+    monsoon = (d >= start_) & (d <= end_)
+    df["장마철여부"] = np.where(monsoon, "장마철", "비장마철")
+    df.loc[monsoon, "합계 일사량(MJ/m2)"] = (df.loc[monsoon, "합계 일사량(MJ/m2)"] * 0.8).round(2)
+    return df
+
+
+def power(weather_df, seed=1):
+    rng = np.random.default_rng(seed)
+    pr = 80 - weather_df["평균기온(°C)"].to_numpy() * 0.3 + rng.normal(0, 1, len(weather_df))
+    out = weather_df[["지점명", "일시", "합계 일사량(MJ/m2)"]].copy()
+    out["PR(가변)"] = pr.round(2)
+    out["예측발전량_PR가변(kWh)"] = (out["합계 일사량(MJ/m2)"] * pr / 100 * 277.8 / 10).round(2)
+    return out
+
+
+def write_dataset(out_dir, scale, seed=0):
+    """out_dir 에 FILES 4종 기록. {키: 경로} 와 행 수 반환"""
+    os.makedirs(out_dir, exist_ok=True)
+    st = stations(scale, seed)
+    w = weather(st, seed=seed)
+    p = power(w, seed=seed + 1)
+
+    paths = {k: os.path.join(out_dir, v) for k, v in FILES.items()}
+    w.to_csv(paths["weather"], index=False, encoding="utf-8-sig")
+    p.to_csv(paths["power"], index=False, encoding="utf-8-sig")
+    st.to_csv(paths["mapping"], index=False, encoding="utf-8-sig")
+    shutil.copy(resolve_path("data/2020~2024_설비용량.csv"), paths["cap"])
+    return paths, len(w)
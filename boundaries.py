@@ -0,0 +1,263 @@
+# boundaries.py
+"""
+시도 경계 줌별 단순화 캐시 + 값 결합 choropleth 레이어
+
+- 경계 원본: data/bnd_sido_00_2024_2Q/*.shp (EPSG:5179, fiona 필요) 가 있으면 그것, 없으면 data/korea_sido.json
+- 줌 레벨마다 화면 1픽셀보다 작은 굴곡은 shapely.simplify 로 지우고,
+  좌표는 그 줌에서 구분되는 자릿수까지만 반올림
+  → data/cache/boundaries/ 에 줌별 compact GeoJSON 으로 저장 (원본 경계 파일이 바뀌면 다시 생성)
+- 손실액/설비용량 같은 값은 렌더링할 때 시도 이름으로 붙임 → 경계 캐시는 값과 무관하게 재사용
+- ChoroplethLayer: 경계는 줌 레벨별로 한 번, 색/툴팁은 시도별로 한 번만 HTML 에 넣고
+  Leaflet 이 현재 줌에 맞는 레벨로 교체
+
+    m = folium.Map(location=[36.3, 127.8], zoom_start=7)
+    add_choropleth(m, values, "손실액(만원)", zooms=(6, 8))   # values: index 시도
+"""
+
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+from branca.element import MacroElement
+from jinja2 import Template
+
+from artifacts import fingerprint
+from data_store import cache_path, file_hash, resolve_path
+
+# (경로, 이름 필드, 좌표계) — 앞에서부터 있는 파일 사용
+SOURCES = [
+    ("data/bnd_sido_00_2024_2Q/bnd_sido_00_2024_2Q.shp", "SIDO_NM", "EPSG:5179"),
+    ("data/korea_sido.json", "CTP_KOR_NM", "EPSG:4326"),
+]
+BOUNDARY_DIR = "boundaries"   # CACHE_DIR 아래 폴더 이름
+
+PIXEL_TOLERANCE = 1.0   # 단순화 허용 오차 (화면 픽셀)
+
+# 옛 시도명 → 현재 시도명 (설비용량/관측소 매핑 표기 기준)
+ALIASES = {
+    "강원도": "강원특별자치도",
+    "전라북도": "전북특별자치도",
+    "제주도": "제주특별자치도",
+}
+
+# 프로세스 안 메모: (캐시 파일) → feature 리스트
+_LEVELS = {}
+
+
+def sido_name(name):
+    name = str(name).strip()
+    return ALIASES.get(name, name)
+
+
+# ---------------------------------------------------------
+# 원본 경계 읽기 (WGS84)
+# ---------------------------------------------------------
+def default_source():
+    for path, name_field, crs in SOURCES:
+        if os.path.exists(resolve_path(path)):
+            return resolve_path(path), name_field, crs
+    raise FileNotFoundError(f"경계 파일이 없습니다: {[p for p, _, _ in SOURCES]}")
+
+
+def read_boundaries(path, name_field, crs="EPSG:4326"):
+    """(시도명 리스트, shapely geometry 배열). 좌표는 경도/위도로 변환"""
+    import shapely
+    from shapely.geometry import shape
+
+    if path.endswith(".shp"):
+        import fiona
+
+        with fiona.open(path) as src:
+            crs = src.crs.to_string() if src.crs else crs
+            feats = [(f["properties"][name_field], shape(f["geometry"])) for f in src]
+    else:
+        with open(path, encoding="utf-8") as f:
+            fc = json.load(f)
+        feats = [(ft["properties"][name_field], shape(ft["geometry"])) for ft in fc["features"]]
+
+    names = [sido_name(n) for n, _ in feats]
+    geoms = np.asarray([g for _, g in feats], dtype=object)
+    if crs not in ("EPSG:4326", "OGC:CRS84"):
+        import pyproj
+
+        tr = pyproj.Transformer.from_crs(crs, "EPSG:4326", always_xy=True)
+        geoms = shapely.transform(geoms, lambda xy: np.column_stack(tr.transform(xy[:, 0], xy[:, 1])))
+    return names, geoms
+
+
+# ---------------------------------------------------------
+# 줌별 단순화 + 좌표 양자화
+# ---------------------------------------------------------
+def degrees_per_pixel(zoom):
+    """웹 메르카토르 타일(256px) 기준 줌 레벨의 1픽셀 경도 폭"""
+    return 360.0 / (256 * 2 ** zoom)
+
+
+def zoom_digits(zoom):
+    """1픽셀의 1/4 까지 구분되는 소수 자릿수"""
+    return max(0, math.ceil(-math.log10(degrees_per_pixel(zoom) / 4)))
+
+
+def _round_coords(coords, digits):
+    if isinstance(coords[0], (int, float)):
+        return [round(c, digits) for c in coords]
+    return [_round_coords(c, digits) for c in coords]
+
+
+def simplify_level(names, geoms, zoom):
+    """feature 리스트 [{"name", "geometry"}] (GeoJSON geometry dict, 좌표 반올림)"""
+    import shapely
+    from shapely.geometry import mapping
+
+    dpp = degrees_per_pixel(zoom)
+    digits = zoom_digits(zoom)
+    simple = shapely.simplify(geoms, PIXEL_TOLERANCE * dpp, preserve_topology=True)
+    # 반올림 격자에 맞춰 스냅 (스냅 후에도 유효한 폴리곤 유지)
+    simple = shapely.set_precision(simple, 10.0 ** -digits)
+
+    features = []
+    for name, g in zip(names, simple):
+        if g.is_empty:
+            continue
+        geo = mapping(g)
+        features.append({"name": name, "geometry": {"type": geo["type"],
+                                                     "coordinates": _round_coords(geo["coordinates"], digits)}})
+    return features
+
+
+def boundary_level(zoom, source=None):
+    """줌 레벨의 단순화 경계 (캐시). source=(경로, 이름 필드, 좌표계), 기본은 default_source()"""
+    path, name_field, crs = source or default_source()
+    parts = [os.path.splitext(path)[0] + ext for ext in (".shp", ".dbf", ".prj")] \
+        if path.endswith(".shp") else [path]
+    key = fingerprint([file_hash(p) for p in parts if os.path.exists(p)], name_field, crs,
+                      zoom, PIXEL_TOLERANCE, simplify_level, read_boundaries)[:12]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    level_path = cache_path(BOUNDARY_DIR, f"{stem}-z{zoom}-{key}.json")
+
+    if level_path not in _LEVELS:
+        if os.path.exists(level_path):
+            with open(level_path, encoding="utf-8") as f:
+                _LEVELS[level_path] = json.load(f)
+        else:
+            features = simplify_level(*read_boundaries(path, name_field, crs), zoom)
+            os.makedirs(os.path.dirname(level_path), exist_ok=True)
+            tmp = level_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(features, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, level_path)
+            _LEVELS[level_path] = features
+    return _LEVELS[level_path]
+
+
+# ---------------------------------------------------------
+# 값 결합
+# ---------------------------------------------------------
+def _json_value(v):
+    if isinstance(v, (np.integer,)):
+        return int(v)
+    if isinstance(v, (float, np.floating)):
+        return None if np.isnan(v) else round(float(v), 3)
+    return v
+
+
+def feature_collection(zoom, values=None, source=None):
+    """경계 + 값 → GeoJSON FeatureCollection (folium.GeoJson 등 다른 클라이언트용). values: index 시도"""
+    rows = {}
+    if values is not None:
+        values = values.rename(index=sido_name)
+        rows = {k: {c: _json_value(v) for c, v in r.items()} for k, r in values.iterrows()}
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "geometry": f["geometry"],
+             "properties": {"시도": f["name"], **rows.get(f["name"], {})}}
+            for f in boundary_level(zoom, source)
+        ],
+    }
+
+
+# ---------------------------------------------------------
+# folium 레이어
+# ---------------------------------------------------------
+class ChoroplethLayer(MacroElement):
+    """줌 레벨별 경계 + 시도별 style/tooltip. zoomend 때 가장 가까운 레벨로 교체"""
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }}_data = {{ this.data }};
+        var {{ this.get_name() }} = L.geoJson(null, {
+            style: function (feature) {
+                var p = {{ this.get_name() }}_data.props[feature.properties.name] || {};
+                return Object.assign({}, {{ this.options|tojson }}, p.style || {});
+            },
+            onEachFeature: function (feature, layer) {
+                var p = {{ this.get_name() }}_data.props[feature.properties.name] || {};
+                layer.bindTooltip(p.tooltip || feature.properties.name, {sticky: true});
+            }
+        }).addTo({{ this._parent.get_name() }});
+
+        function {{ this.get_name() }}_show() {
+            var map = {{ this._parent.get_name() }}, z = map.getZoom();
+            var levels = {{ this.get_name() }}_data.levels, best = levels[0];
+            levels.forEach(function (lv) {
+                if (Math.abs(lv.zoom - z) < Math.abs(best.zoom - z)) { best = lv; }
+            });
+            if ({{ this.get_name() }}._zoomLevel === best.zoom) { return; }
+            {{ this.get_name() }}._zoomLevel = best.zoom;
+            {{ this.get_name() }}.clearLayers();
+            {{ this.get_name() }}.addData(best.features.map(function (f) {
+                return {type: "Feature", geometry: f.geometry, properties: {name: f.name}};
+            }));
+        }
+        {{ this.get_name() }}_show();
+        {{ this._parent.get_name() }}.on("zoomend", {{ this.get_name() }}_show);
+        {% endmacro %}
+    """)
+
+    def __init__(self, levels, props, weight=1, color="#555555", fill_opacity=0.75):
+        super().__init__()
+        self._name = "ChoroplethLayer"
+        self.data = json.dumps(
+            {"levels": [{"zoom": z, "features": f} for z, f in levels], "props": props},
+            ensure_ascii=False, separators=(",", ":"),
+        )
+        self.options = {"weight": weight, "color": color, "fillOpacity": fill_opacity}
+
+
+def add_choropleth(m, values, column, zooms=(7,), tooltip_cols=None, colors="YlOrRd",
+                   caption=None, missing="#dddddd", source=None):
+    """
+    지도 m 에 시도 choropleth 추가.
+    values: index 시도, column 으로 색칠 (tooltip_cols 는 툴팁에 같이 표시할 컬럼)
+    zooms: HTML 에 넣을 단순화 레벨 (여러 개면 줌에 따라 교체)
+    """
+    import branca.colormap as cm
+
+    values = values.rename(index=sido_name)
+    col = pd.to_numeric(values[column], errors="coerce")
+    finite = col[np.isfinite(col)]
+    vmin, vmax = (float(finite.min()), float(finite.max())) if len(finite) else (0.0, 1.0)
+    cmap = getattr(cm.linear, f"{colors}_09").scale(vmin, vmax if vmax > vmin else vmin + 1)
+    cmap.caption = caption or column
+
+    props = {}
+    for name, row in values.iterrows():
+        v = col[name]
+        lines = [f"<b>{name}</b>"] + [
+            f"{c} : {row[c]:,.1f}" if isinstance(row[c], (int, float, np.number)) and pd.notna(row[c])
+            else f"{c} : -"
+            for c in (tooltip_cols or [column])
+        ]
+        props[name] = {
+            "style": {"fillColor": cmap(v) if pd.notna(v) else missing},
+            "tooltip": "<br>".join(lines),
+        }
+
+    levels = [(z, boundary_level(z, source)) for z in zooms]
+    layer = ChoroplethLayer(levels, props)
+    layer.add_to(m)
+    cmap.add_to(m)
+    return layer
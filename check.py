@@ -1,17 +1,13 @@
 import pandas as pd
 
+from monsoon import MonsoonCalendar
+
 # 파일 불러오기
 data = pd.read_csv(r"C:\Users\UserK\Documents\GitHub\climate_project\data\2020~2024_수정본.csv", encoding="utf-8")
 data["일시"] = pd.to_datetime(data["일시"], errors="coerce")
 
 # 장마 기간 정의
-rainy_periods = {
-    2020: ("2020-06-24", "2020-08-16"),
-    2021: ("2021-07-03", "2021-07-26"),
-    2022: ("2022-06-23", "2022-07-26"),
-    2023: ("2023-06-25", "2023-07-30"),
-    2024: ("2024-06-23", "2024-07-28"),
-}
+rainy_periods = MonsoonCalendar.load(basis="참고").periods()  # data/장마기간.csv
 
 # 결과 저장용
 results = []
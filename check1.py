@@ -4,6 +4,8 @@ import plotly.express as px
 import plotly.io as pio
 from pathlib import Path
 
+from monsoon import tag_months
+
 # ===== 1️⃣ 데이터 로드 =====
 weather = pd.read_csv("data/2020~2024_수정본.csv", encoding="utf-8")
 power = pd.read_csv("data/예측발전량_PR가변_수정.csv", encoding="utf-8")
@@ -31,7 +33,7 @@ print(merged["지역구분"].value_counts())
 
 # ===== 3️⃣ 장마철 여부 =====
 merged["월"] = merged["일시"].dt.month
-merged["장마철여부"] = merged["월"].apply(lambda x: "장마철" if 6 <= x <= 7 else "비장마철")
+merged["장마철여부"] = tag_months(merged["월"], (6, 7))
 
 # ===== 4️⃣ 손실량 계산 =====
 region_stats = (
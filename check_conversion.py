@@ -1,32 +1,58 @@
+import os
+
 import pandas as pd
-from sklearn.linear_model import LinearRegression
 
-# ===== 파일 경로 =====
-base_path = r"C:\Users\UserK\Documents\GitHub\climate_project\data"
-weather = pd.read_csv(f"{base_path}\\2020~2024.csv", encoding="utf-8")
-power = pd.read_csv(f"{base_path}\\예측발전량_PR고정_수정.csv", encoding="utf-8")
+from data_store import BASE_DIR, load_table
+from monsoon import MonsoonCalendar, monsoon_region
+from regression import grouped_ols
+from streaming import LinearMoments
+
+# ===== 파일 경로 (저장소 data/) =====
+base_path = os.path.join(BASE_DIR, "data")
+weather = load_table(os.path.join(base_path, "2020~2024.csv"),
+                     columns=["지점명", "일시", "합계 일사량(MJ/m2)"])
+power = load_table(os.path.join(base_path, "예측발전량_PR고정_수정.csv"),
+                   columns=["지점명", "일시", "예측발전량_PR고정(kWh)"])
 
-# ===== 일시 통일 및 병합 =====
-weather["일시"] = pd.to_datetime(weather["일시"], errors="coerce")
-power["일시"] = pd.to_datetime(power["일시"], errors="coerce")
+FACTOR = 20.835
+X_COL, Y_COL = "합계 일사량(MJ/m2)", "예측발전량_PR고정(kWh)"
 
+# ===== 일시 통일 및 병합 (Parquet 캐시에서 일시는 datetime) =====
 merged = pd.merge(
-    power[["지점명", "일시", "예측발전량_PR고정(kWh)"]],
-    weather[["지점명", "일시", "합계 일사량(MJ/m2)"]],
+    power[["지점명", "일시", Y_COL]],
+    weather[["지점명", "일시", X_COL]],
     on=["지점명", "일시"],
     how="inner"
 ).dropna()
 
-# ===== 회귀 분석 =====
-X = merged[["합계 일사량(MJ/m2)"]]
-y = merged["예측발전량_PR고정(kWh)"]
+# ===== 회귀 분석 (단일 변수 최소제곱 → scikit-learn 없이 평균/편차곱으로) =====
+X = merged[X_COL]
+y = merged[Y_COL]
 
-model = LinearRegression()
-model.fit(X, y)
+model = LinearMoments()
+model.add(X, y)
 
-coef = model.coef_[0]
-intercept = model.intercept_
+coef, intercept = model.coef()
 
 # ===== 결과 출력 =====
 print(f"✅ 회귀식: 발전량(kWh) = {coef:.3f} × 일사량(MJ/m²) + {intercept:.3f}")
 print(f"👉 즉, 1 MJ/m² 증가 시 약 {coef:.3f} kWh 증가 (기존 20.835와 비교 가능)")
+
+# ===== 지점 / 지점×연도 / 지점×연도×장마철 회귀 (그룹별 정규방정식 한 번에) =====
+stations = pd.read_csv(os.path.join(base_path, "관측소_시도매핑.csv"), encoding="utf-8-sig")
+regions = monsoon_region(merged["지점명"].map(stations.set_index("지점명")["시도"]))
+merged["연도"] = merged["일시"].dt.year
+merged["장마철여부"] = MonsoonCalendar.load(basis="기상청").tag(merged["일시"], regions)
+
+os.makedirs("output", exist_ok=True)
+for by in (["지점명"], ["지점명", "연도"], ["지점명", "연도", "장마철여부"]):
+    table = grouped_ols(merged, X_COL, Y_COL, by=by)
+    table["계수차이(%)"] = (table["원점기울기"] / FACTOR - 1) * 100
+    path = os.path.join("output", f"환산계수_회귀_{'_'.join(by)}.csv")
+    table.to_csv(path, index=False, encoding="utf-8-sig")
+
+    near = (table["계수차이(%)"].abs() <= 5).mean() * 100
+    print(f"\n📊 {' × '.join(by)} — {len(table)}개 그룹 → {path}")
+    print(f"   기울기 중앙값 {table['기울기'].median():.3f} / 원점기울기 중앙값 {table['원점기울기'].median():.3f}"
+          f" / R² 중앙값 {table['R2'].median():.3f}")
+    print(f"   원점기울기가 {FACTOR} ±5% 이내인 그룹: {near:.1f}%")
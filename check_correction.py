@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 
+from monsoon import MonsoonCalendar, monsoon_region
+
 # ===== 1️⃣ 파일 불러오기 =====
 file_path = "data/2020~2024_수정본.csv"  # 실제 경로 맞게 수정
 data = pd.read_csv(file_path)
@@ -21,22 +23,12 @@ data["합계 일사량(MJ/m2)"] = (
 )
 
 # ===== 5️⃣ 기상청 기준 장마철 구분 =====
-def monsoon_period(row):
-    y, date = row["연도"], row["일시"]
-    if y == 2020 and pd.Timestamp(2020, 6, 24) <= date <= pd.Timestamp(2020, 8, 16):
-        return "장마철"
-    elif y == 2021 and pd.Timestamp(2021, 7, 3) <= date <= pd.Timestamp(2021, 7, 26):
-        return "장마철"
-    elif y == 2022 and pd.Timestamp(2022, 6, 23) <= date <= pd.Timestamp(2022, 7, 26):
-        return "장마철"
-    elif y == 2023 and pd.Timestamp(2023, 6, 25) <= date <= pd.Timestamp(2023, 7, 29):
-        return "장마철"
-    elif y == 2024 and pd.Timestamp(2024, 6, 21) <= date <= pd.Timestamp(2024, 7, 23):
-        return "장마철"
-    else:
-        return "비장마철"
-
-data["장마철여부"] = data.apply(monsoon_period, axis=1)
+# data/장마기간.csv 의 "기상청" 기준. 권역(중부/남부/제주) 기간이 있으면 관측소 시도 기준으로 적용
+calendar = MonsoonCalendar.load(basis="기상청")
+stations = pd.read_csv("data/관측소_시도매핑.csv", encoding="utf-8-sig")
+regions = monsoon_region(data["지점명"].map(stations.set_index("지점명")["시도"]))
+
+data["장마철여부"] = calendar.tag(data["일시"], regions)
 
 # ===== 6️⃣ 연도별 장마철 vs 비장마철 평균 일사량 계산 =====
 annual_means = (
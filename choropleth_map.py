@@ -0,0 +1,62 @@
+# choropleth_map.py
+"""
+시도별 장마철 손실액 choropleth (연도별 HTML)
+
+- 시도 × 월 일사량 합계/개수는 집계 큐브(aggregates.py), 설비용량은 data/2020~2024_설비용량.csv 시도 컬럼
+- 경계는 boundaries.py 의 줌별 단순화 캐시 → 값만 바뀌면 경계는 다시 계산하지 않음
+- 입력이 그대로인 연도는 다시 만들지 않음 (output/.build_manifest.json)
+
+    python choropleth_map.py                 # 전체 기간 기준
+    python choropleth_map.py --season 여름 --zooms 6,8
+"""
+
+import argparse
+import os
+
+from artifacts import BuildGraph
+from boundaries import add_choropleth, boundary_level
+from data_store import load_table
+from loss_engine import DATA_CAP, LOSS_IRR_COL, SEASONS, sido_losses
+
+OUTPUT_DIR = "output"
+COLUMN = "손실액(만원)"
+TOOLTIP = ["손실량(kWh/MW)", "설비용량(MW)", "손실액(만원)"]
+
+
+def render(table, year, season, zooms, path):
+    import folium
+
+    m = folium.Map(location=[36.3, 127.8], zoom_start=zooms[0], control_scale=True)
+    add_choropleth(m, table.set_index("시도"), COLUMN, zooms=zooms, tooltip_cols=TOOLTIP,
+                   caption=f"{year}년 {season} 장마철 손실액 (만원)")
+    m.save(path)
+
+
+def main(argv=None):
+    from aggregates import load_cube
+
+    parser = argparse.ArgumentParser(description="시도별 장마철 손실액 지도")
+    parser.add_argument("--season", choices=list(SEASONS), default="전체")
+    parser.add_argument("--zooms", default="7", help="HTML 에 넣을 경계 단순화 줌 레벨 (쉼표 구분)")
+    args = parser.parse_args(argv)
+    zooms = [int(z) for z in args.zooms.split(",")]
+
+    monthly = load_cube().query("시도", "월", LOSS_IRR_COL)
+    result = sido_losses(monthly, load_table(DATA_CAP, sep="|"), {args.season: SEASONS[args.season]})
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    graph = BuildGraph(os.path.join(OUTPUT_DIR, ".build_manifest.json"))
+    for year, table in result.groupby("연도"):
+        path = os.path.join(OUTPUT_DIR, f"시도별_손실액_{args.season}_{year}.html")
+        table = table[["시도"] + TOOLTIP].reset_index(drop=True)
+        graph.target(
+            path,
+            [table, zooms, [boundary_level(z) for z in zooms], render, add_choropleth],
+            lambda table=table, year=year, path=path: render(table, year, args.season, zooms, path),
+        )
+    graph.finish()
+    print(f"🗺️ 시도별 손실액 지도 {result['연도'].nunique()}개 → {OUTPUT_DIR}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+# climate.py
+"""
+통합 CLI (저장소 루트의 개별 스크립트를 한 프로세스에서 실행)
+
+    python climate.py loss [--season 전체|여름|all] [--table-only]
+    python climate.py maps [--workers N]        # app.py: 연도별 장마/비장마 지도 PNG
+    python climate.py slides                    # make_slides.py
+    python climate.py impute [CSV ...]          # 결측.py 보정 (기본 data/2020~2024.csv)
+    python climate.py monsoon                   # check_correction.py: 장마철 구분 → revised_monsoon.csv
+    python climate.py all                       # loss + maps + slides
+
+- 스크립트는 runpy 로 __main__ 실행 → import 와 병합 테이블(data_store.keep_warm)을 공유
+  all 은 데이터 로드/plotly import 를 한 번만 함
+- 상주 모드: 병합 테이블을 메모리에 올려 둔 프로세스에 실행을 맡김
+
+    python climate.py serve &                   # 127.0.0.1:CLIMATE_DAEMON_PORT (기본 47823)
+    python climate.py --daemon all              # 상주 프로세스에서 실행 (없으면 이 프로세스에서)
+    python climate.py stop
+
+  인증키: CLIMATE_DAEMON_KEY 가 있으면 그 값, 없으면 serve 첫 실행 때 만든 무작위 키 파일
+  (~/.cache/climate/daemon.key, 권한 0600). 클라이언트도 같은 파일을 읽음
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import runpy
+import secrets
+import stat
+import sys
+import time
+import traceback
+
+from profiling import stage
+
+# pandas 를 끌어오는 data_store 는 실제로 실행할 때만 import (--daemon 클라이언트는 표준 라이브러리만)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DAEMON_ADDRESS = ("127.0.0.1", int(os.environ.get("CLIMATE_DAEMON_PORT", "47823")))
+DAEMON_KEY_FILE = os.path.join(os.path.expanduser("~"), ".cache", "climate", "daemon.key")
+
+LOSS_SCRIPTS = {"전체": "economic_loss_final_v4.py", "여름": "summer.py"}
+
+
+# ---------------------------------------------------------
+# 스크립트 실행
+# ---------------------------------------------------------
+def run_script(path, *args):
+    """스크립트를 이 프로세스에서 __main__ 으로 실행 (sys.argv 는 실행 동안만 교체)"""
+    saved = sys.argv
+    sys.argv = [path, *map(str, args)]
+    try:
+        with stage(os.path.splitext(path)[0]):
+            runpy.run_path(os.path.join(BASE_DIR, path), run_name="__main__")
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            raise
+    finally:
+        sys.argv = saved
+
+
+def cmd_loss(args):
+    if args.table_only:
+        from loss_engine import SEASONS, run
+
+        seasons = SEASONS if args.season == "all" else {args.season: SEASONS[args.season]}
+        os.makedirs("output", exist_ok=True)
+        result = run(seasons)
+        result.to_csv("output/손실_시즌별.csv", index=False, encoding="utf-8-sig")
+        print(f"✅ output/손실_시즌별.csv ({len(result)}행)")
+        return
+    seasons = LOSS_SCRIPTS if args.season == "all" else [args.season]
+    for season in seasons:
+        run_script(LOSS_SCRIPTS[season])
+
+
+def cmd_maps(args):
+    run_script("app.py", *([args.workers] if args.workers else []))
+
+
+def cmd_slides(args):
+    run_script("make_slides.py")
+
+
+def cmd_impute(args):
+    import importlib
+
+    fill_missing = importlib.import_module("결측").fill_missing
+    for path in args.files or ["data/2020~2024.csv"]:
+        fill_missing(os.path.join(BASE_DIR, path))
+
+
+def cmd_monsoon(args):
+    run_script("check_correction.py")
+
+
+def cmd_all(args):
+    """한 단계가 실패해도 나머지는 계속 실행하고 마지막에 실패 목록으로 오류"""
+    steps = [
+        ("loss", cmd_loss, argparse.Namespace(season="all", table_only=False)),
+        ("maps", cmd_maps, argparse.Namespace(workers=args.workers)),
+        ("slides", cmd_slides, args),
+    ]
+    failed = []
+    for name, func, step_args in steps:
+        try:
+            func(step_args)
+        except Exception:
+            traceback.print_exc()
+            failed.append(name)
+    if failed:
+        raise RuntimeError(f"실패한 단계: {', '.join(failed)}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="climate", description="기후/태양광 분석 통합 CLI")
+    parser.add_argument("--daemon", action="store_true",
+                        help="상주 프로세스(serve)에 실행 요청. 없으면 이 프로세스에서 실행")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("loss", help="장마철 손실량/손실액 그래프 (economic_loss / summer)")
+    p.add_argument("--season", choices=["전체", "여름", "all"], default="all")
+    p.add_argument("--table-only", action="store_true",
+                   help="그래프 없이 output/손실_시즌별.csv 만 (plotly 로드 안 함)")
+    p.set_defaults(func=cmd_loss)
+
+    p = sub.add_parser("maps", help="연도별 장마/비장마 지도 이미지 (app.py)")
+    p.add_argument("--workers", type=int, help="PNG 렌더링 프로세스 수")
+    p.set_defaults(func=cmd_maps)
+
+    p = sub.add_parser("slides", help="강수량 영향 분석 슬라이드 (make_slides.py)")
+    p.set_defaults(func=cmd_slides)
+
+    p = sub.add_parser("impute", help="지점별 결측 보정 (결측.py)")
+    p.add_argument("files", nargs="*", help="보정할 CSV (기본 data/2020~2024.csv)")
+    p.set_defaults(func=cmd_impute)
+
+    p = sub.add_parser("monsoon", help="기상청 기준 장마철 구분 (check_correction.py)")
+    p.set_defaults(func=cmd_monsoon)
+
+    p = sub.add_parser("all", help="loss + maps + slides 를 한 프로세스에서")
+    p.add_argument("--workers", type=int, help="PNG 렌더링 프로세스 수")
+    p.set_defaults(func=cmd_all)
+
+    p = sub.add_parser("serve", help="병합 테이블을 메모리에 유지하는 상주 프로세스")
+    p.set_defaults(func=None)
+
+    p = sub.add_parser("stop", help="상주 프로세스 종료")
+    p.set_defaults(func=None)
+    return parser
+
+
+def dispatch(argv):
+    """하위 명령 하나 실행 → 종료 코드 (예외는 출력 후 1)"""
+    args = build_parser().parse_args(argv)
+    t0 = time.perf_counter()
+    try:
+        args.func(args)
+    except Exception:
+        traceback.print_exc()
+        return 1
+    print(f"⏱️ climate {' '.join(argv)} — {time.perf_counter() - t0:.1f}s")
+    return 0
+
+
+# ---------------------------------------------------------
+# 상주 모드
+# ---------------------------------------------------------
+def daemon_key(create=False):
+    """
+    상주 프로세스 인증키 (bytes). CLIMATE_DAEMON_KEY 가 있으면 그 값
+    키 파일이 없으면 create=True 일 때만 새로 만들고, 아니면 None
+    다른 사용자가 읽을 수 있는 키 파일은 쓰지 않음 (PermissionError)
+    """
+    env = os.environ.get("CLIMATE_DAEMON_KEY")
+    if env:
+        return env.encode()
+    try:
+        fd = os.open(DAEMON_KEY_FILE, os.O_RDONLY)
+    except FileNotFoundError:
+        if not create:
+            return None
+        os.makedirs(os.path.dirname(DAEMON_KEY_FILE), mode=0o700, exist_ok=True)
+        key = secrets.token_bytes(32)
+        # O_EXCL: 동시에 뜬 다른 serve 가 먼저 만들었으면 그 키를 다시 읽음
+        try:
+            fd = os.open(DAEMON_KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            return daemon_key(create=False)
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        return key
+    with os.fdopen(fd, "rb") as f:
+        st = os.fstat(f.fileno())
+        if st.st_mode & (stat.S_IRWXG | stat.S_IRWXO) or st.st_uid != os.getuid():
+            raise PermissionError(f"{DAEMON_KEY_FILE}: 소유자만 읽을 수 있어야 합니다 (chmod 600)")
+        return f.read()
+
+
+def serve():
+    from multiprocessing import AuthenticationError
+    from multiprocessing.connection import Listener
+
+    import data_store
+
+    try:
+        key = daemon_key(create=True)
+    except OSError as e:
+        raise SystemExit(f"❌ 인증키를 준비할 수 없어 상주 모드를 시작하지 않습니다 "
+                         f"(CLIMATE_DAEMON_KEY 를 지정하세요): {e}")
+
+    data_store.keep_warm()
+    t0 = time.perf_counter()
+    try:
+        merged = data_store.load_merged()
+        print(f"🔥 병합 테이블 {len(merged):,}행 로드 ({time.perf_counter() - t0:.1f}s)")
+    except FileNotFoundError as e:
+        print(f"⚠️ 미리 읽기 생략: {e}")
+
+    with Listener(DAEMON_ADDRESS, authkey=key) as listener:
+        print(f"🟢 대기 중 {DAEMON_ADDRESS[0]}:{DAEMON_ADDRESS[1]} (종료: python climate.py stop)")
+        while True:
+            try:
+                conn = listener.accept()
+            except AuthenticationError:  # 키가 다른 연결은 끊고 계속 대기
+                print("  ⚠️ 인증 실패 연결 거부")
+                continue
+            with conn:
+                argv = conn.recv()
+                if argv == ["stop"]:
+                    conn.send((0, "🛑 상주 프로세스 종료\n"))
+                    break
+                buf = io.StringIO()
+                with contextlib.redirect_stdout(buf), contextlib.redirect_stderr(buf):
+                    try:
+                        code = dispatch(argv)
+                    except SystemExit as e:  # argparse 오류
+                        code = e.code if isinstance(e.code, int) else 2
+                conn.send((code, buf.getvalue()))
+                print(f"  ← {' '.join(argv)} (종료 코드 {code})")
+
+
+def send(argv):
+    """상주 프로세스에 실행 요청 → 종료 코드. 연결할 수 없으면 None"""
+    from multiprocessing.connection import Client
+
+    key = daemon_key()
+    if key is None:  # serve 를 한 번도 실행하지 않음
+        return None
+    try:
+        conn = Client(DAEMON_ADDRESS, authkey=key)
+    except OSError:
+        return None
+    with conn:
+        conn.send(argv)
+        code, output = conn.recv()
+    sys.stdout.write(output)
+    return code
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    args = build_parser().parse_args(argv)
+    os.chdir(BASE_DIR)  # 스크립트들은 저장소 루트 기준 상대 경로 사용
+
+    if args.command == "serve":
+        serve()
+        return 0
+    if args.command == "stop":
+        code = send(["stop"])
+        if code is None:
+            print("⚠️ 실행 중인 상주 프로세스가 없습니다")
+            return 1
+        return code
+
+    argv = [a for a in argv if a != "--daemon"]
+    if args.daemon:
+        code = send(argv)
+        if code is not None:
+            return code
+        print("⚠️ 상주 프로세스 없음 → 이 프로세스에서 실행")
+
+    import data_store
+
+    data_store.keep_warm()
+    return dispatch(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+# conditional_effect.py
+"""
+일사량·월을 통제한 강수량 효과 (PR, 발전량)
+
+- make_slides.py / graph1.py 의 강수량 구간 평균은 계절(월)·일사량 차이가 섞여 있음
+  (여름에 비가 많이 오지만 기본 일사량도 높음 → docs/ANALYSIS_ISSUES_AND_SOLUTIONS.md 문제 2·3)
+- (월 × 일사량 구간 × 강수량 구간) 칸마다 개수/합계/제곱합을 np.bincount 한 번으로 누적
+  → 같은 월·같은 일사량 구간 안에서만 강수량 구간끼리 비교 (groupby("강수량_구간") 한 번과 같은 비용)
+- 통제 효과 = 강수량 구간 r 의 칸 분포로 가중한 (칸 평균_r - 칸 평균_기준) 평균 (직접 표준화)
+  표준오차의 칸 분산은 관측 1개짜리 칸이면 같은 강수량 구간의 합동 분산 사용 (0 으로 두면 과소추정)
+  기준 구간(0~1mm) 관측이 없는 칸은 제외하고 그 비율을 coverage 로 표시
+- CLIMATE_STREAMING=1 이면 연도 파티션마다 add() 로 누적
+
+    python conditional_effect.py
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from streaming import STREAMING, iter_merged
+
+WEATHER_PATH = "data/2020~2024.csv"
+POWER_PATH = "data/예측발전량_PR가변_수정.csv"
+RAIN_COL = "일강수량(mm)"
+IRR_COL = "합계 일사량(MJ/m2)"
+OUTCOMES = ["PR(가변)", "예측발전량_PR가변(kWh)"]
+
+# make_slides.py 와 같은 구간 (왼쪽 포함)
+RAIN_BINS = [0, 1, 5, 10, 20, 50, 100, 200]
+RAIN_LABELS = ["0~1", "1~5", "5~10", "10~20", "20~50", "50~100", "100~200"]
+IRR_STEP = 2.0    # 일사량 구간 폭 (MJ/m²)
+IRR_MAX = 36.0    # 이 이상은 마지막 구간
+
+
+class ConditionalTable:
+    """(월, 일사량 구간, 강수량 구간) 칸별 개수/합계/제곱합 누적"""
+
+    def __init__(self, outcomes=OUTCOMES, rain_bins=RAIN_BINS, rain_labels=RAIN_LABELS,
+                 irr_step=IRR_STEP, irr_max=IRR_MAX):
+        self.outcomes = list(outcomes)
+        self.rain_bins = np.asarray(rain_bins, dtype="float64")
+        self.rain_labels = list(rain_labels)
+        self.irr_step = irr_step
+        self.n_irr = int(np.ceil(irr_max / irr_step))
+        self.n_rain = len(rain_bins) - 1
+        self.shape = (12, self.n_irr, self.n_rain)
+        size = int(np.prod(self.shape))
+        self.n = {o: np.zeros(size) for o in self.outcomes}
+        self.s1 = {o: np.zeros(size) for o in self.outcomes}
+        self.s2 = {o: np.zeros(size) for o in self.outcomes}
+
+    def cell_index(self, month, rain, irr):
+        """칸 번호 (구간 밖/결측이면 -1)"""
+        month = np.asarray(month, dtype="float64")
+        rain = np.asarray(rain, dtype="float64")
+        irr = np.asarray(irr, dtype="float64")
+
+        r = np.searchsorted(self.rain_bins, rain, side="right") - 1
+        s = np.clip(np.floor(irr / self.irr_step), 0, self.n_irr - 1)
+        ok = (r >= 0) & (r < self.n_rain) & ~np.isnan(irr) & (month >= 1) & (month <= 12)
+
+        idx = np.full(len(rain), -1, dtype="int64")
+        m = month[ok].astype("int64") - 1
+        idx[ok] = (m * self.n_irr + s[ok].astype("int64")) * self.n_rain + r[ok]
+        return idx
+
+    def add(self, df, time_col="일시"):
+        """지점-일 프레임 하나 누적 (월은 time_col 에서)"""
+        month = pd.to_datetime(df[time_col]).dt.month.to_numpy(dtype="float64", na_value=np.nan)
+        idx = self.cell_index(month, df[RAIN_COL], pd.to_numeric(df[IRR_COL], errors="coerce"))
+        size = len(self.n[self.outcomes[0]])
+        for o in self.outcomes:
+            y = pd.to_numeric(df[o], errors="coerce").to_numpy(dtype="float64")
+            ok = (idx >= 0) & ~np.isnan(y)
+            c, y = idx[ok], y[ok]
+            self.n[o] += np.bincount(c, minlength=size)
+            self.s1[o] += np.bincount(c, y, size)
+            self.s2[o] += np.bincount(c, y * y, size)
+        return self
+
+    # -----------------------------------------------------
+    # 결과
+    # -----------------------------------------------------
+    def _stats(self, o):
+        """(층 = 월 × 일사량 구간, 강수량 구간) 모양의 개수/평균/분산 (관측 1개 이하 칸의 분산은 NaN)"""
+        n = self.n[o].reshape(-1, self.n_rain)
+        s1 = self.s1[o].reshape(-1, self.n_rain)
+        s2 = self.s2[o].reshape(-1, self.n_rain)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(n > 0, s1 / n, np.nan)
+            var = np.where(n > 1, (s2 - n * mean * mean) / (n - 1), np.nan)
+        return n, mean, np.clip(var, 0, None)
+
+    @staticmethod
+    def _pooled(n, var):
+        """분산이 NaN 인 칸(관측 1개)은 같은 강수량 구간의 층 간 합동 분산으로 채움"""
+        ok = np.isfinite(var)
+        dof = np.where(ok, n - 1, 0).sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            pooled = np.where(ok, (n - 1) * var, 0).sum(axis=0) / dof
+        return np.where(ok, var, np.where(dof > 0, pooled, np.nan)[None, :])
+
+    def cells(self):
+        """칸별 long 표: 월, 일사량_구간, 강수량_구간, 결과변수별 n/평균"""
+        month, irr, rain = np.unravel_index(np.arange(int(np.prod(self.shape))), self.shape)
+        out = pd.DataFrame({
+            "월": month + 1,
+            "일사량_구간": [f"{i * self.irr_step:g}~{(i + 1) * self.irr_step:g}" for i in irr],
+            "강수량_구간": np.asarray(self.rain_labels, dtype=object)[rain],
+        })
+        for o in self.outcomes:
+            out[f"{o}_n"] = self.n[o].astype("int64")
+            with np.errstate(invalid="ignore", divide="ignore"):
+                out[f"{o}_평균"] = np.where(self.n[o] > 0, self.s1[o] / self.n[o], np.nan)
+        return out[out[[f"{o}_n" for o in self.outcomes]].sum(axis=1) > 0].reset_index(drop=True)
+
+    def effects(self, reference=0):
+        """강수량 구간별 단순 차이 vs 월·일사량 통제 차이 (기준 구간 대비)"""
+        rows = []
+        for o in self.outcomes:
+            n, mean, var = self._stats(o)
+            var = self._pooled(n, var)
+            total_n = n.sum(axis=0)
+            total_s = self.s1[o].reshape(-1, self.n_rain).sum(axis=0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                naive_mean = np.where(total_n > 0, total_s / total_n, np.nan)
+
+            n0, m0, v0 = n[:, reference], mean[:, reference], var[:, reference]
+            for r, label in enumerate(self.rain_labels):
+                ok = (n[:, r] > 0) & (n0 > 0)
+                w = n[ok, r]
+                wsum = w.sum()
+                if wsum > 0:
+                    diff = mean[ok, r] - m0[ok]
+                    effect = (w * diff).sum() / wsum
+                    base = (w * m0[ok]).sum() / wsum
+                    # 기준 구간 자기 자신은 차이가 항상 0
+                    se = 0.0 if r == reference else \
+                        np.sqrt((w * w * (var[ok, r] / n[ok, r] + v0[ok] / n0[ok])).sum()) / wsum
+                else:
+                    effect = base = se = np.nan
+                naive = naive_mean[r] - naive_mean[reference]
+                rows.append({
+                    "결과변수": o,
+                    "강수량_구간": label,
+                    "n": int(total_n[r]),
+                    "단순차이": naive,
+                    "단순변화율(%)": naive / naive_mean[reference] * 100,
+                    "통제차이": effect,
+                    "통제변화율(%)": effect / base * 100 if base else np.nan,
+                    "표준오차": se,
+                    "표준오차(%)": se / base * 100 if base else np.nan,
+                    "coverage(%)": wsum / total_n[r] * 100 if total_n[r] else np.nan,
+                })
+        return pd.DataFrame(rows)
+
+
+# ---------------------------------------------------------
+# 실행
+# ---------------------------------------------------------
+def build_table(weather_path=WEATHER_PATH, power_path=POWER_PATH):
+    table = ConditionalTable()
+    left_cols = ["지점명", "일시", RAIN_COL]
+    right_cols = ["지점명", "일시", IRR_COL] + OUTCOMES
+    if STREAMING:
+        for _, part in iter_merged(weather_path, power_path, on=["지점명", "일시"],
+                                   left_cols=left_cols, right_cols=right_cols):
+            table.add(part)
+        return table
+
+    from data_store import load_table
+
+    weather = load_table(weather_path, columns=left_cols)
+    power = load_table(power_path, columns=right_cols)
+    table.add(pd.merge(weather, power, on=["지점명", "일시"], how="inner"))
+    return table
+
+
+def effect_figure(effects, outcome):
+    import plotly.graph_objects as go
+
+    df = effects[effects["결과변수"] == outcome]
+    fig = go.Figure([
+        go.Bar(x=df["강수량_구간"], y=df["단순변화율(%)"], name="단순 비교 (구간 평균)",
+               marker_color="rgba(150,150,150,0.6)"),
+        go.Bar(x=df["강수량_구간"], y=df["통제변화율(%)"], name="월·일사량 통제",
+               marker_color="royalblue",
+               error_y=dict(type="data", array=1.96 * df["표준오차(%)"])),
+    ])
+    fig.update_layout(
+        title=f"☔ 강수량 구간별 {outcome} 변화율 (0~1mm 대비) — 단순 vs 월·일사량 통제",
+        xaxis_title="강수량 구간 (mm)",
+        yaxis_title="변화율 (%)",
+        barmode="group",
+        template="plotly_white",
+    )
+    return fig
+
+
+if __name__ == "__main__":
+    os.makedirs("output", exist_ok=True)
+    table = build_table()
+    effects = table.effects()
+    effects.to_csv("output/강수량효과_통제.csv", index=False, encoding="utf-8-sig")
+    table.cells().to_csv("output/강수량효과_칸별.csv", index=False, encoding="utf-8-sig")
+
+    for outcome in OUTCOMES:
+        name = outcome.split("(")[0] if outcome.startswith("PR") else "발전량"
+        effect_figure(effects, outcome).write_html(f"output/강수량효과_통제_{name}.html",
+                                                   include_plotlyjs="cdn")
+
+    print(effects.round(3).to_string(index=False))
+    print("✅ output/강수량효과_통제.csv / 강수량효과_칸별.csv / 강수량효과_통제_*.html")
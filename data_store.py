@@ -0,0 +1,387 @@
+# data_store.py
+"""
+기상 + 발전량 지점-일 테이블 공용 로더
+
+- 원본 CSV는 한 번만 파싱해서 data/cache/ 아래 연도별 파티션 Parquet로 저장
+- 지점명/시도/장마철여부는 category, 일시는 datetime64 로 타입 고정
+- 원본 CSV의 mtime/크기가 바뀌면 해시를 다시 계산해서, 내용이 바뀐 경우에만 캐시 재생성
+- keep_warm() 이후에는 읽은 테이블을 프로세스 메모리에 유지 (climate.py 가 여러 스크립트를 한 프로세스에서 실행할 때)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from profiling import stage
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, "data", "cache")   # benchmarks/run.py 가 임시 폴더로 바꿔 끼움
+
+DATA_WEATHER = "data/2020~2024_revised_monsoon.csv"
+DATA_POWER   = "data/예측발전량_PR가변_수정.csv"
+DATA_MAP     = "data/관측소_시도매핑.csv"
+
+POWER_COL = "예측발전량_PR가변(kWh)"
+# 병합 캐시에서 발전량 파일에 (지점명, 일시) 행이 있었는지 (값이 NaN 이어도 True)
+POWER_ROW_COL = "발전량행"
+CATEGORY_COLS = ["지점명", "시도", "장마철여부"]
+
+CACHE_VERSION = 2
+
+# keep_warm() 이후: (캐시 폴더, 필터) → 전체 컬럼 DataFrame. None 이면 사용 안 함
+_WARM = None
+
+
+# ---------------------------------------------------------
+# 경로 / 컬럼 유틸
+# ---------------------------------------------------------
+def cache_path(*parts):
+    """CACHE_DIR 아래 경로. 호출 시점의 CACHE_DIR 을 읽음 (모듈 전역에 복사해 두면 전환이 안 먹음)"""
+    return os.path.join(CACHE_DIR, *parts)
+
+
+def resolve_path(path):
+    """상대 경로는 프로젝트 루트 기준으로 변환"""
+    if os.path.isabs(path):
+        return path
+    return os.path.join(BASE_DIR, path)
+
+
+def clean_columns(df):
+    """merge 후 생긴 _x/_y 컬럼 정리 (원본 컬럼이 있으면 삭제, 없으면 이름 복구)"""
+    new_cols = {}
+    drop_cols = []
+    for col in df.columns:
+        if col.endswith("_x") or col.endswith("_y"):
+            base = col[:-2]
+            if base in df.columns:
+                drop_cols.append(col)
+            else:
+                new_cols[col] = base
+
+    df.rename(columns=new_cols, inplace=True)
+    df.drop(columns=drop_cols, inplace=True)
+    return df
+
+
+# ---------------------------------------------------------
+# 원본 파일 서명 (mtime + 크기 + sha256)
+# ---------------------------------------------------------
+def file_hash(path, block_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def file_signature(path):
+    st = os.stat(path)
+    return {"mtime": st.st_mtime, "size": st.st_size, "sha256": file_hash(path)}
+
+
+def sources_fresh(saved, paths):
+    """저장된 서명과 현재 파일 비교. mtime/크기가 같으면 해시 생략"""
+    if set(saved) != set(paths):
+        return False, saved
+
+    updated = {}
+    for path in paths:
+        old = saved[path]
+        if not os.path.exists(path):
+            return False, saved
+        st = os.stat(path)
+        if st.st_mtime == old["mtime"] and st.st_size == old["size"]:
+            updated[path] = old
+            continue
+        # touch만 된 경우: 내용이 같으면 캐시 유지하고 mtime만 갱신
+        digest = file_hash(path)
+        if digest != old["sha256"]:
+            return False, saved
+        updated[path] = {"mtime": st.st_mtime, "size": st.st_size, "sha256": digest}
+    return True, updated
+
+
+# ---------------------------------------------------------
+# Parquet 캐시 읽기/쓰기
+# ---------------------------------------------------------
+def _cache_key(name, paths, options):
+    raw = json.dumps([name, sorted(paths), options], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def _manifest_path(cache_dir):
+    return os.path.join(cache_dir, "manifest.json")
+
+
+def _read_manifest(cache_dir):
+    path = _manifest_path(cache_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_manifest(cache_dir, manifest):
+    with open(_manifest_path(cache_dir), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def typed(df, category_cols=CATEGORY_COLS):
+    """일시 → datetime64, 연도 → int, 범주형 컬럼 → category"""
+    if "일시" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["일시"]):
+        df["일시"] = pd.to_datetime(df["일시"], errors="coerce")
+    if "일시" in df.columns:
+        year = df["일시"].dt.year
+        df["연도"] = year.astype("int64") if year.notna().all() else year
+    for col in category_cols:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def write_cache(df, cache_dir, sources, options):
+    """연도 파티션 Parquet + manifest 저장 (임시 폴더에 쓰고 교체)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    tmp_dir = cache_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if "연도" in df.columns and df["연도"].notna().all():
+        pq.write_to_dataset(table, os.path.join(tmp_dir, "table"), partition_cols=["연도"])
+    else:
+        os.makedirs(os.path.join(tmp_dir, "table"))
+        pq.write_table(table, os.path.join(tmp_dir, "table", "part-0.parquet"))
+
+    _write_manifest(tmp_dir, {
+        "version": CACHE_VERSION,
+        "options": options,
+        "sources": {p: file_signature(p) for p in sources},
+    })
+
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.replace(tmp_dir, cache_dir)
+
+
+def _chunk_schema(table):
+    """첫 chunk 스키마 기준: 정수 → float64 (뒤 chunk 에 NaN 이 있어도 같은 스키마), null → string"""
+    import pyarrow as pa
+
+    fields = []
+    for f in table.schema:
+        if f.name == "연도":
+            fields.append(f)
+        elif pa.types.is_integer(f.type):
+            fields.append(pa.field(f.name, pa.float64()))
+        elif pa.types.is_null(f.type):
+            fields.append(pa.field(f.name, pa.string()))
+        else:
+            fields.append(f)
+    return pa.schema(fields)
+
+
+def write_cache_chunks(chunks, cache_dir, sources, options, category_cols=()):
+    """chunk 이터레이터를 연도 파티션에 이어 쓰기 (메모리는 chunk 하나 크기)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    tmp_dir = cache_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    root = os.path.join(tmp_dir, "table")
+    os.makedirs(root)
+
+    schema = None
+    for i, chunk in enumerate(chunks):
+        df = typed(clean_columns(chunk), category_cols)
+        # 날짜가 없는 행은 연도=-1 파티션
+        df["연도"] = df["일시"].dt.year.fillna(-1).astype("int64")
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if schema is None:
+            schema = _chunk_schema(table)
+        table = table.select(schema.names).cast(schema)
+        pq.write_to_dataset(table, root, partition_cols=["연도"],
+                            basename_template=f"chunk{i:05d}-{{i}}.parquet")
+
+    _write_manifest(tmp_dir, {
+        "version": CACHE_VERSION,
+        "options": options,
+        "sources": {p: file_signature(p) for p in sources},
+    })
+
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.replace(tmp_dir, cache_dir)
+
+
+def read_cache(cache_dir, columns=None, filters=None):
+    """memory-map 으로 Arrow 테이블을 읽어서 DataFrame 반환"""
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(
+        os.path.join(cache_dir, "table"),
+        columns=columns, filters=filters, memory_map=True,
+    )
+    df = table.to_pandas()
+    # 파티션 컬럼(연도)은 dictionary 로 읽히므로 정수로 복구
+    if "연도" in df.columns and isinstance(df["연도"].dtype, pd.CategoricalDtype):
+        df["연도"] = df["연도"].astype("int64")
+    return df
+
+
+def ensure_cache(name, sources, build, options=None, category_cols=CATEGORY_COLS,
+                 chunked=False):
+    """
+    sources 가 바뀌었으면 build() 결과로 캐시를 다시 만들고 캐시 폴더 경로 반환.
+    chunked=True 면 build() 는 DataFrame chunk 이터레이터 (연도 파티션에 이어 쓰기)
+    """
+    sources = [resolve_path(p) for p in sources]
+    options = dict(options or {})
+    if chunked:
+        options["chunked"] = True
+    cache_dir = cache_path(f"{name}-{_cache_key(name, sources, options)}")
+
+    manifest = _read_manifest(cache_dir)
+    if manifest and manifest.get("version") == CACHE_VERSION:
+        fresh, sigs = sources_fresh(manifest["sources"], sources)
+        if fresh:
+            if sigs != manifest["sources"]:
+                manifest["sources"] = sigs
+                _write_manifest(cache_dir, manifest)
+            return cache_dir
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    if _WARM:
+        for key in [k for k in _WARM if k[0] == cache_dir]:
+            del _WARM[key]
+    with stage(f"캐시 생성 {name}"):
+        if chunked:
+            write_cache_chunks(build(*sources), cache_dir, sources, options, category_cols)
+        else:
+            df = typed(build(*sources), category_cols)
+            with stage("Parquet 기록"):
+                write_cache(df, cache_dir, sources, options)
+    return cache_dir
+
+
+def cached(name, sources, build, options=None, columns=None, filters=None,
+           category_cols=CATEGORY_COLS):
+    """sources 가 바뀌지 않았으면 캐시를, 바뀌었으면 build() 결과를 저장 후 반환"""
+    cache_dir = ensure_cache(name, sources, build, options, category_cols)
+    with stage(f"캐시 읽기 {name}"):
+        if _WARM is None:
+            return read_cache(cache_dir, columns, filters)
+        key = (cache_dir, repr(filters))
+        if key not in _WARM:
+            _WARM[key] = read_cache(cache_dir, None, filters)
+        df = _WARM[key]
+        # 스크립트가 받은 프레임을 고쳐도 메모리 사본은 그대로
+        return (df[list(columns)] if columns is not None else df).copy()
+
+
+def keep_warm(enabled=True):
+    """cached() 결과를 프로세스 안에 유지 (원본이 바뀌어 캐시를 다시 만들면 해당 항목은 버림)"""
+    global _WARM
+    _WARM = {} if enabled else None
+
+
+def partition_years(cache_dir):
+    """연도 파티션 목록 (파티션 없이 저장된 캐시면 빈 리스트)"""
+    root = os.path.join(cache_dir, "table")
+    years = []
+    for d in os.listdir(root):
+        if d.startswith("연도="):
+            years.append(int(d.split("=", 1)[1]))
+    return sorted(years)
+
+
+# ---------------------------------------------------------
+# 공개 API
+# ---------------------------------------------------------
+def load_table(path, sep=",", encoding="utf-8-sig", columns=None):
+    """CSV 하나를 Parquet 캐시로 읽기 (pd.read_csv 대체, 일시만 datetime 으로 고정)"""
+    name = os.path.splitext(os.path.basename(path))[0]
+
+    def build(src):
+        return clean_columns(pd.read_csv(src, sep=sep, encoding=encoding))
+
+    return cached(name, [path], build,
+                  options={"sep": sep, "encoding": encoding}, columns=columns,
+                  category_cols=())
+
+
+def table_cache_chunked(path, sep=",", encoding="utf-8-sig", chunk_rows=500_000):
+    """
+    CSV 를 chunk 단위로 읽어 연도 파티션 캐시로 저장 (전체를 메모리에 올리지 않음).
+    캐시 폴더 경로 반환 → partition_years() / read_cache(filters=[("연도", "==", y)])
+    정수 컬럼은 chunk 간 NaN 여부가 달라도 되도록 float64 로 저장
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+
+    def build(src):
+        return pd.read_csv(src, sep=sep, encoding=encoding, chunksize=chunk_rows)
+
+    return ensure_cache(name, [path], build,
+                        options={"sep": sep, "encoding": encoding},
+                        category_cols=(), chunked=True)
+
+
+def build_merged(weather_path, power_path, mapping_path):
+    """
+    weather + 예측발전량 + 관측소 시도/위경도 병합 (지점명+일시 기준)
+    기상 기준 left join (map.py 와 같은 행). 손실 계산은 발전량 파일에 있는 행만 쓰므로
+    POWER_ROW_COL 로 표시 → loss_engine 이 그 행만 사용 (LOSS_IRR_COL)
+    """
+    with stage("CSV 읽기"):
+        weather = clean_columns(pd.read_csv(weather_path, encoding="utf-8-sig"))
+        power   = clean_columns(pd.read_csv(power_path, encoding="utf-8-sig"))
+        mapping = clean_columns(pd.read_csv(mapping_path, encoding="utf-8-sig"))
+
+        weather["일시"] = pd.to_datetime(weather["일시"], errors="coerce")
+        power["일시"]   = pd.to_datetime(power["일시"], errors="coerce")
+
+    with stage("병합"):
+        merged = weather.merge(
+            power[["지점명", "일시", POWER_COL]],
+            on=["지점명", "일시"],
+            how="left",
+            indicator=POWER_ROW_COL,
+        )
+        merged[POWER_ROW_COL] = merged[POWER_ROW_COL] == "both"
+        merged = clean_columns(merged)
+
+        merged = merged.merge(mapping, on="지점명", how="left")
+        merged = clean_columns(merged)
+    return merged
+
+
+def load_merged(weather_path=DATA_WEATHER, power_path=DATA_POWER,
+                mapping_path=DATA_MAP, columns=None, years=None):
+    """병합된 지점-일 테이블 (캐시 사용). years 를 주면 해당 연도 파티션만 읽음"""
+    filters = [("연도", "in", list(years))] if years is not None else None
+    return cached("merged", [weather_path, power_path, mapping_path], build_merged,
+                  columns=columns, filters=filters)
+
+
+def merged_cache(weather_path=DATA_WEATHER, power_path=DATA_POWER, mapping_path=DATA_MAP):
+    """load_merged 와 같은 캐시 폴더 → partition_years() / read_cache() 로 연도별 읽기"""
+    return ensure_cache("merged", [weather_path, power_path, mapping_path], build_merged)
+
+
+def source_mtimes(paths=(DATA_WEATHER, DATA_POWER, DATA_MAP)):
+    """원본 CSV들의 mtime 튜플 (st.cache_* 의 무효화 키로 사용)"""
+    return tuple(os.stat(resolve_path(p)).st_mtime for p in paths)
+
+
+def index_by_date(df, col="일시"):
+    """날짜별 조회 딕셔너리 {Timestamp: 해당 날짜 행}. 정렬 후 위치 슬라이스로 만듦"""
+    df = df.sort_values(col, kind="stable").reset_index(drop=True)
+    dates = df[col].to_numpy()
+    uniq, starts = np.unique(dates, return_index=True)
+    stops = np.append(starts[1:], len(df))
+    return {pd.Timestamp(d): df.iloc[a:b] for d, a, b in zip(uniq, starts, stops)}
@@ -1,5 +1,6 @@
 import pandas as pd
-from difflib import get_close_matches
+
+from station_names import StationNameIndex
 
 # === 파일 경로 ===
 DATA_FILE = "data/2020~2024.csv"
@@ -39,16 +40,25 @@ merged = pd.merge(data, coords, on="지점명", how="left")
 missing = merged[merged["위도"].isna()]["지점명"].unique()
 print(f"\n좌표 누락 지점 {len(missing)}개")
 
-for name in missing:
-    match = get_close_matches(name, coords["지점명"], n=1, cutoff=0.6)
-    if match:
-        lat = coords.loc[coords["지점명"] == match[0], "위도"].values[0]
-        lon = coords.loc[coords["지점명"] == match[0], "경도"].values[0]
-        merged.loc[merged["지점명"] == name, ["위도", "경도"]] = [lat, lon]
-        print(f"→ '{name}' 지역을 '{match[0]}' 좌표로 대체함.")
+# 누락 지점 전체를 한 번에 매칭 (자모 2-gram 색인)
+resolved = StationNameIndex(coords["지점명"]).resolve(missing, cutoff=0.6)
+for name, match in zip(resolved["조회명"], resolved["매칭명"]):
+    if match is not None:
+        print(f"→ '{name}' 지역을 '{match}' 좌표로 대체함.")
     else:
         print(f"⚠ '{name}' 지역은 자동 매칭 실패 (수동 입력 필요)")
 
+# 대체 좌표를 한 번의 join 으로 반영
+fix = (
+    resolved.dropna(subset=["매칭명"])
+    .merge(coords.drop_duplicates("지점명")[["지점명", "위도", "경도"]],
+           left_on="매칭명", right_on="지점명", suffixes=("", "_좌표"))
+    .set_index("조회명")[["위도", "경도"]]
+)
+fill = fix.reindex(merged["지점명"]).to_numpy()
+filled = merged["지점명"].isin(fix.index).to_numpy()
+merged.loc[filled, ["위도", "경도"]] = fill[filled]
+
 # === 5️⃣ 결과 저장 ===
 merged.to_csv("data/2020~2024_fixed.csv", index=False, encoding="utf-8-sig")
 coords.to_csv("data/위도,경도_교정.csv", index=False, encoding="utf-8-sig")
@@ -0,0 +1,308 @@
+# forecast.py
+"""
+기상 변수 → 예측발전량_PR가변(kWh) LightGBM 예측 + 장마 없는 반사실 시나리오
+
+- 병합 테이블을 (일 × 지점 × 특성) float32 배열로 한 번만 펼쳐 data/cache/features-<지문>/ 에 .npy 로 저장
+  → 원본 CSV 서명이 그대로면 manifest 비교 후 np.load(mmap_mode="r") 만
+- 특성: 일사량, 일강수량, 평균 전운량, 평균기온, 평균 풍속 + 연중일 (결측은 NaN 그대로, LightGBM 이 처리)
+  일별 CSV 에 전운량 컬럼이 없으면 월별 ASOS 평균운량(ingest 저장소)을 같은 지점·같은 월 날짜에 펼쳐서 사용
+- 학습/예측 모두 num_threads = CPU 수, 예측은 모든 지점·일을 한 번의 predict 호출로
+- 반사실: 장마철 칸의 기상 특성을 같은 지점·같은 월 비장마철 평균으로 바꾼 배열을 통째로 예측
+  → 장마 손실 = 반사실 예측 - 실제 기상 예측 (모델 오차는 양쪽에 같이 들어가서 상쇄)
+
+    python forecast.py                  # 마지막 연도 검증 → 전체 학습 → 반사실 손실표
+    python forecast.py --rounds 800 --valid-year 2023
+"""
+
+import argparse
+import glob
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from artifacts import fingerprint
+from data_store import (DATA_MAP, DATA_POWER, DATA_WEATHER, POWER_COL, cache_path, clean_columns,
+                        file_signature, load_merged, resolve_path, sources_fresh)
+from loss_engine import IRR_COL, monsoon_labels, tag_region
+from profiling import stage
+from station_day import StationDayCube
+
+FEATURE_VERSION = 3
+
+CLOUD_COL = "평균 전운량(1/10)"
+WEATHER = [IRR_COL, "일강수량(mm)", CLOUD_COL, "평균기온(°C)", "평균 풍속(m/s)"]
+FEATURES = WEATHER + ["연중일"]
+TARGET = POWER_COL
+
+PARAMS = {
+    "objective": "regression",
+    "learning_rate": 0.05,
+    "num_leaves": 63,
+    "min_data_in_leaf": 50,
+    "feature_fraction": 0.9,
+    "bagging_fraction": 0.8,
+    "bagging_freq": 1,
+    "verbose": -1,
+}
+ROUNDS = 500
+
+
+# 일별 전운량이 없을 때 대신 쓰는 월별 평균운량 (ingest.py 변수명 / 원본 파일)
+MONTHLY_CLOUD = "평균운량(1/10)"
+MONTHLY_CLOUD_GLOB = "data/20[0-9][0-9]_평균운량.csv"
+
+
+# -------------------------------------------------------
+# 지점 × 일 특성 배열 (캐시)
+# -------------------------------------------------------
+class FeatureMatrix:
+    """X : (일 수, 지점 수, 특성 수) float32, y / monsoon : (일 수, 지점 수). 관측 없는 칸은 NaN"""
+
+    def __init__(self, dates, stations, sido, X, y, monsoon):
+        self.dates = dates
+        self.stations = stations
+        self.sido = sido
+        self.X = X
+        self.y = y
+        self.monsoon = monsoon
+
+    @classmethod
+    def from_frame(cls, df):
+        df = df[df["일시"].notna()]
+        flag = pd.Series(monsoon_labels(df["장마철여부"]), index=df.index)
+        df = df.assign(장마철=(flag == "장마철").astype("float32").where(flag.notna()))
+        cube = StationDayCube.from_frame(df, WEATHER + [TARGET, "장마철"],
+                                         df["일시"].min(), df["일시"].max())
+        doy = np.broadcast_to(cube.dates.dayofyear.to_numpy(dtype="float32")[:, None],
+                              cube.values[TARGET].shape)
+        X = np.stack([cube.values[c] for c in WEATHER] + [doy], axis=-1)
+
+        # 지점별 시도 (지점 순서 = cube.stations)
+        sido = df["시도"].astype(object).groupby(df["지점명"].astype(str)).first()
+        sido = sido.reindex(cube.stations).to_numpy()
+        return cls(cube.dates, cube.stations, sido, X, cube.values[TARGET], cube.values["장마철"])
+
+    @property
+    def months(self):
+        return self.dates.month.to_numpy()
+
+    def rows(self, years=None):
+        """학습에 쓰는 칸 (목표값 있음, 연도 선택) → (X 2차원, y)"""
+        mask = np.isfinite(self.y)
+        if years is not None:
+            mask &= np.isin(self.dates.year.to_numpy(), list(years))[:, None]
+        return self.X[mask], self.y[mask]
+
+    def save(self, cache_dir):
+        np.save(os.path.join(cache_dir, "X.npy"), self.X)
+        np.save(os.path.join(cache_dir, "y.npy"), self.y)
+        np.save(os.path.join(cache_dir, "monsoon.npy"), self.monsoon)
+        index = {"start": str(self.dates[0].date()), "days": len(self.dates),
+                 "stations": list(self.stations), "sido": [s if isinstance(s, str) else None for s in self.sido]}
+        with open(os.path.join(cache_dir, "index.json"), "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, cache_dir):
+        with open(os.path.join(cache_dir, "index.json"), encoding="utf-8") as f:
+            index = json.load(f)
+        arrays = [np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode="r")
+                  for name in ("X", "y", "monsoon")]
+        dates = pd.date_range(index["start"], periods=index["days"])
+        return cls(dates, np.asarray(index["stations"], dtype=object),
+                   np.asarray(index["sido"], dtype=object), *arrays)
+
+
+def weather_columns(weather_path):
+    """일별 기상 CSV 헤더 (병합 캐시를 만들지 않고 컬럼만 확인)"""
+    head = pd.read_csv(resolve_path(weather_path), encoding="utf-8-sig", nrows=0)
+    return set(clean_columns(head).columns)
+
+
+def monthly_cloud(df):
+    """지점-일 행마다 같은 지점·같은 월의 월별 평균운량 (저장소에 없으면 NaN)"""
+    from ingest import ingest, load_wide
+
+    ingest(verbose=False)  # 바뀐 월별 파일만 다시 기록
+    wide = load_wide([MONTHLY_CLOUD])
+    keys = pd.DataFrame({"지점명": df["지점명"].astype(str).to_numpy(),
+                         "일시": df["일시"].dt.to_period("M").dt.to_timestamp().to_numpy()})
+    if MONTHLY_CLOUD not in wide.columns:
+        return np.full(len(df), np.nan, dtype="float32")
+    wide = wide.assign(지점명=wide["지점명"].astype(str))
+    wide = wide.drop_duplicates(["지점명", "일시"])[["지점명", "일시", MONTHLY_CLOUD]]
+    return keys.merge(wide, on=["지점명", "일시"], how="left")[MONTHLY_CLOUD].to_numpy(dtype="float32")
+
+
+@stage("특성 배열")
+def load_features(weather_path=DATA_WEATHER, power_path=DATA_POWER, mapping_path=DATA_MAP):
+    """특성 배열 캐시를 최신 상태로 맞춰서 반환 (원본이 그대로면 manifest 비교만)"""
+    sources = [resolve_path(p) for p in (weather_path, power_path, mapping_path)]
+    available = weather_columns(weather_path)
+    daily = [c for c in WEATHER if c in available]
+    if CLOUD_COL not in available:
+        sources += sorted(glob.glob(resolve_path(MONTHLY_CLOUD_GLOB)))
+    cache_dir = cache_path(f"features-{fingerprint(sources, FEATURES)[:12]}")
+    manifest_path = os.path.join(cache_dir, "manifest.json")
+
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == FEATURE_VERSION:
+            fresh, sigs = sources_fresh(manifest["sources"], sources)
+            if fresh:
+                if sigs != manifest["sources"]:
+                    manifest["sources"] = sigs
+                    with open(manifest_path, "w", encoding="utf-8") as f:
+                        json.dump(manifest, f, ensure_ascii=False, indent=2)
+                return FeatureMatrix.load(cache_dir)
+
+    merged = load_merged(weather_path, power_path, mapping_path,
+                         columns=["지점명", "일시", "시도", "위도", "경도", "장마철여부", TARGET] + daily)
+    if CLOUD_COL not in available:
+        print(f"☁️ {CLOUD_COL} 없음 → 월별 {MONTHLY_CLOUD} 사용")
+        merged[CLOUD_COL] = monthly_cloud(merged)
+    for col in WEATHER:
+        if col not in merged.columns:
+            print(f"⚠️ {col} 없음 → NaN")
+            merged[col] = np.nan
+    os.makedirs(cache_dir, exist_ok=True)
+    FeatureMatrix.from_frame(merged).save(cache_dir)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"version": FEATURE_VERSION, "features": FEATURES,
+                   "sources": {p: file_signature(p) for p in sources}}, f, ensure_ascii=False, indent=2)
+    print(f"🧮 특성 배열 저장 → {cache_dir}")
+    return FeatureMatrix.load(cache_dir)
+
+
+# -------------------------------------------------------
+# 학습 / 예측
+# -------------------------------------------------------
+def threads():
+    return os.cpu_count() or 1
+
+
+@stage("LightGBM 학습")
+def train(features, years=None, params=PARAMS, rounds=ROUNDS):
+    import lightgbm as lgb
+
+    X, y = features.rows(years)
+    data = lgb.Dataset(X, y, feature_name=[f"f{i}" for i in range(len(FEATURES))], free_raw_data=True)
+    return lgb.train({**params, "num_threads": threads()}, data, num_boost_round=rounds)
+
+
+def predict(model, X):
+    """(..., 특성 수) 배열 전체를 한 번에 예측 → (...) 모양 float32"""
+    flat = np.ascontiguousarray(X, dtype="float32").reshape(-1, X.shape[-1])
+    return model.predict(flat, num_threads=threads()).astype("float32").reshape(X.shape[:-1])
+
+
+def evaluate(model, features, years):
+    """years 칸에서 RMSE / R² / 평균 절대 오차율"""
+    X, y = features.rows(years)
+    pred = predict(model, X)
+    err = pred - y
+    return {
+        "n": len(y),
+        "RMSE": float(np.sqrt(np.mean(err ** 2))),
+        "R2": float(1 - np.sum(err ** 2) / np.sum((y - y.mean()) ** 2)),
+        "MAPE(%)": float(np.mean(np.abs(err[y > 0] / y[y > 0])) * 100),
+    }
+
+
+def importance(model):
+    gain = model.feature_importance(importance_type="gain")
+    return pd.Series(gain / gain.sum() * 100, index=FEATURES, name="중요도(%)").sort_values(ascending=False)
+
+
+# -------------------------------------------------------
+# 장마 없는 반사실
+# -------------------------------------------------------
+def no_monsoon(features):
+    """장마철 칸의 기상 특성을 같은 지점·같은 월 비장마철 평균으로 바꾼 X 사본"""
+    X = np.array(features.X)
+    weather = X[..., :len(WEATHER)]
+    dry = features.monsoon == 0
+    months = features.months
+
+    clim = np.full((12,) + weather.shape[1:], np.nan, dtype="float32")
+    for m in range(1, 13):
+        ok = dry[months == m][..., None] & np.isfinite(weather[months == m])
+        total = np.where(ok, weather[months == m], 0).sum(axis=0)
+        count = ok.sum(axis=0)
+        clim[m - 1] = np.where(count > 0, total / np.maximum(count, 1), np.nan)
+
+    wet = features.monsoon == 1
+    # 비장마철 평균이 없는 칸(그 달 전체가 장마)은 실제 기상 그대로
+    repl = clim[months - 1]
+    wet &= np.isfinite(repl).all(axis=-1)
+    weather[wet] = repl[wet]
+    return X
+
+
+@stage("반사실 손실표")
+def counterfactual_losses(model, features):
+    """연도 × (전국, 지역구분) 장마철 칸의 실제 기상 예측 vs 장마 없는 예측 합계"""
+    actual = predict(model, features.X)
+    scenario = predict(model, no_monsoon(features))
+
+    wet = (features.monsoon == 1) & np.isfinite(features.y)
+    day, station = np.nonzero(wet)
+    region = np.array([tag_region(s) for s in features.sido], dtype=object)
+    cells = pd.DataFrame({
+        "연도": features.dates.year.to_numpy()[day],
+        "지역구분": region[station],
+        "예측(kWh)": actual[wet].astype("float64"),
+        "반사실(kWh)": scenario[wet].astype("float64"),
+    })
+
+    frames = []
+    for level, keys in (("전국", ["연도"]), ("지역구분", ["연도", "지역구분"])):
+        g = cells.groupby(keys)[["예측(kWh)", "반사실(kWh)"]].agg(["sum", "count"])
+        out = pd.DataFrame({
+            "장마철_지점일": g[("예측(kWh)", "count")],
+            "예측합계(kWh)": g[("예측(kWh)", "sum")],
+            "반사실합계(kWh)": g[("반사실(kWh)", "sum")],
+        }).reset_index()
+        out.insert(0, "지역", "전국" if level == "전국" else out.pop("지역구분"))
+        out.insert(0, "수준", level)
+        frames.append(out)
+
+    out = pd.concat(frames, ignore_index=True)
+    out["장마손실(kWh)"] = out["반사실합계(kWh)"] - out["예측합계(kWh)"]
+    out["지점일당_손실(kWh)"] = out["장마손실(kWh)"] / out["장마철_지점일"]
+    out["손실률(%)"] = out["장마손실(kWh)"] / out["반사실합계(kWh)"] * 100
+    return out[["수준", "지역", "연도"] + [c for c in out.columns if c not in ("수준", "지역", "연도")]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LightGBM 발전량 예측 / 장마 없는 반사실")
+    parser.add_argument("--rounds", type=int, default=ROUNDS)
+    parser.add_argument("--valid-year", type=int, help="검증 연도 (기본 마지막 연도)")
+    args = parser.parse_args(argv)
+
+    features = load_features()
+    years = sorted(set(features.dates.year))
+    valid = args.valid_year or years[-1]
+
+    # 검증 연도를 뺀 학습 → 성능 확인 → 전체 기간으로 다시 학습
+    model = train(features, [y for y in years if y != valid], rounds=args.rounds)
+    score = evaluate(model, features, [valid])
+    print(f"📈 {valid}년 검증: RMSE {score['RMSE']:.2f} kWh / R² {score['R2']:.4f} / "
+          f"MAPE {score['MAPE(%)']:.2f}% (n={score['n']:,})")
+
+    model = train(features, rounds=args.rounds)
+    print(importance(model).round(1).to_string())
+
+    os.makedirs("output", exist_ok=True)
+    model.save_model("output/발전량_예측모델.txt")
+    table = counterfactual_losses(model, features)
+    table.to_csv("output/발전량_반사실_장마없음.csv", index=False, encoding="utf-8-sig")
+    print(table.round(1).to_string(index=False))
+    print("✅ output/발전량_예측모델.txt / 발전량_반사실_장마없음.csv")
+
+
+if __name__ == "__main__":
+    main()
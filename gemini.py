@@ -4,6 +4,9 @@ from plotly.subplots import make_subplots
 import plotly.express as px
 import os
 
+from profiling import stage
+
+@stage("월별 발전량 그래프")
 def generate_monthly_graph_with_long_term_avg_change():
     # -----------------------------------------------------------------
     # 1단계: 데이터 불러오기 및 월별 집계
@@ -1,7 +1,11 @@
+import os
+import sys
+
 import pandas as pd
-import fiona
-from shapely.geometry import Point, shape
-import pyproj
+
+from artifacts import BuildGraph
+from data_store import file_hash
+from spatial_index import RegionIndex
 
 # ------------------------------------------------------------------------------------
 # 1) 좌표 불러오기 (WGS84)
@@ -9,45 +13,39 @@ import pyproj
 coords = pd.read_csv("data/좌표.csv")
 
 # ------------------------------------------------------------------------------------
-# 2) SHP 경계 (EPSG:5179) 불러오기
+# 2) SHP 경계 (EPSG:5179)
+#    시군구도 같은 방식: python geo_mapping.py <시군구 shp> SIGUNGU_NM 시군구
 # ------------------------------------------------------------------------------------
 shp_path = "data/bnd_sido_00_2024_2Q/bnd_sido_00_2024_2Q.shp"
-sido = list(fiona.open(shp_path))
+name_field = "SIDO_NM"   # ★ 최종 정답 필드명
+out_col = "시도"
+if len(sys.argv) > 3:
+    shp_path, name_field, out_col = sys.argv[1:4]
 
-features = []
-for f in sido:
-    geom = shape(f['geometry'])
-    props = f['properties']
-    features.append((geom, props))
-
-# ------------------------------------------------------------------------------------
-# 3) WGS84 → EPSG:5179 변환기 생성
-# ------------------------------------------------------------------------------------
-proj_4326 = pyproj.CRS("EPSG:4326")     # 위도/경도
-proj_5179 = pyproj.CRS("EPSG:5179")     # SHP 좌표계
-transformer = pyproj.Transformer.from_crs(proj_4326, proj_5179, always_xy=True)
+output_path = "관측소_시도매핑.csv" if out_col == "시도" else f"관측소_{out_col}매핑.csv"
 
 # ------------------------------------------------------------------------------------
-# 4) 점 → 시도 매핑 함수
+# 3) 점 → 행정구역 일괄 매핑 (좌표 변환/포함 판정 모두 배열 단위, STRtree 색인)
+#    좌표/경계 파일이 그대로면 이전 결과 재사용
 # ------------------------------------------------------------------------------------
-def find_sido(lat, lon):
-    # 위경도(4326) → 5179 변환
-    x, y = transformer.transform(lon, lat)
-    p = Point(x, y)
-
-    for geom, props in features:
-        if geom.contains(p):
-            return props["SIDO_NM"]   # ★ 최종 정답 필드명
+def build():
+    index = RegionIndex.from_shapefile(shp_path, name_field, crs="EPSG:5179")
+    coords[out_col] = index.lookup(coords["위도"], coords["경도"])
+    coords.to_csv(output_path, index=False)
 
-    return "UNKNOWN"
 
-# ------------------------------------------------------------------------------------
-# 5) 전체 매핑 수행
-# ------------------------------------------------------------------------------------
-coords["시도"] = coords.apply(lambda r: find_sido(r["위도"], r["경도"]), axis=1)
+shp_parts = [os.path.splitext(shp_path)[0] + ext for ext in (".shp", ".dbf", ".prj")]
+graph = BuildGraph(os.path.join(os.path.dirname(os.path.abspath(output_path)), ".geo_manifest.json"))
+graph.target(
+    output_path,
+    [coords, name_field, out_col,
+     [file_hash(p) for p in shp_parts if os.path.exists(p)],
+     build, RegionIndex.locate],
+    build,
+)
+graph.finish()
 
 # ------------------------------------------------------------------------------------
-# 6) 결과 저장
+# 4) 결과
 # ------------------------------------------------------------------------------------
-coords.to_csv("관측소_시도매핑.csv", index=False)
-print("매핑 완료! 관측소_시도매핑.csv 생성됨")
+print(f"매핑 완료! {output_path} 생성됨")
@@ -3,19 +3,18 @@ import plotly.express as px
 import plotly.io as pio
 from pathlib import Path
 
+from data_store import load_table
+from monsoon import tag_months
+
 # ===== 파일 경로 =====
 weather_path = "data/2020~2024_수정본.csv"
 power_path = "data/예측발전량_PR가변_수정.csv"
 OUT_DIR = Path("output")
 OUT_DIR.mkdir(exist_ok=True)
 
-# ===== CSV 로드 =====
-weather = pd.read_csv(weather_path, encoding="utf-8")
-power = pd.read_csv(power_path, encoding="utf-8")
-
-# ===== 일시 파싱 =====
-for df in [weather, power]:
-    df["일시"] = pd.to_datetime(df["일시"], errors="coerce")
+# ===== CSV 로드 (Parquet 캐시, 일시는 datetime 으로 저장됨) =====
+weather = load_table(weather_path)
+power = load_table(power_path)
 
 # ===== 지점명 → 시도명 매핑 =====
 mapping = {
@@ -44,7 +43,7 @@ merged = pd.merge(weather, power, on=["지점명","일시"], how="inner")
 
 # ===== 장마철 여부 =====
 merged["월"] = merged["일시"].dt.month
-merged["장마철여부"] = merged["월"].apply(lambda x: "장마철" if 6 <= x <= 7 else "비장마철")
+merged["장마철여부"] = tag_months(merged["월"], (6, 7))
 
 # ===== 손실량 계산 =====
 irr_col = [c for c in merged.columns if "합계 일사량" in c][0]
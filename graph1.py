@@ -3,14 +3,34 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import os
 
-# ===== 데이터 불러오기 =====
-weather = pd.read_csv("data/2020~2024.csv", encoding="utf-8")
-pred = pd.read_csv("data/예측발전량_PR고정_수정.csv", encoding="utf-8")
+from streaming import STREAMING, rain_power_stats
 
-weather["일시"] = pd.to_datetime(weather["일시"], errors="coerce")
-pred["일시"] = pd.to_datetime(pred["일시"], errors="coerce")
+POWER_COL = "예측발전량_PR고정(kWh)"
+RAIN_BINS = [0, 1, 5, 10, 20, 50, 200]
 
-merged = pd.merge(pred, weather, on=["지점명", "일시"], how="inner")
+if STREAMING:
+    # ===== CLIMATE_STREAMING=1: 연도 파티션 단위 =====
+    # 산점도/박스플롯은 균등 표본, 누적 평균은 강수량 값별 합계/개수로 정확히 계산
+    stats = rain_power_stats("data/2020~2024.csv", "data/예측발전량_PR고정_수정.csv",
+                             POWER_COL, RAIN_BINS, include_lowest=True)
+    merged = stats["sample"]
+    by_rain = stats["by_rain"]
+    cum_x = by_rain["일강수량(mm)"]
+    cum_y = by_rain["sum"].cumsum() / by_rain["count"].cumsum()
+else:
+    # ===== 데이터 불러오기 =====
+    weather = pd.read_csv("data/2020~2024.csv", encoding="utf-8")
+    pred = pd.read_csv("data/예측발전량_PR고정_수정.csv", encoding="utf-8")
+
+    weather["일시"] = pd.to_datetime(weather["일시"], errors="coerce")
+    pred["일시"] = pd.to_datetime(pred["일시"], errors="coerce")
+
+    merged = pd.merge(pred, weather, on=["지점명", "일시"], how="inner")
+    merged["강수량_구간"] = pd.cut(merged["일강수량(mm)"], bins=RAIN_BINS, include_lowest=True)
+
+    merged_sorted = merged.sort_values("일강수량(mm)")
+    cum_x = merged_sorted["일강수량(mm)"]
+    cum_y = merged_sorted[POWER_COL].expanding().mean()
 
 output_dir = "./그래프_저장"
 os.makedirs(output_dir, exist_ok=True)
@@ -26,7 +46,6 @@ plt.savefig(os.path.join(output_dir, "강수량_vs_예측발전량.png"), dpi=30
 plt.close()
 
 # ② Boxplot
-merged["강수량_구간"] = pd.cut(merged["일강수량(mm)"], bins=[0, 1, 5, 10, 20, 50, 200], include_lowest=True)
 plt.figure(figsize=(6,5))
 sns.boxplot(x="강수량_구간", y="예측발전량_PR고정(kWh)", data=merged)
 plt.title("강수량 구간별 예측 발전량 분포")
@@ -36,10 +55,8 @@ plt.savefig(os.path.join(output_dir, "강수량구간별_예측발전량.png"),
 plt.close()
 
 # ③ 누적 평균 그래프
-merged_sorted = merged.sort_values("일강수량(mm)")
-merged_sorted["누적평균_발전량"] = merged_sorted["예측발전량_PR고정(kWh)"].expanding().mean()
 plt.figure(figsize=(6,5))
-plt.plot(merged_sorted["일강수량(mm)"], merged_sorted["누적평균_발전량"], color="orange")
+plt.plot(cum_x, cum_y, color="orange")
 plt.title("강수량 증가에 따른 누적 평균 발전량 변화")
 plt.xlabel("일강수량 (mm)")
 plt.ylabel("누적 평균 발전량 (kWh)")
@@ -0,0 +1,77 @@
+# image_batch.py
+"""
+Plotly 그림 → PNG 일괄 렌더링
+
+- 입력 지문이 manifest 와 같고 파일이 있으면 건너뜀
+- 나머지는 프로세스 풀로 분배. 워커마다 kaleido(Chrome)를 한 번 띄워두고 재사용
+- 그림 생성(build)은 메인 프로세스에서, PNG 변환만 워커에서 수행
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import util
+
+from artifacts import Manifest
+
+# path: 저장 경로 / key: 입력 지문 / build: 인자 없이 plotly Figure 를 돌려주는 함수
+ImageJob = namedtuple("ImageJob", ["path", "key", "build"])
+
+# kaleido 서버를 띄운 프로세스 pid (workers=1 이면 render_batch 마다 부모에서 호출됨)
+# bool 이 아니라 pid 로 비교 → fork 된 풀 워커는 부모 값을 물려받아도 자기 서버를 띄움
+_kaleido_pid = None
+
+
+def warm_kaleido():
+    """워커 초기화: kaleido 서버를 미리 띄워 이미지마다 Chrome 을 새로 켜지 않게 함"""
+    global _kaleido_pid
+    if _kaleido_pid == os.getpid():
+        return
+    import kaleido
+
+    start = getattr(kaleido, "start_sync_server", None)
+    if start is None:
+        return  # kaleido 0.x 는 프로세스당 서브프로세스를 자동으로 재사용
+    start(silence_warnings=True)
+    _kaleido_pid = os.getpid()
+    # 풀 워커는 atexit 를 거치지 않으므로 multiprocessing 종료 훅으로 Chrome 정리
+    util.Finalize(None, kaleido.stop_sync_server,
+                  kwargs={"silence_warnings": True}, exitpriority=10)
+
+
+def render_one(payload):
+    """(그림 JSON, 경로, scale) → PNG 저장"""
+    import plotly.io as pio
+
+    fig_json, path, scale = payload
+    pio.write_image(pio.from_json(fig_json), path, scale=scale)
+    return path
+
+
+def render_batch(jobs, manifest_path, workers=None, scale=2):
+    """jobs 중 바뀐 것만 렌더링. 실제로 그린 경로 리스트 반환"""
+    manifest = Manifest(manifest_path)
+    todo = []
+    for job in jobs:
+        if manifest.is_fresh(job.path, job.key):
+            print(f"⏭️ 변경 없음: {job.path}")
+        else:
+            todo.append(job)
+    if not todo:
+        return []
+
+    payloads = [(job.build().to_json(), job.path, scale) for job in todo]
+    workers = min(workers or os.cpu_count() or 1, len(todo))
+
+    if workers == 1:
+        warm_kaleido()
+        done = [render_one(p) for p in payloads]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=warm_kaleido) as pool:
+            done = list(pool.map(render_one, payloads))
+
+    for job in todo:
+        manifest.record(job.path, job.key)
+        print(f"✅ 저장 완료: {job.path}")
+    manifest.save()
+    return done
@@ -0,0 +1,125 @@
+# imputation.py
+"""
+지점별 결측 보정 엔진 (결측.py 용)
+
+- (지점, 일시) 정렬 후 모든 수치 컬럼을 2차원 NumPy 배열 하나로 한 번에 보간
+  이전/다음 유효값 위치는 누적 max/min 으로 구하고, 지점 경계를 넘지 않게 자름
+- 지점 안에서 선형 보간(일시 간격 기준), 앞/뒤 끝은 가장 가까운 값으로 채움
+- 지점 전체가 비어 있으면 전체 평균
+- 같은 정렬/지점 코드로 bincount 해서 지점별 count/mean/std 리포트 생성
+- 행 수에 선형 (정렬 1회 + 배열 연산)
+"""
+
+import numpy as np
+import pandas as pd
+
+REPORT_COLS = ["합계 일사량(MJ/m2)", "일강수량(mm)"]
+
+
+def numeric_columns(df):
+    return df.select_dtypes(include=["float64", "int64"]).columns.tolist()
+
+
+def _positions(times):
+    """보간용 x 좌표: 일시가 모두 있으면 일 단위, 아니면 행 순서"""
+    if not pd.isna(times).any():
+        return times.astype("datetime64[D]").astype("float64")
+    return np.arange(len(times), dtype="float64")
+
+
+def interpolate_groups(values, codes, x):
+    """
+    values: (n, k) float 배열, codes: 정렬된 지점 코드, x: 행별 위치
+    같은 지점 안에서만 선형 보간 + 양 끝 채움. 지점 전체가 NaN 이면 NaN 유지
+    """
+    n = len(codes)
+    idx = np.arange(n)[:, None]
+    valid = ~np.isnan(values)
+
+    # 지점 시작/끝 행 번호
+    bounds = np.flatnonzero(np.diff(codes)) + 1
+    starts = np.repeat(np.r_[0, bounds], np.diff(np.r_[0, bounds, n]))[:, None]
+    stops = np.repeat(np.r_[bounds, n], np.diff(np.r_[0, bounds, n]))[:, None]
+
+    prev = np.maximum.accumulate(np.where(valid, idx, -1), axis=0)
+    nxt = np.minimum.accumulate(np.where(valid, idx, n)[::-1], axis=0)[::-1]
+    has_prev = prev >= starts
+    has_next = nxt < stops
+
+    p = np.clip(prev, 0, n - 1)
+    q = np.clip(nxt, 0, n - 1)
+    vp = np.take_along_axis(values, p, axis=0)
+    vq = np.take_along_axis(values, q, axis=0)
+
+    xi = x[:, None]
+    span = x[q] - x[p]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        w = np.where(span > 0, (xi - x[p]) / span, 0.0)
+    both = vp + (vq - vp) * w
+
+    out = np.where(has_prev & has_next, both,
+                   np.where(has_prev, vp, np.where(has_next, vq, np.nan)))
+    return np.where(valid, values, out)
+
+
+def station_report(values, codes, names, cols):
+    """지점별 count / mean / std(ddof=1) — bincount 2회"""
+    n_groups = len(names)
+    out = {"지점명": names}
+    for j, col in enumerate(cols):
+        v = values[:, j]
+        ok = ~np.isnan(v)
+        c = codes[ok]
+        cnt = np.bincount(c, minlength=n_groups)
+        s = np.bincount(c, weights=v[ok], minlength=n_groups)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = s / cnt
+            sq = np.bincount(c, weights=(v[ok] - mean[c]) ** 2, minlength=n_groups)
+            std = np.sqrt(sq / (cnt - 1))
+        out[f"{col}_count"] = cnt
+        out[f"{col}_mean"] = mean
+        out[f"{col}_std"] = std
+    return pd.DataFrame(out)
+
+
+def impute(df, cols=None, station_col="지점명", time_col="일시", report_cols=REPORT_COLS):
+    """
+    지점별 시간순 보간 → 전체 평균 순으로 결측 보정.
+    (보정된 DataFrame(원래 행 순서), 지점별 리포트) 반환
+    """
+    cols = cols or numeric_columns(df)
+    report_cols = [c for c in report_cols if c in cols]
+
+    station = df[station_col].astype("category")
+    codes = station.cat.codes.to_numpy()
+    if time_col in df.columns:
+        times = pd.to_datetime(df[time_col], errors="coerce").to_numpy()
+        order = np.lexsort((times, codes))
+        times = times[order]
+    else:
+        order = np.argsort(codes, kind="stable")
+        times = None
+    codes = codes[order]
+
+    values = df[cols].to_numpy(dtype="float64")[order]
+    x = _positions(times) if times is not None else np.arange(len(order), dtype="float64")
+    filled = interpolate_groups(values, codes, x)
+
+    # 지점 전체가 비어 있던 칸 → 전체 평균
+    col_mean = np.nanmean(filled, axis=0) if len(filled) else np.zeros(len(cols))
+    filled = np.where(np.isnan(filled), col_mean, filled)
+
+    out = df.copy()
+    restored = np.empty_like(filled)
+    restored[order] = filled
+    for j, col in enumerate(cols):
+        if pd.api.types.is_integer_dtype(df[col]):
+            continue  # 정수 컬럼(지점 번호 등)은 결측이 없으므로 그대로
+        out[col] = restored[:, j]
+
+    names = list(station.cat.categories)
+    # 지점명 NaN(code -1) 행은 리포트에서 제외
+    keep = codes >= 0
+    rep_idx = [cols.index(c) for c in report_cols]
+    report = station_report(filled[keep][:, rep_idx], codes[keep], names, report_cols)
+    return out, report
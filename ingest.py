@@ -0,0 +1,253 @@
+# ingest.py
+"""
+기상청 ASOS 월별 CSV (data/20XX_*.csv) → 하나의 long 포맷 Parquet 저장소
+
+- 파일마다 인코딩/키 컬럼/값 컬럼을 헤더에서 추정 (utf-8 / cp949, 지점·지점명·일시 별칭)
+- chunk 단위로 읽어서 (지점, 지점명, 일시, 변수, 값) 으로 녹인 뒤 파일별 part 로 바로 기록
+- manifest 에 파일 서명(mtime/크기/sha256) 저장 → 새 연도/변수 파일만 추가, 바뀐 파일만 다시 기록
+- load_long() / load_wide() 로 읽기
+"""
+
+import codecs
+import glob
+import json
+import os
+import re
+import sys
+
+import pandas as pd
+
+from data_store import cache_path, file_hash, resolve_path
+
+SOURCE_GLOB = "data/20[0-9][0-9]_*.csv"
+STORE_DIR = "asos_long"   # CACHE_DIR 아래 폴더 이름 (store_dir 를 안 주면 호출 시점에 결정)
+CHUNK_ROWS = 50_000
+STORE_VERSION = 1
+
+# 표준 키 컬럼 ← 기상청 자료별로 다르게 나오는 헤더
+KEY_ALIASES = {
+    "지점":   ["지점", "지점번호", "stn_id", "stnid"],
+    "지점명": ["지점명", "관측소명", "stn_nm", "stnnm"],
+    "일시":   ["일시", "날짜", "년월", "년월일", "tm", "date"],
+}
+
+
+# ---------------------------------------------------------
+# 스키마 추정
+# ---------------------------------------------------------
+def detect_encoding(path, sample=1 << 16):
+    with open(path, "rb") as f:
+        raw = f.read(sample)
+    for enc in ("utf-8-sig", "cp949"):
+        try:
+            codecs.getincrementaldecoder(enc)().decode(raw, final=False)
+            return enc
+        except UnicodeDecodeError:
+            continue
+    return "latin-1"
+
+
+def _norm(name):
+    return re.sub(r"\s+", "", str(name)).lower()
+
+
+def variable_name(header):
+    """값 컬럼 헤더 → 변수명 (공백 정리만, 단위 괄호는 유지)"""
+    return re.sub(r"\s+", " ", str(header)).strip()
+
+
+def infer_schema(path):
+    """{"encoding", "keys": {표준명: 원래 헤더}, "values": {원래 헤더: 변수명}}"""
+    encoding = detect_encoding(path)
+    header = pd.read_csv(path, encoding=encoding, nrows=0).columns.tolist()
+
+    keys = {}
+    for std, aliases in KEY_ALIASES.items():
+        wanted = {_norm(a) for a in aliases}
+        for col in header:
+            if _norm(col) in wanted and col not in keys.values():
+                keys[std] = col
+                break
+    if "일시" not in keys or not ({"지점", "지점명"} & set(keys)):
+        raise ValueError(f"{os.path.basename(path)}: 지점/일시 컬럼을 찾을 수 없습니다 → {header}")
+
+    values = {c: variable_name(c) for c in header if c not in keys.values()}
+    return {"encoding": encoding, "keys": keys, "values": values}
+
+
+# ---------------------------------------------------------
+# 파일 1개 → long part (chunk 스트리밍)
+# ---------------------------------------------------------
+def _arrow_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("지점", pa.int64()),
+        ("지점명", pa.string()),
+        ("일시", pa.timestamp("ns")),
+        ("변수", pa.string()),
+        ("값", pa.float64()),
+        ("원본", pa.string()),
+    ])
+
+
+def melt_chunk(chunk, schema, source):
+    keys = schema["keys"]
+    chunk = chunk.rename(columns={v: k for k, v in keys.items()})
+    chunk = chunk.rename(columns=schema["values"])
+    id_cols = [k for k in ("지점", "지점명", "일시") if k in chunk.columns]
+
+    long = chunk.melt(id_vars=id_cols, value_vars=list(schema["values"].values()),
+                      var_name="변수", value_name="값")
+    if "지점" not in long.columns:
+        long["지점"] = pd.NA
+    if "지점명" not in long.columns:
+        long["지점명"] = None
+
+    long["지점"] = pd.to_numeric(long["지점"], errors="coerce").astype("Int64")
+    long["지점명"] = long["지점명"].astype("string")
+    long["일시"] = pd.to_datetime(long["일시"].astype(str), errors="coerce", format="mixed")
+    long["값"] = pd.to_numeric(long["값"], errors="coerce")
+    long["원본"] = source
+    return long[["지점", "지점명", "일시", "변수", "값", "원본"]]
+
+
+def ingest_file(path, part_path, chunk_rows=CHUNK_ROWS):
+    """CSV 하나를 chunk 단위로 읽어 part 파일 하나로 기록. (행 수, 스키마) 반환"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = infer_schema(path)
+    source = os.path.basename(path)
+    arrow_schema = _arrow_schema()
+    rows = 0
+
+    tmp = part_path + ".tmp"
+    with pq.ParquetWriter(tmp, arrow_schema) as writer:
+        reader = pd.read_csv(path, encoding=schema["encoding"], chunksize=chunk_rows,
+                             dtype=str, keep_default_na=True)
+        for chunk in reader:
+            long = melt_chunk(chunk, schema, source)
+            writer.write_table(pa.Table.from_pandas(long, schema=arrow_schema, preserve_index=False))
+            rows += len(long)
+    os.replace(tmp, part_path)
+    return rows, schema
+
+
+# ---------------------------------------------------------
+# 저장소 (파일별 증분)
+# ---------------------------------------------------------
+def _manifest_path(store_dir):
+    return os.path.join(store_dir, "manifest.json")
+
+
+def _read_manifest(store_dir):
+    path = _manifest_path(store_dir)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == STORE_VERSION:
+            return manifest
+    return {"version": STORE_VERSION, "files": {}}
+
+
+def _write_manifest(store_dir, manifest):
+    tmp = _manifest_path(store_dir) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, _manifest_path(store_dir))
+
+
+def _unchanged(entry, path):
+    """내용이 같은지 (mtime/크기가 같으면 해시 생략). touch 만 된 경우 entry 의 mtime/크기를 갱신"""
+    st = os.stat(path)
+    if st.st_mtime == entry["mtime"] and st.st_size == entry["size"]:
+        return True
+    if file_hash(path) != entry["sha256"]:
+        return False
+    entry["mtime"], entry["size"] = st.st_mtime, st.st_size
+    return True
+
+
+def ingest(pattern=SOURCE_GLOB, store_dir=None, chunk_rows=CHUNK_ROWS, verbose=True):
+    """새로 생겼거나 바뀐 파일만 part 로 기록, 사라진 파일의 part 는 삭제"""
+    store_dir = store_dir or cache_path(STORE_DIR)
+    os.makedirs(store_dir, exist_ok=True)
+    manifest = _read_manifest(store_dir)
+    files = manifest["files"]
+
+    sources = sorted(glob.glob(resolve_path(pattern)))
+    names = {os.path.basename(p): p for p in sources}
+    added, skipped = [], []
+
+    for name in sorted(set(files) - set(names)):
+        part = os.path.join(store_dir, files.pop(name)["part"])
+        if os.path.exists(part):
+            os.remove(part)
+        if verbose:
+            print(f"🗑️ 제거: {name}")
+
+    for name, path in names.items():
+        entry = files.get(name)
+        part_name = os.path.splitext(name)[0] + ".parquet"
+        part = os.path.join(store_dir, part_name)
+        if entry and os.path.exists(part) and _unchanged(entry, path):
+            skipped.append(name)
+            continue
+
+        rows, schema = ingest_file(path, part, chunk_rows)
+        st = os.stat(path)
+        files[name] = {
+            "part": part_name, "rows": rows,
+            "mtime": st.st_mtime, "size": st.st_size, "sha256": file_hash(path),
+            "encoding": schema["encoding"], "variables": sorted(set(schema["values"].values())),
+        }
+        _write_manifest(store_dir, manifest)  # 파일 하나 끝날 때마다 기록 (중단돼도 이어서)
+        added.append(name)
+        if verbose:
+            print(f"➕ {name}: {rows:,}행 ({', '.join(files[name]['variables'])})")
+
+    _write_manifest(store_dir, manifest)
+    if verbose:
+        print(f"✅ 추가/갱신 {len(added)}개 / 변경 없음 {len(skipped)}개 → {store_dir}")
+    return added
+
+
+def load_long(variables=None, years=None, store_dir=None):
+    """long 포맷 (지점, 지점명, 일시, 변수, 값). 변수/연도 필터는 Parquet 에서 바로 적용"""
+    import pyarrow.dataset as ds
+
+    store_dir = store_dir or cache_path(STORE_DIR)
+    manifest = _read_manifest(store_dir)
+    parts = [os.path.join(store_dir, e["part"]) for e in manifest["files"].values()]
+    if not parts:
+        return pd.DataFrame(columns=["지점", "지점명", "일시", "변수", "값"])
+
+    dataset = ds.dataset(parts, format="parquet")
+    expr = None
+    if variables is not None:
+        expr = ds.field("변수").isin(list(variables))
+    if years is not None:
+        year_expr = None
+        for y in sorted(set(years)):
+            e = (ds.field("일시") >= pd.Timestamp(y, 1, 1)) & (ds.field("일시") < pd.Timestamp(y + 1, 1, 1))
+            year_expr = e if year_expr is None else year_expr | e
+        expr = year_expr if expr is None else expr & year_expr
+
+    df = dataset.to_table(columns=["지점", "지점명", "일시", "변수", "값"], filter=expr).to_pandas()
+    df["지점명"] = df["지점명"].astype("category")
+    df["변수"] = df["변수"].astype("category")
+    return df.reset_index(drop=True)
+
+
+def load_wide(variables=None, years=None, store_dir=None):
+    """wide 포맷: (지점, 지점명, 일시) × 변수"""
+    long = load_long(variables, years, store_dir)
+    wide = long.pivot_table(index=["지점", "지점명", "일시"], columns="변수", values="값",
+                            aggfunc="first", observed=True)
+    wide.columns.name = None
+    return wide.reset_index()
+
+
+if __name__ == "__main__":
+    ingest(sys.argv[1] if len(sys.argv) > 1 else SOURCE_GLOB)
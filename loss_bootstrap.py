@@ -0,0 +1,235 @@
+# loss_bootstrap.py
+"""
+장마철 손실량 신뢰구간 (블록 부트스트랩)
+
+- summer.py 의 nat / rg 손실량은 그룹 평균 차이 하나뿐 → 연도 × 지역마다
+  (비장마철 평균 - 장마철 평균) 일사량 차이를 지점-일 블록 단위로 재표본
+- 블록 = 연속 BLOCK_DAYS 일 (기본: 그 기간의 모든 지점을 한 블록으로)
+  장마철 날짜는 모든 지점이 같이 겪으므로 같은 날 지점 간 상관이 크다 → 지점별로 따로 뽑으면 구간이 좁게 나옴
+  --block-by 지점 이면 지점 × 기간 블록 (지점 간 독립 가정, 비교용)
+  블록마다 [비장마철 합, 비장마철 개수, 장마철 합, 장마철 개수] 를 np.bincount 로 한 번 계산
+- 재표본 = (재표본 수 × 블록 수) 인덱스 행렬 → 블록별 뽑힌 횟수 × 블록 합계 (행렬곱)
+  Python 루프는 CHUNK 개 재표본 묶음 단위뿐
+- 연도 × 지역 작업마다 독립 시드 (SeedSequence.spawn) → workers 수와 상관없이 같은 결과
+- 전체 표본 점추정은 loss_engine.compute_losses 의 차이와 같음
+
+    python loss_bootstrap.py                          # 여름(6~8월), 10,000회
+    python loss_bootstrap.py --season 전체 --workers 4
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from data_store import POWER_ROW_COL, load_merged, merged_cache, partition_years, read_cache
+from loss_engine import (DATA_CAP, DATA_MAP, DATA_POWER, DATA_WEATHER, FACTOR, IRR_COL,
+                         SEASONS, SMP, capacity_table, monsoon_labels, tag_region)
+from profiling import stage
+from regression import group_codes
+from streaming import STREAMING
+
+BLOCK_DAYS = 7       # 블록 길이 (일)
+# 블록 단위 → 기간 외에 블록을 나누는 키 (지역구분은 항상 포함)
+BLOCK_BY = {"기간": [], "지점": ["지점명"]}
+RESAMPLES = 10_000
+CHUNK = 250          # 한 번에 만드는 재표본 수 (인덱스 행렬 메모리 제한)
+LEVEL = 0.95
+COLUMNS = ["지점명", "일시", "시도", "장마철여부", IRR_COL, POWER_ROW_COL]
+
+
+# -------------------------------------------------------
+# 블록 합계
+# -------------------------------------------------------
+def block_sums(part, months=None, block_days=BLOCK_DAYS, by="기간"):
+    """
+    한 연도 지점-일 → (블록 키 DataFrame[지역구분, (지점명), 블록], 블록 × 4 합계 배열)
+    합계 열 순서: 비장마철 합, 비장마철 개수, 장마철 합, 장마철 개수
+    """
+    # monthly_sums 와 같은 기준: 발전량 행만, 날짜/장마철여부가 없는 행, 일사량 결측은 제외
+    part = part[part["일시"].notna() & part["장마철여부"].notna() & part[POWER_ROW_COL]]
+    if months is not None:
+        part = part[part["일시"].dt.month.isin(list(months))]
+    irr = pd.to_numeric(part[IRR_COL], errors="coerce").to_numpy(dtype="float64")
+    part = part[~np.isnan(irr)]
+    irr = irr[~np.isnan(irr)]
+
+    sido = part["시도"].astype("category")
+    labels = np.array([tag_region(c) for c in sido.cat.categories] + ["기타"], dtype=object)
+    keys = pd.DataFrame({
+        "지역구분": labels[sido.cat.codes.to_numpy()],
+        "지점명": part["지점명"].astype(str).to_numpy(),
+        "블록": (part["일시"].dt.dayofyear.to_numpy() - 1) // block_days,
+    })
+    codes, blocks = group_codes(keys, ["지역구분"] + BLOCK_BY[by] + ["블록"])
+
+    monsoon = monsoon_labels(part["장마철여부"]) == "장마철"
+    n = len(blocks)
+    stats = np.column_stack([
+        np.bincount(codes, np.where(monsoon, 0.0, irr), n),
+        np.bincount(codes, (~monsoon).astype("float64"), n),
+        np.bincount(codes, np.where(monsoon, irr, 0.0), n),
+        np.bincount(codes, monsoon.astype("float64"), n),
+    ])
+    return blocks, stats
+
+
+def mean_diff(totals):
+    """(..., 4) 합계 → 비장마철 평균 - 장마철 평균 (한쪽 개수가 0 이면 NaN)"""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return totals[..., 0] / totals[..., 1] - totals[..., 2] / totals[..., 3]
+
+
+# -------------------------------------------------------
+# 재표본
+# -------------------------------------------------------
+def resample_diffs(stats, n_boot=RESAMPLES, seed=None, chunk=CHUNK):
+    """블록 합계 (블록 × 4) → 재표본 n_boot 개의 평균 차이 배열"""
+    rng = np.random.default_rng(seed)
+    n_blocks = len(stats)
+    out = np.empty(n_boot)
+    for start in range(0, n_boot, chunk):
+        size = min(chunk, n_boot - start)
+        # 재표본마다 블록 n_blocks 개를 복원추출 → 행별 뽑힌 횟수 → 블록 합계와 행렬곱
+        idx = rng.integers(0, n_blocks, size=(size, n_blocks))
+        idx += np.arange(size)[:, None] * n_blocks
+        counts = np.bincount(idx.ravel(), minlength=size * n_blocks).reshape(size, n_blocks)
+        out[start:start + size] = mean_diff(counts @ stats)
+    return out
+
+
+def _run_task(task):
+    """풀 워커용: (키, 블록 합계, 재표본 수, 시드) → (키, 재표본 차이)"""
+    key, stats, n_boot, seed = task
+    return key, resample_diffs(stats, n_boot, seed)
+
+
+def merge_blocks(blocks, stats, keys):
+    """같은 keys 블록끼리 합계를 더함 (예: 지역구분이 다른 같은 기간 블록 → 전국 블록 하나)"""
+    codes, merged = group_codes(blocks, keys)
+    return np.column_stack([np.bincount(codes, stats[:, j], len(merged)) for j in range(stats.shape[1])])
+
+
+def strata(blocks, stats, by="기간"):
+    """한 연도 블록 → [(수준, 지역, 블록 합계)] : 전국 + 지역구분별"""
+    out = [("전국", "전국", merge_blocks(blocks, stats, BLOCK_BY[by] + ["블록"]))]
+    for region, idx in blocks.groupby("지역구분").indices.items():
+        out.append(("지역구분", region, stats[idx]))
+    return out
+
+
+def year_parts(weather_path=DATA_WEATHER, power_path=DATA_POWER, mapping_path=DATA_MAP):
+    """(연도, 지점-일 프레임) 순회. CLIMATE_STREAMING=1 이면 연도 파티션만 읽음"""
+    if STREAMING:
+        merged_dir = merged_cache(weather_path, power_path, mapping_path)
+        for year in partition_years(merged_dir):
+            yield year, read_cache(merged_dir, COLUMNS, [("연도", "==", year)])
+        return
+    merged = load_merged(weather_path, power_path, mapping_path, columns=COLUMNS + ["연도"])
+    yield from merged.groupby("연도", observed=True)
+
+
+@stage("부트스트랩")
+def bootstrap_losses(months=None, n_boot=RESAMPLES, block_days=BLOCK_DAYS, level=LEVEL,
+                     seed=0, workers=None, block_by="기간", **paths):
+    """
+    연도 × (전국, 지역구분) 손실량 신뢰구간 tidy 표
+    수준, 지역, 연도, 블록수, 차이, 표준오차, 차이_하한, 차이_상한, 손실량(kWh/MW)_하한/상한
+    """
+    tasks = []
+    points = {}
+    for year, part in year_parts(**paths):
+        blocks, stats = block_sums(part, months, block_days, block_by)
+        for lvl, region, sub in strata(blocks, stats, block_by):
+            key = (lvl, region, int(year))
+            points[key] = (len(sub), float(mean_diff(sub.sum(axis=0))))
+            tasks.append([key, sub, n_boot])
+
+    # 작업 순서대로 독립 시드 → 워커 수와 무관하게 재현
+    for task, child in zip(tasks, np.random.SeedSequence(seed).spawn(len(tasks))):
+        task.append(child)
+
+    workers = min(workers or 1, len(tasks)) if tasks else 1
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = dict(pool.map(_run_task, tasks))
+    else:
+        results = dict(map(_run_task, tasks))
+
+    alpha = (1 - level) / 2
+    rows = []
+    for key, (n_blocks, diff) in points.items():
+        draws = results[key]
+        draws = draws[~np.isnan(draws)]
+        lo, hi = np.quantile(draws, [alpha, 1 - alpha]) if len(draws) else (np.nan, np.nan)
+        rows.append({
+            "수준": key[0], "지역": key[1], "연도": key[2], "블록수": n_blocks,
+            "차이": diff, "표준오차": draws.std(ddof=1) if len(draws) > 1 else np.nan,
+            "차이_하한": lo, "차이_상한": hi,
+        })
+    out = pd.DataFrame(rows)
+    for col in ("차이", "차이_하한", "차이_상한"):
+        out[col.replace("차이", "손실량(kWh/MW)")] = out[col] * FACTOR
+    return out
+
+
+def add_amounts(ci, cap):
+    """설비용량·SMP 를 곱해 손실액(만원) 점추정/하한/상한 추가 (loss_engine.add_loss_cols 와 같은 식)"""
+    out = ci.merge(capacity_table(cap), on=["연도", "지역"], how="left")
+    won = out["설비용량(MW)"] * out["연도"].map(SMP) / 10000
+    for suffix in ("", "_하한", "_상한"):
+        out[f"손실액(만원){suffix}"] = out[f"손실량(kWh/MW){suffix}"] * won
+    return out
+
+
+def ci_figure(ci, season):
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    for region, df in ci.groupby("지역", sort=False):
+        fig.add_trace(go.Scatter(
+            x=df["연도"].astype(str), y=df["손실량(kWh/MW)"], name=region, mode="markers+lines",
+            error_y=dict(type="data", symmetric=False,
+                         array=df["손실량(kWh/MW)_상한"] - df["손실량(kWh/MW)"],
+                         arrayminus=df["손실량(kWh/MW)"] - df["손실량(kWh/MW)_하한"]),
+        ))
+    fig.update_layout(
+        title=f"장마철 손실량 (kWh/MW) {season} — 블록 부트스트랩 {LEVEL:.0%} 신뢰구간",
+        xaxis=dict(type="category", title="연도"),
+        yaxis_title="손실량 (kWh/MW)",
+        template="plotly_white",
+    )
+    return fig
+
+
+def main(argv=None):
+    from data_store import load_table
+
+    parser = argparse.ArgumentParser(description="장마철 손실량 블록 부트스트랩 신뢰구간")
+    parser.add_argument("--season", choices=list(SEASONS), default="여름")
+    parser.add_argument("--resamples", type=int, default=RESAMPLES)
+    parser.add_argument("--block-days", type=int, default=BLOCK_DAYS)
+    parser.add_argument("--block-by", choices=list(BLOCK_BY), default="기간",
+                        help="기간: 같은 기간 모든 지점을 한 블록 / 지점: 지점 × 기간 블록")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, help="재표본 프로세스 수 (기본 1)")
+    args = parser.parse_args(argv)
+
+    ci = bootstrap_losses(SEASONS[args.season], args.resamples, args.block_days,
+                          seed=args.seed, workers=args.workers, block_by=args.block_by)
+    ci = add_amounts(ci, load_table(DATA_CAP, sep="|"))
+
+    os.makedirs("output", exist_ok=True)
+    path = f"output/손실량_신뢰구간_{args.season}.csv"
+    ci.to_csv(path, index=False, encoding="utf-8-sig")
+    ci_figure(ci, args.season).write_html(path.replace(".csv", ".html"), include_plotlyjs="cdn")
+
+    cols = ["지역", "연도", "차이", "차이_하한", "차이_상한", "손실량(kWh/MW)"]
+    print(ci[cols].round(3).to_string(index=False))
+    print(f"✅ {path} (재표본 {args.resamples:,}회, 블록 {args.block_by} × {args.block_days}일)")
+
+
+if __name__ == "__main__":
+    main()
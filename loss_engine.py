@@ -0,0 +1,308 @@
+# loss_engine.py
+"""
+장마철/비장마철 일사량 손실 계산 엔진 (summer.py / economic_loss_final_v4.py 공용)
+
+- 지점-일 테이블은 (연도, 월, 지역구분, 장마철여부) 합계/개수로 한 번만 집계
+- 시즌(전체, 여름 6~8월, 임의 월 조합)과 수준(전국/지역구분)은 이 작은 집계표에서 파생
+  → 시즌을 늘려도 원본 I/O·groupby 추가 없음
+- 결과는 tidy 프레임 하나: 시즌 × 수준 × 지역 × 연도
+"""
+
+import numpy as np
+import pandas as pd
+
+from data_store import POWER_ROW_COL, clean_columns, load_merged, load_table, resolve_path
+from profiling import stage
+from streaming import STREAMING, combine_sums, iter_merged
+
+# -------------------------------------------------------
+# 파일 경로 / 상수
+# -------------------------------------------------------
+DATA_WEATHER = "data/2020~2024_revised_monsoon.csv"
+DATA_POWER   = "data/예측발전량_PR가변_수정.csv"
+DATA_CAP     = "data/2020~2024_설비용량.csv"
+DATA_MAP     = "data/관측소_시도매핑.csv"
+
+IRR_COL = "합계 일사량(MJ/m2)"
+# 손실 계산용 일사량: 발전량 파일에 행이 있는 지점-일만 (원래 summer.py 의 power 기준 left join 행 집합)
+# 병합 캐시는 기상 기준이라 발전량이 없는 날도 들어 있음 → POWER_ROW_COL 로 골라 집계 큐브에 파생 변수로 저장
+LOSS_IRR_COL = "합계 일사량(MJ/m2)_발전량행"
+FACTOR  = 20.835   # 일사량 차이(MJ/m²) → 손실량(kWh/MW)
+
+SMP = {2020:68.87, 2021:94.34, 2022:196.65, 2023:167.11, 2024:128.39}
+
+SOUTH = ["전라","경상","부산","울산","광주","대구","제주"]
+NC    = ["서울","경기","인천","강원","충청","세종","대전"]
+
+# 시즌 이름 → 포함 월 (None 이면 전체)
+SEASONS = {"전체": None, "여름": (6, 7, 8)}
+
+LOSS_COLS = ["비장마철","장마철","차이","손실량(kWh/MW)",
+             "설비용량(MW)","총손실량(kWh)","SMP","손실액(만원)"]
+
+
+def tag_region(x):
+    if isinstance(x, str):
+        if any(k in x for k in SOUTH): return "남부"
+        if any(k in x for k in NC):    return "중북부"
+    return "기타"
+
+
+MONSOON_LABELS = {True: "장마철", False: "비장마철"}
+
+
+def monsoon_labels(flag):
+    """장마철여부 컬럼 → "장마철"/"비장마철" object 배열 (bool 컬럼도 같은 이름으로, 결측은 NaN)"""
+    flag = flag.astype("category")
+    labels = [MONSOON_LABELS[c] if isinstance(c, (bool, np.bool_)) else str(c)
+              for c in flag.cat.categories]
+    return np.array(labels + [np.nan], dtype=object)[flag.cat.codes.to_numpy()]
+
+
+# -------------------------------------------------------
+# 입력 로드 (필요한 컬럼만)
+# -------------------------------------------------------
+def load_inputs(weather_path=DATA_WEATHER, power_path=DATA_POWER,
+                mapping_path=DATA_MAP, cap_path=DATA_CAP):
+    merged = load_merged(weather_path, power_path, mapping_path,
+                         columns=["일시","연도","시도","장마철여부",IRR_COL,POWER_ROW_COL])
+    merged = merged[merged[POWER_ROW_COL]]   # 발전량 행 기준 (LOSS_IRR_COL 과 같은 행, 값이 NaN 이어도 포함)
+    cap = load_table(cap_path, sep="|")
+    return merged, cap
+
+
+# -------------------------------------------------------
+# 1단계: 원본 1회 집계
+# -------------------------------------------------------
+@stage("월별 집계")
+def monthly_sums(merged):
+    """(연도, 월, 지역구분, 장마철여부) 별 일사량 합계/개수"""
+    # 지역구분은 시도 종류 수만큼만 tag_region 호출 (시도 NaN → 기타)
+    sido = merged["시도"].astype("category")
+    labels = np.array([tag_region(c) for c in sido.cat.categories] + ["기타"], dtype=object)
+    region = labels[sido.cat.codes.to_numpy()]
+
+    year = merged["연도"] if "연도" in merged.columns else merged["일시"].dt.year
+    irr = pd.to_numeric(merged[IRR_COL], errors="coerce")
+
+    keys = pd.DataFrame({
+        "연도": year.to_numpy(),
+        "월": merged["일시"].dt.month.to_numpy(),
+        "지역구분": region,
+        "장마철여부": monsoon_labels(merged["장마철여부"]),
+        "일사량": irr.to_numpy(),
+    })
+    out = (
+        keys.groupby(["연도","월","지역구분","장마철여부"])["일사량"]
+        .agg(["sum","count"]).reset_index()
+    )
+    out["연도"] = out["연도"].astype(int)
+    out["월"] = out["월"].astype(int)
+    return out
+
+
+@stage("월별 집계 (스트리밍)")
+def monthly_sums_streaming(weather_path=DATA_WEATHER, power_path=DATA_POWER,
+                           mapping_path=DATA_MAP):
+    """monthly_sums 를 연도 파티션 단위로 계산해서 합침 (메모리 = 연도 하나)"""
+    mapping = clean_columns(pd.read_csv(resolve_path(mapping_path), encoding="utf-8-sig"))
+    mapping = mapping[["지점명", "시도"]]
+
+    partials = []
+    for _, part in iter_merged(weather_path, power_path, on=["지점명", "일시"],
+                               left_cols=["지점명", "일시", "장마철여부", IRR_COL],
+                               right_cols=["지점명", "일시"], how="inner"):   # inner = 발전량 행 기준
+        part = part.merge(mapping, on="지점명", how="left")
+        part["연도"] = part["일시"].dt.year
+        partials.append(monthly_sums(part))
+    return combine_sums(partials, ["연도","월","지역구분","장마철여부"])
+
+
+@stage("데이터 로드")
+def load_aggregates(weather_path=DATA_WEATHER, power_path=DATA_POWER,
+                    mapping_path=DATA_MAP, cap_path=DATA_CAP):
+    """
+    (월별 합계/개수, 설비용량). 월별 표는 집계 큐브(aggregates.py)에서 조회
+    CLIMATE_STREAMING=1 이면 연도 파티션 스트리밍
+    """
+    if STREAMING:
+        monthly = monthly_sums_streaming(weather_path, power_path, mapping_path)
+        return monthly, load_table(cap_path, sep="|")
+    from aggregates import load_cube  # aggregates 가 tag_region 을 가져가므로 순환 import 방지
+
+    cube = load_cube(weather_path, power_path, mapping_path)
+    monthly = cube.query("지역구분", "월", LOSS_IRR_COL)
+    return monthly[["연도","월","지역구분","장마철여부","sum","count"]], load_table(cap_path, sep="|")
+
+
+def capacity_table(cap):
+    """설비용량 → (연도, 지역, 설비용량(MW)) : 전국 / 남부 / 중북부"""
+    cap = cap.set_index("연도")
+
+    def sum_region(keys):
+        cols = [c for c in cap.columns if any(k in c for k in keys)]
+        return cap[cols].sum(axis=1)
+
+    wide = pd.DataFrame({
+        "전국": cap.sum(axis=1),
+        "남부": sum_region(SOUTH),
+        "중북부": sum_region(NC),
+    })
+    out = wide.reset_index().melt(id_vars="연도", var_name="지역", value_name="설비용량(MW)")
+    out["연도"] = out["연도"].astype(int)
+    return out
+
+
+# -------------------------------------------------------
+# 2단계: 시즌 × 수준 손실 테이블
+# -------------------------------------------------------
+def season_means(part, keys):
+    """keys × 장마철여부 합계/개수 → keys 별 비장마철/장마철 평균 일사량 (wide)"""
+    g = part.groupby(keys + ["장마철여부"])[["sum","count"]].sum()
+    mean = (g["sum"] / g["count"].where(g["count"] > 0)).rename("일사량")
+
+    wide = mean.reset_index().pivot(index=keys, columns="장마철여부",
+                                    values="일사량").reset_index()
+    wide.columns.name = None
+    for col in ("비장마철", "장마철"):
+        if col not in wide.columns:
+            wide[col] = np.nan
+    return wide
+
+
+def add_loss_cols(out, cap_t, on):
+    """비장마철/장마철 평균 → 차이, 손실량, 설비용량, 총손실량, SMP, 손실액"""
+    out["차이"] = out["비장마철"] - out["장마철"]
+    out["손실량(kWh/MW)"] = out["차이"] * FACTOR
+
+    out = out.merge(cap_t, on=on, how="left")
+    out["총손실량(kWh)"] = out["손실량(kWh/MW)"] * out["설비용량(MW)"]
+    out["SMP"] = out["연도"].map(SMP)
+    out["손실액(만원)"] = (out["총손실량(kWh)"] * out["SMP"] / 10000).fillna(0)
+    return out
+
+
+@stage("손실 계산")
+def compute_losses(monthly, cap, seasons=SEASONS):
+    """tidy 결과: 시즌, 수준, 지역, 연도 + LOSS_COLS"""
+    cap_t = capacity_table(cap)
+    frames = []
+    for season, months in seasons.items():
+        part = monthly if months is None else monthly[monthly["월"].isin(list(months))]
+
+        for level, keys in (("전국", ["연도"]), ("지역구분", ["연도","지역구분"])):
+            wide = season_means(part, keys)
+            wide["지역"] = "전국" if level == "전국" else wide.pop("지역구분")
+            wide["시즌"] = season
+            wide["수준"] = level
+            frames.append(wide)
+
+    out = add_loss_cols(pd.concat(frames, ignore_index=True), cap_t, ["연도","지역"])
+    return out[["시즌","수준","지역","연도"] + LOSS_COLS]
+
+
+def sido_losses(monthly_sido, cap, seasons=SEASONS):
+    """
+    시도별 손실 tidy 표: 시즌, 시도, 연도 + LOSS_COLS
+    monthly_sido: (연도, 월, 시도, 장마철여부) 합계/개수 — 집계 큐브의 시도 × 월 칸
+    """
+    cap_t = cap.melt(id_vars="연도", var_name="시도", value_name="설비용량(MW)")
+    cap_t["연도"] = cap_t["연도"].astype(int)
+    monthly_sido = monthly_sido[monthly_sido["시도"].notna()]
+
+    frames = []
+    for season, months in seasons.items():
+        part = monthly_sido if months is None else monthly_sido[monthly_sido["월"].isin(list(months))]
+        wide = season_means(part, ["연도","시도"])
+        wide["시즌"] = season
+        frames.append(wide)
+
+    out = add_loss_cols(pd.concat(frames, ignore_index=True), cap_t, ["연도","시도"])
+    return out[["시즌","시도","연도"] + LOSS_COLS]
+
+
+def run(seasons=SEASONS, **paths):
+    """로드 → 1회 집계 → 시즌별 손실 테이블"""
+    monthly, cap = load_aggregates(**paths)
+    return compute_losses(monthly, cap, seasons)
+
+
+# -------------------------------------------------------
+# 기존 nat / rg 형태로 꺼내기
+# -------------------------------------------------------
+def national(result, season):
+    nat = result[(result["시즌"] == season) & (result["수준"] == "전국")]
+    nat = nat[["연도"] + LOSS_COLS].rename(columns={"설비용량(MW)": "총설비용량(MW)"})
+    return nat.reset_index(drop=True)
+
+
+def regional(result, season):
+    rg = result[(result["시즌"] == season) & (result["수준"] == "지역구분")]
+    rg = rg[["연도","지역"] + LOSS_COLS].rename(columns={"지역": "지역구분"})
+    return rg.reset_index(drop=True)
+
+
+# -------------------------------------------------------
+# 그래프 10개 (전국/지역 × 일사량/손실량/손실액 × bar/line)
+# -------------------------------------------------------
+HOVER = {
+    "평균일사량":     "평균 일사량 : %{y:.1f} MJ/m²",
+    "손실량(kWh/MW)": "손실량 : %{y:.1f} kWh/MW",
+    "손실액(만원)":   "손실액 : %{y:.1f} 만원",
+}
+
+
+def chart_specs(nat, rg):
+    """(파일명, 데이터, 종류, y, color, 제목, y축 제목) 리스트"""
+    nat_m = nat[["연도","장마철","비장마철"]].melt(id_vars="연도",
+                                                var_name="구분",
+                                                value_name="평균일사량")
+    df = rg[rg["지역구분"].isin(["남부","중북부"])]
+    return [
+        ("장마철_비장마철_평균일사량_bar", nat_m, "bar",  "평균일사량", "구분",
+         "🌞 장마철/비장마철 평균 일사량 (bar)", "평균 일사량 (MJ/m²)"),
+        ("장마철_비장마철_평균일사량_line", nat_m, "line", "평균일사량", "구분",
+         "🌞 장마철/비장마철 평균 일사량 (line)", "평균 일사량 (MJ/m²)"),
+        ("전국_손실량_bar",  nat, "bar",  "손실량(kWh/MW)", None, "📉 전국 손실량 (bar)",  "손실량 (kWh/MW)"),
+        ("전국_손실량_line", nat, "line", "손실량(kWh/MW)", None, "📉 전국 손실량 (line)", "손실량 (kWh/MW)"),
+        ("전국_손실액_bar",  nat, "bar",  "손실액(만원)",   None, "💸 전국 손실액 (bar)",  "손실액 (만원)"),
+        ("전국_손실액_line", nat, "line", "손실액(만원)",   None, "💸 전국 손실액 (line)", "손실액 (만원)"),
+        ("지역별_손실량_bar",  df, "bar",  "손실량(kWh/MW)", "지역구분", "📍 지역별 손실량 (bar)",  "손실량 (kWh/MW)"),
+        ("지역별_손실량_line", df, "line", "손실량(kWh/MW)", "지역구분", "📍 지역별 손실량 (line)", "손실량 (kWh/MW)"),
+        ("지역별_손실액_bar",  df, "bar",  "손실액(만원)",   "지역구분", "💰 지역별 손실액 (bar)",  "손실액 (만원)"),
+        ("지역별_손실액_line", df, "line", "손실액(만원)",   "지역구분", "💰 지역별 손실액 (line)", "손실액 (만원)"),
+    ]
+
+
+def make_fig(data, kind, y, color, title, ytitle, style):
+    import plotly.express as px  # 표만 계산할 때는 plotly 를 로드하지 않음
+
+    if kind == "bar":
+        fig = px.bar(data, x="연도", y=y, color=color, barmode="group")
+    else:
+        fig = px.line(data, x="연도", y=y, color=color, markers=True)
+    fig.update_traces(hovertemplate=f"연도 : %{{x}}<br>{HOVER[y]}<extra></extra>")
+    return style(fig, title, ytitle)
+
+
+def render_charts(graph, nat, rg, save, output_paths, style):
+    """바뀐 그래프만 save(fig, name) 로 저장 (graph: artifacts.BuildGraph)"""
+    for name, data, kind, y, color, title, ytitle in chart_specs(nat, rg):
+        # 그래프가 실제로 쓰는 컬럼만 지문에 포함 → 설비용량만 바뀌면 손실액 그래프만 다시 생성
+        sub = data[["연도", y] + ([color] if color else [])]
+        spec = [name, kind, y, color, title, ytitle, HOVER[y]]
+        with stage("그래프"):
+            graph.target(
+                output_paths(name),
+                [sub, spec, make_fig, style],
+                lambda sub=sub, spec=spec: save(make_fig(sub, *spec[1:6], style), spec[0]),
+            )
+
+
+if __name__ == "__main__":
+    import os
+
+    os.makedirs("output", exist_ok=True)
+    result = run()
+    result.to_csv("output/손실_시즌별.csv", index=False, encoding="utf-8-sig")
+    print(result.to_string(index=False))
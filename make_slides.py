@@ -1,29 +1,46 @@
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from pathlib import Path
 
-# === 1️⃣ 데이터 불러오기 ===
-weather = pd.read_csv("data/2020~2024.csv", encoding="utf-8")
-power = pd.read_csv("data/예측발전량_PR고정_수정.csv", encoding="utf-8")
-
-# === 2️⃣ 공통 키(지점명+일시)로 병합 ===
-merged = pd.merge(
-    weather[["지점명", "일시", "일강수량(mm)"]],
-    power[["지점명", "일시", "예측발전량_PR고정(kWh)"]],
-    on=["지점명", "일시"],
-    how="inner"
-)
+from data_store import load_table
+from profiling import stage
+from streaming import STREAMING, rain_power_stats
 
-# === 3️⃣ 강수량 구간 분류 ===
+POWER_COL = "예측발전량_PR고정(kWh)"
 bins = [0, 1, 5, 10, 20, 50, 100, 200]
 labels = ["0~1", "1~5", "5~10", "10~20", "20~50", "50~100", "100~200"]
-merged["강수량_구간"] = pd.cut(merged["일강수량(mm)"], bins=bins, labels=labels, right=False)
-
-# === 4️⃣ 평균 발전량 및 감소율 계산 ===
-mean_power = merged.groupby("강수량_구간")["예측발전량_PR고정(kWh)"].mean().reset_index()
-mean_power.rename(columns={"예측발전량_PR고정(kWh)": "평균발전량(kWh)"}, inplace=True)
 
+if STREAMING:
+    # === CLIMATE_STREAMING=1: 연도 파티션 단위로 병합, 구간 평균/회귀는 부분 합계로 ===
+    #     산점도는 전체 점 대신 균등 표본
+    with stage("스트리밍 집계"):
+        stats = rain_power_stats("data/2020~2024.csv", "data/예측발전량_PR고정_수정.csv",
+                                 POWER_COL, bins, labels, right=False)
+    merged = stats["sample"]
+    mean_power = stats["bins"][["강수량_구간", "mean"]].rename(columns={"mean": "평균발전량(kWh)"})
+    coef = stats["moments"].coef()
+    x_max = stats["moments"].x_max
+else:
+    # === 1️⃣ 데이터 불러오기 (Parquet 캐시, 필요한 컬럼만) ===
+    weather = load_table("data/2020~2024.csv", columns=["지점명", "일시", "일강수량(mm)"])
+    power = load_table("data/예측발전량_PR고정_수정.csv", columns=["지점명", "일시", POWER_COL])
+
+    # === 2️⃣ 공통 키(지점명+일시)로 병합 ===
+    merged = pd.merge(weather, power, on=["지점명", "일시"], how="inner")
+
+    # === 3️⃣ 강수량 구간 분류 ===
+    merged["강수량_구간"] = pd.cut(merged["일강수량(mm)"], bins=bins, labels=labels, right=False)
+
+    # === 4️⃣ 평균 발전량 ===
+    mean_power = merged.groupby("강수량_구간")[POWER_COL].mean().reset_index()
+    mean_power.rename(columns={POWER_COL: "평균발전량(kWh)"}, inplace=True)
+
+    coef = np.polyfit(merged["일강수량(mm)"], merged[POWER_COL], 1)
+    x_max = merged["일강수량(mm)"].max()
+
+# === 감소율 계산 ===
 baseline = mean_power.loc[0, "평균발전량(kWh)"]  # 기준: 첫 구간
 mean_power["감소율(%)"] = (1 - (mean_power["평균발전량(kWh)"] / baseline)) * 100
 
@@ -39,10 +56,8 @@ fig1.add_trace(go.Scatter(
 ))
 
 # 회귀선 추가
-import numpy as np
-coef = np.polyfit(merged["일강수량(mm)"], merged["예측발전량_PR고정(kWh)"], 1)
 poly1d_fn = np.poly1d(coef)
-x_vals = np.linspace(0, merged["일강수량(mm)"].max(), 100)
+x_vals = np.linspace(0, x_max, 100)
 fig1.add_trace(go.Scatter(
     x=x_vals,
     y=poly1d_fn(x_vals),
@@ -94,6 +109,10 @@ fig2.update_yaxes(title_text="평균 발전량 (kWh)", secondary_y=False)
 fig2.update_yaxes(title_text="감소율 (%)", secondary_y=True)
 
 # === 6️⃣ 슬라이드 HTML로 통합 ===
+with stage("HTML 변환"):
+    fig1_html = fig1.to_html(include_plotlyjs="cdn", full_html=False)
+    fig2_html = fig2.to_html(include_plotlyjs="cdn", full_html=False)
+
 html_code = f"""
 <!DOCTYPE html>
 <html lang="ko">
@@ -108,8 +127,8 @@ html_code = f"""
 </head>
 <body>
 
-<iframe srcdoc='{fig1.to_html(include_plotlyjs="cdn", full_html=False)}' class="active"></iframe>
-<iframe srcdoc='{fig2.to_html(include_plotlyjs="cdn", full_html=False)}'></iframe>
+<iframe srcdoc='{fig1_html}' class="active"></iframe>
+<iframe srcdoc='{fig2_html}'></iframe>
 
 <script>
 let slides = document.querySelectorAll('iframe');
@@ -5,79 +5,43 @@ import folium
 from streamlit_folium import st_folium
 from datetime import timedelta, datetime
 
+from aggregates import load_cube
+from data_store import load_merged, index_by_date, source_mtimes
+from station_layer import add_circle_markers
+from profiling import stage, report
+
 st.set_page_config(layout="wide")
 
 # ---------------------------------------------------------
-# 0) merge 후 _x/_y 자동정리
+# 1~4) 병합 테이블 + 장마철/비장마철 기간 + 날짜 인덱스 (한 번만 계산)
+#      위젯을 바꿔도 다시 읽지 않고 캐시된 딕셔너리에서 조회
 # ---------------------------------------------------------
-def clean_columns(df):
-    new_cols = {}
-    drop_cols = []
-    for col in df.columns:
-        if col.endswith("_x") or col.endswith("_y"):
-            base = col[:-2]
-            if base in df.columns:
-                drop_cols.append(col)
-            else:
-                new_cols[col] = base
+@st.cache_resource(show_spinner="데이터 불러오는 중...")
+@stage("대시보드 데이터")
+def load_dashboard(mtimes):
+    merged = load_merged()
 
-    df.rename(columns=new_cols, inplace=True)
-    df.drop(columns=drop_cols, inplace=True)
-    return df
+    # 연도별 장마철 시작/종료일은 집계 큐브(전국 × 일)에서 조회
+    monsoon_ranges = load_cube().season_ranges()
 
+    non_monsoon_ranges = {}
+    for year in monsoon_ranges.index:
+        mon = monsoon_ranges.loc[year]
 
-# ---------------------------------------------------------
-# 1) CSV 로드
-# ---------------------------------------------------------
-weather = pd.read_csv("data/2020~2024_revised_monsoon.csv")
-power   = pd.read_csv("data/예측발전량_PR가변_수정.csv")
-mapping = pd.read_csv("data/관측소_시도매핑.csv")
+        year_start = pd.Timestamp(f"{year}-01-01")
+        year_end   = pd.Timestamp(f"{year}-12-31")
 
-weather = clean_columns(weather)
-power   = clean_columns(power)
-mapping = clean_columns(mapping)
+        before = (year_start, mon["start"] - timedelta(days=1))
+        after  = (mon["end"] + timedelta(days=1), year_end)
 
-weather["일시"] = pd.to_datetime(weather["일시"])
-power["일시"]   = pd.to_datetime(power["일시"])
-weather["연도"] = weather["일시"].dt.year
+        non_monsoon_ranges[year] = {"before": before, "after": after}
 
-# ---------------------------------------------------------
-# 2) weather + power merge (예측 발전량 포함)
-# ---------------------------------------------------------
-merged = weather.merge(
-    power[["지점명", "일시", "예측발전량_PR가변(kWh)"]],
-    on=["지점명", "일시"],
-    how="left"
-)
-merged = clean_columns(merged)
+    by_date = index_by_date(merged)
+    empty = merged.iloc[:0]
+    return monsoon_ranges, non_monsoon_ranges, by_date, empty
 
-# ---------------------------------------------------------
-# 3) 관측소 위도/경도 merge
-# ---------------------------------------------------------
-merged = merged.merge(mapping, on="지점명", how="left")
-merged = clean_columns(merged)
 
-# ---------------------------------------------------------
-# 4) 장마철 / 비장마철 기간 계산
-# ---------------------------------------------------------
-monsoon_ranges = (
-    merged[merged["장마철여부"] == "장마철"]
-    .groupby("연도")["일시"]
-    .agg(["min", "max"])
-    .rename(columns={"min": "start", "max": "end"})
-)
-
-non_monsoon_ranges = {}
-for year in monsoon_ranges.index:
-    mon = monsoon_ranges.loc[year]
-
-    year_start = pd.Timestamp(f"{year}-01-01")
-    year_end   = pd.Timestamp(f"{year}-12-31")
-
-    before = (year_start, mon["start"] - timedelta(days=1))
-    after  = (mon["end"] + timedelta(days=1), year_end)
-
-    non_monsoon_ranges[year] = {"before": before, "after": after}
+monsoon_ranges, non_monsoon_ranges, by_date, empty = load_dashboard(source_mtimes())
 
 # ---------------------------------------------------------
 # 5) 레이아웃 8:2
@@ -155,46 +119,8 @@ with right:
     st.markdown('</div>', unsafe_allow_html=True)
 
 # ---------------------------------------------------------
-# 6) 마커 (크기 ↑ + 농도 ↑ + 이모지 + 단위)
+# 6) 마커 (크기 ↑ + 농도 ↑ + 이모지 + 단위) → station_layer.add_circle_markers
 # ---------------------------------------------------------
-def add_circle_markers(m, df, value_col, emoji):
-    if df.empty:
-        return
-
-    base_color = {
-        "🌧": (91, 143, 249),
-        "☀": (255, 107, 107),
-        "⚡": (80, 170, 80)
-    }
-
-    unit_map = {"🌧": "mm", "☀": "MJ/m²", "⚡": "kWh"}
-    label_map = {"🌧": "강수량", "☀": "일사량", "⚡": "예측 발전량"}
-
-    vals = df[value_col].astype(float)
-    vmin, vmax = vals.min(), vals.max()
-    df["_norm"] = (vals - vmin) / (vmax - vmin + 1e-9)
-
-    for _, row in df.iterrows():
-        norm = row["_norm"]
-        opacity = 0.55 + (norm * 0.75)
-
-        r, g, b = base_color[emoji]
-        fill_color = f"rgba({r}, {g}, {b}, {opacity})"
-
-        tooltip_html = f"""
-            <b>{row['지점명']}</b><br>
-            {emoji} {label_map[emoji]} : {row[value_col]} {unit_map[emoji]}
-        """
-
-        folium.CircleMarker(
-            location=[row["위도"], row["경도"]],
-            radius=11,         # ★ 기존보다 살짝 크게
-            color=None,       # 테두리 없음
-            fill=True,
-            fill_color=fill_color,
-            fill_opacity=opacity,
-            tooltip=tooltip_html
-        ).add_to(m)
 
 # ---------------------------------------------------------
 # 7) 지도 2개 (장마철 / 비장마철)
@@ -213,7 +139,7 @@ with left:
 
         if y1!="선택해주세요" and m1 not in (None, "선택해주세요") and d1 not in (None, "선택해주세요"):
             date_left = f"{y1}-{m1:02d}-{d1:02d}"
-            df_left = merged[merged["일시"] == date_left]
+            df_left = by_date.get(pd.Timestamp(date_left), empty)
 
             if "강수량" in value_choice:
                 add_circle_markers(m_left, df_left, "일강수량(mm)", "🌧")
@@ -222,7 +148,8 @@ with left:
             else:
                 add_circle_markers(m_left, df_left, "예측발전량_PR가변(kWh)", "⚡")
 
-        st_folium(m_left, height=700, width=600, key="left_map")
+        with stage("지도 렌더링"):
+            st_folium(m_left, height=700, width=600, key="left_map")
 
     # -------------------------
     # 비장마철 지도
@@ -234,7 +161,7 @@ with left:
 
         if y2!="선택해주세요" and m2 not in (None, "선택해주세요") and d2 not in (None, "선택해주세요"):
             date_right = f"{y2}-{m2:02d}-{d2:02d}"
-            df_right = merged[merged["일시"] == date_right]
+            df_right = by_date.get(pd.Timestamp(date_right), empty)
 
             if "강수량" in value_choice:
                 add_circle_markers(m_right, df_right, "일강수량(mm)", "🌧")
@@ -243,4 +170,8 @@ with left:
             else:
                 add_circle_markers(m_right, df_right, "예측발전량_PR가변(kWh)", "⚡")
 
-        st_folium(m_right, height=700, width=600, key="right_map")
+        with stage("지도 렌더링"):
+            st_folium(m_right, height=700, width=600, key="right_map")
+
+# CLIMATE_PROFILE=1 이면 재실행마다 단계별 시간 보고서 갱신 (output/profile_*)
+report()
@@ -5,96 +5,23 @@ import folium
 from streamlit_folium import st_folium
 from datetime import timedelta
 
-st.set_page_config(layout="wide")
-
-# ---------------------------------------------------------
-# 파일 로드 & 유틸
-# ---------------------------------------------------------
-def clean_columns(df):
-    new_cols = {}
-    drop_cols = []
-    for col in df.columns:
-        if col.endswith("_x") or col.endswith("_y"):
-            base = col[:-2]
-            if base in df.columns:
-                drop_cols.append(col)
-            else:
-                new_cols[col] = base
-    df.rename(columns=new_cols, inplace=True)
-    df.drop(columns=drop_cols, inplace=True)
-    return df
-
-
-# ---------------------------------------------------------
-# CSV 로드
-# ---------------------------------------------------------
-weather = pd.read_csv("data/2020~2024_revised_monsoon.csv")
-power   = pd.read_csv("data/예측발전량_PR가변_수정.csv")
-mapping = pd.read_csv("data/관측소_시도매핑.csv")
-
-weather = clean_columns(weather)
-power   = clean_columns(power)
-mapping = clean_columns(mapping)
-
-weather["일시"] = pd.to_datetime(weather["일시"])
-power["일시"]   = pd.to_datetime(power["일시"])
-weather["연도"] = weather["일시"].dt.year
-
-# ---------------------------------------------------------
-# Merge weather + power
-# ---------------------------------------------------------
-merged = weather.merge(
-    power[["지점명", "일시", "예측발전량_PR가변(kWh)"]],
-    on=["지점명", "일시"],
-    how="left"
-)
-merged = clean_columns(merged)
-
-# ---------------------------------------------------------
-# 시도 / 위경도 merge
-# ---------------------------------------------------------
-merged = merged.merge(mapping, on="지점명", how="left")
-merged = clean_columns(merged)
-
-# ---------------------------------------------------------
-# 6~8월 필터 (여름)
-# ---------------------------------------------------------
-merged["월"] = merged["일시"].dt.month
-merged_summer = merged[merged["월"].isin([6,7,8])].copy()
+from aggregates import load_cube
+from data_store import load_merged, index_by_date, source_mtimes
+from station_layer import add_station_layer
+from profiling import stage, report
 
-# ---------------------------------------------------------
-# 장마철/비장마철 날짜 범위 계산
-# ---------------------------------------------------------
-monsoon_ranges = (
-    merged_summer[merged_summer["장마철여부"] == "장마철"]
-    .groupby("연도")["일시"]
-    .agg(["min", "max"])
-    .rename(columns={"min": "start", "max": "end"})
-)
-
-non_monsoon_ranges = {}
-for year in monsoon_ranges.index:
-    mon = monsoon_ranges.loc[year]
-    before = (pd.Timestamp(f"{year}-06-01"), mon.start - timedelta(days=1))
-    after  = (mon.end + timedelta(days=1), pd.Timestamp(f"{year}-08-31"))
-    non_monsoon_ranges[year] = {"before": before, "after": after}
+st.set_page_config(layout="wide")
 
 # ---------------------------------------------------------
 # SMP 설정 (연도별)
 # ---------------------------------------------------------
 SMP = {2020:68.87, 2021:94.34, 2022:196.65, 2023:167.11, 2024:128.39}
 
-# ---------------------------------------------------------
-# 비장마철 평균 일사량(연도별)
-# ---------------------------------------------------------
-summer_nonmon = merged_summer[merged_summer["장마철여부"] == "비장마철"]
-nonmon_mean = summer_nonmon.groupby("연도")["합계 일사량(MJ/m2)"].mean().to_dict()
-
 
 # ---------------------------------------------------------
 # 손실량/손실액 계산 함수 (옵션 B)
 # ---------------------------------------------------------
-def compute_losses(df):
+def compute_losses(df, nonmon_mean):
 
     df = df.copy()
     df["연도"] = df["일시"].dt.year
@@ -115,7 +42,44 @@ def compute_losses(df):
     return df
 
 
-merged_summer = compute_losses(merged_summer)
+# ---------------------------------------------------------
+# 데이터 준비 (한 번만 계산 → 위젯 변경 시 날짜 딕셔너리 조회만)
+# ---------------------------------------------------------
+@st.cache_resource(show_spinner="데이터 불러오는 중...")
+@stage("대시보드 데이터")
+def load_dashboard(mtimes):
+    # weather + power + 시도/위경도 병합 테이블 (Parquet 캐시)
+    merged = load_merged()
+
+    # 6~8월 필터 (여름)
+    merged["월"] = merged["일시"].dt.month
+    merged_summer = merged[merged["월"].isin([6,7,8])].copy()
+
+    # 장마철/비장마철 날짜 범위 계산 (집계 큐브 전국 × 일)
+    cube = load_cube()
+    monsoon_ranges = cube.season_ranges(months=[6,7,8])
+
+    non_monsoon_ranges = {}
+    for year in monsoon_ranges.index:
+        mon = monsoon_ranges.loc[year]
+        before = (pd.Timestamp(f"{year}-06-01"), mon.start - timedelta(days=1))
+        after  = (mon.end + timedelta(days=1), pd.Timestamp(f"{year}-08-31"))
+        non_monsoon_ranges[year] = {"before": before, "after": after}
+
+    # 비장마철 평균 일사량(연도별) — 큐브 전국 × 월 칸의 합계/개수
+    monthly = cube.query("전국", "월", "합계 일사량(MJ/m2)")
+    summer_nonmon = monthly[monthly["월"].isin([6,7,8]) & (monthly["장마철여부"] == "비장마철")]
+    g = summer_nonmon.groupby("연도")[["sum","count"]].sum()
+    nonmon_mean = (g["sum"] / g["count"]).to_dict()
+
+    merged_summer = compute_losses(merged_summer, nonmon_mean)
+
+    by_date = index_by_date(merged_summer)
+    empty = merged_summer.iloc[:0]
+    return monsoon_ranges, non_monsoon_ranges, by_date, empty
+
+
+monsoon_ranges, non_monsoon_ranges, by_date, empty = load_dashboard(source_mtimes())
 
 # ---------------------------------------------------------
 # Streamlit UI
@@ -195,6 +159,7 @@ with right:
 # ---------------------------------------------------------
 # 마커 추가 함수
 # ---------------------------------------------------------
+@stage("마커 레이어")
 def add_circle_markers(m, df, value_col, emoji):
 
     if df.empty:
@@ -219,35 +184,30 @@ def add_circle_markers(m, df, value_col, emoji):
 
     vals = df[value_col].astype(float)
     vmin, vmax = vals.min(), vals.max()
+    norm = (vals - vmin) / (vmax - vmin + 1e-9)
 
-    df["_norm"] = (vals - vmin) / (vmax - vmin + 1e-9)
+    r,g,b = base_color[emoji]
+    opacity = 0.55 + (norm * 0.75)
+    fill_color = f"rgba({r},{g},{b}," + opacity.astype(str) + ")"
 
-    for _, row in df.iterrows():
+    # 🔥 손실량 음수 → 검정색
+    if emoji == "🔥":
+        fill_color = fill_color.mask(vals < 0, "rgba(0,0,0,0.75)")
 
-        value = row[value_col]
-
-        # 🔥 손실량 음수 → 검정색
-        if emoji == "🔥" and value < 0:
-            fill_color = "rgba(0,0,0,0.75)"
-        else:
-            r,g,b = base_color[emoji]
-            opacity = 0.55 + (row["_norm"] * 0.75)
-            fill_color = f"rgba({r},{g},{b},{opacity})"
-
-        tooltip_html = f"""
-            <b>{row['지점명']}</b><br>
-            {emoji} {value_col} : {value:.2f} {unit_map[emoji]}
-        """
+    tooltip_html = (
+        "<b>" + df["지점명"].astype(str) + "</b><br>"
+        + f"{emoji} {value_col} : " + vals.map("{:.2f}".format) + f" {unit_map[emoji]}"
+    )
 
-        folium.CircleMarker(
-            location=[row["위도"], row["경도"]],
-            radius=11,
-            color=None,
-            fill=True,
-            fill_color=fill_color,
-            fill_opacity=0.85,
-            tooltip=tooltip_html,
-        ).add_to(m)
+    # 모든 지점을 GeoJSON 레이어 하나로 (테두리 없음, canvas 렌더링)
+    add_station_layer(
+        m, df,
+        fill_color=fill_color,
+        fill_opacity=0.85,
+        tooltip=tooltip_html,
+        radius=11,
+        canvas=True,
+    )
 
 
 # ---------------------------------------------------------
@@ -264,7 +224,7 @@ with left:
 
         if y1!="선택해주세요" and m1 not in (None,"선택해주세요") and d1 not in (None,"선택해주세요"):
             date_left = f"{y1}-{m1:02d}-{d1:02d}"
-            df_left = merged_summer[merged_summer["일시"] == date_left]
+            df_left = by_date.get(pd.Timestamp(date_left), empty)
 
             if "강수량" in value_choice:
                 add_circle_markers(m_left, df_left, "일강수량(mm)", "🌧")
@@ -277,7 +237,8 @@ with left:
             else:
                 add_circle_markers(m_left, df_left, "손실액(만원)", "💸")
 
-        st_folium(m_left, height=700, width=600, key="left_map")
+        with stage("지도 렌더링"):
+            st_folium(m_left, height=700, width=600, key="left_map")
 
     # ☀ 비장마철 지도
     with map_right_col:
@@ -286,7 +247,7 @@ with left:
 
         if y2!="선택해주세요" and m2 not in (None,"선택해주세요") and d2 not in (None,"선택해주세요"):
             date_right = f"{y2}-{m2:02d}-{d2:02d}"
-            df_right = merged_summer[merged_summer["일시"] == date_right]
+            df_right = by_date.get(pd.Timestamp(date_right), empty)
 
             if "강수량" in value_choice:
                 add_circle_markers(m_right, df_right, "일강수량(mm)", "🌧")
@@ -299,4 +260,8 @@ with left:
             else:
                 add_circle_markers(m_right, df_right, "손실액(만원)", "💸")
 
-        st_folium(m_right, height=700, width=600, key="right_map")
+        with stage("지도 렌더링"):
+            st_folium(m_right, height=700, width=600, key="right_map")
+
+# CLIMATE_PROFILE=1 이면 재실행마다 단계별 시간 보고서 갱신 (output/profile_*)
+report()
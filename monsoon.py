@@ -0,0 +1,120 @@
+# monsoon.py
+"""
+장마 기간 달력 (data/장마기간.csv 한 곳에서 관리)
+
+- 표: 기준, 연도, 권역(전국/중부/남부/제주), 시작, 종료
+- 기준: "기상청"(check_correction.py 기준) / "참고"(지도·비교 스크립트에서 쓰던 기간)
+- tag(): 날짜(+권역) 배열 전체를 searchsorted 한 번으로 장마철/비장마철 분류
+  권역별 기간이 없는 연도/권역은 전국 기간 사용
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MONSOON_TABLE = os.path.join(BASE_DIR, "data", "장마기간.csv")
+
+MONSOON, NON_MONSOON = "장마철", "비장마철"
+NATIONAL = "전국"
+
+# 시도명 키워드 → 기상청 장마 권역
+REGION_KEYS = {
+    "제주": ["제주"],
+    "남부": ["전라","전북","전남","경상","경북","경남","부산","울산","광주","대구"],
+    "중부": ["서울","경기","인천","강원","충청","충북","충남","세종","대전"],
+}
+
+
+def monsoon_region(sido):
+    """시도명 Series → 장마 권역 (모르면 전국). 시도 종류 수만큼만 판정"""
+    sido = pd.Series(sido).astype("category")
+
+    def one(name):
+        if isinstance(name, str):
+            for region, keys in REGION_KEYS.items():
+                if any(k in name for k in keys):
+                    return region
+        return NATIONAL
+
+    labels = np.array([one(c) for c in sido.cat.categories] + [NATIONAL], dtype=object)
+    return labels[sido.cat.codes.to_numpy()]
+
+
+def tag_months(months, monsoon_months=(6, 7)):
+    """월 기준 단순 구분 (예: 6~7월 = 장마철)"""
+    months = pd.Series(months)
+    return np.where(months.isin(list(monsoon_months)), MONSOON, NON_MONSOON)
+
+
+def _days(dates):
+    """datetime → 1970-01-01 기준 일 수 (NaT 는 -1)"""
+    d = pd.to_datetime(pd.Series(dates), errors="coerce")
+    out = d.dt.floor("D").to_numpy(dtype="datetime64[D]").astype("int64")
+    return np.where(d.isna().to_numpy(), -1, out)
+
+
+class MonsoonCalendar:
+    """(권역, 시작, 종료) 구간표 + 벡터화 조회"""
+
+    def __init__(self, table, basis="기상청"):
+        t = table[table["기준"] == basis].copy()
+        if t.empty:
+            raise ValueError(f"장마기간 표에 '{basis}' 기준이 없습니다.")
+        t["시작"] = pd.to_datetime(t["시작"])
+        t["종료"] = pd.to_datetime(t["종료"])
+
+        # 권역별 기간이 빠진 연도는 전국 기간으로 채움
+        national = t[t["권역"] == NATIONAL]
+        parts = [t]
+        for region in t["권역"].unique():
+            if region == NATIONAL:
+                continue
+            have = set(t.loc[t["권역"] == region, "연도"])
+            fill = national[~national["연도"].isin(have)].assign(권역=region)
+            parts.append(fill)
+        t = pd.concat(parts, ignore_index=True)
+
+        self.basis = basis
+        self.table = t.sort_values(["권역","시작"]).reset_index(drop=True)
+        self.regions = list(pd.unique(self.table["권역"]))
+        self._code = {r: i for i, r in enumerate(self.regions)}
+
+        # 권역 코드를 상위 자리에 붙인 키 → 정렬된 1차원 구간
+        span = 1 << 20  # 일 수 범위(약 2800년)보다 큼
+        codes = self.table["권역"].map(self._code).to_numpy(dtype="int64")
+        self._span = span
+        self._starts = codes * span + _days(self.table["시작"]) + span // 2
+        self._ends = codes * span + _days(self.table["종료"]) + span // 2
+
+    @classmethod
+    def load(cls, path=MONSOON_TABLE, basis="기상청"):
+        return cls(pd.read_csv(path, encoding="utf-8-sig"), basis)
+
+    def periods(self, region=NATIONAL):
+        """{연도: (시작, 종료)} — 연도별 루프를 쓰는 스크립트용"""
+        t = self.table[self.table["권역"] == region]
+        return {int(y): (s, e) for y, s, e in zip(t["연도"], t["시작"], t["종료"])}
+
+    def mask(self, dates, regions=None):
+        """장마 기간이면 True. regions 는 권역명 배열 (없거나 모르는 권역은 전국)"""
+        days = _days(dates)
+        n = len(days)
+        national = self._code.get(NATIONAL, 0)
+        if regions is None:
+            codes = np.full(n, national, dtype="int64")
+        else:
+            codes = (
+                pd.Series(np.asarray(regions, dtype=object)).map(self._code)
+                .fillna(national).to_numpy(dtype="int64")
+            )
+
+        key = codes * self._span + days + self._span // 2
+        i = np.searchsorted(self._starts, key, side="right") - 1
+        ok = (i >= 0) & (days >= 0)
+        i = np.clip(i, 0, None)
+        return ok & (key <= self._ends[i])
+
+    def tag(self, dates, regions=None):
+        return np.where(self.mask(dates, regions), MONSOON, NON_MONSOON)
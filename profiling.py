@@ -0,0 +1,231 @@
+# profiling.py
+"""
+단계별 시간/메모리 계측 (CSV 읽기 / 병합 / 집계 / kaleido 저장 중 어디가 느린지)
+
+    from profiling import stage
+
+    with stage("CSV 읽기"):
+        ...
+
+    @stage("월별 집계")
+    def monthly_sums(...): ...
+
+- 단계마다 벽시계 시간, CPU 시간(프로세스 전체), 최대 RSS 기록. 중첩되면 "바깥/안쪽" 이름
+- 같은 이름이 여러 번 실행되면 호출 수와 합계로 누적
+- CLIMATE_PROFILE 환경 변수가 없으면 아무것도 하지 않음 (오버헤드 거의 0)
+    CLIMATE_PROFILE=1 (timing) : 종료 시 output/profile_<스크립트>_<시각>.json / .txt
+    CLIMATE_PROFILE=cprofile   : + cProfile 결과 .prof (snakeviz 등으로 열기) 와 상위 함수 목록
+    CLIMATE_PROFILE=pyinstrument : + pyinstrument .html (설치되어 있지 않으면 cProfile 로 대체)
+- cProfile/pyinstrument 는 메인 스레드 기준 → 배치 스크립트용.
+  Streamlit 앱은 timing 모드로 쓰고 스크립트 끝에서 report() 호출 (재실행마다 갱신)
+"""
+
+import atexit
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+import unicodedata
+from datetime import datetime
+
+PROFILE = os.environ.get("CLIMATE_PROFILE", "").strip().lower()
+ENABLED = PROFILE not in ("", "0", "off", "false", "no")
+OUTPUT_DIR = os.environ.get("CLIMATE_PROFILE_DIR", "output")
+
+_records = {}           # 단계 이름 → 누적 기록
+_lock = threading.Lock()
+_local = threading.local()
+_session = {}
+
+
+def peak_rss_mb():
+    """프로세스 최대 RSS (MB). 측정할 수 없으면 None"""
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    except ImportError:  # Windows
+        try:
+            import psutil
+
+            info = psutil.Process().memory_info()
+            return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+        except ImportError:
+            return None
+
+
+# ---------------------------------------------------------
+# 단계 계측
+# ---------------------------------------------------------
+class stage(contextlib.ContextDecorator):
+    """with stage("이름"): / @stage("이름") 둘 다 사용 가능"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def _recreate_cm(self):
+        # 데코레이터로 쓸 때 호출마다 새 인스턴스 (재귀/스레드 안전)
+        return stage(self.name)
+
+    def __enter__(self):
+        if not ENABLED:
+            return self
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self.name)
+        self.key = "/".join(stack)
+        with _lock:
+            # 보고서 순서 = 처음 시작한 순서 (바깥 단계가 안쪽 단계보다 먼저)
+            _records.setdefault(self.key, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0,
+                                           "peak_rss_mb": None, "rss_growth_mb": 0.0})
+        self.rss0 = peak_rss_mb()
+        self.cpu0 = time.process_time()
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if not ENABLED:
+            return False
+        wall = time.perf_counter() - self.t0
+        cpu = time.process_time() - self.cpu0
+        rss = peak_rss_mb()
+        _local.stack.pop()
+
+        with _lock:
+            rec = _records[self.key]
+            rec["calls"] += 1
+            rec["wall_s"] += wall
+            rec["cpu_s"] += cpu
+            if rss is not None:
+                rec["peak_rss_mb"] = max(rec["peak_rss_mb"] or 0.0, rss)
+                rec["rss_growth_mb"] += rss - (self.rss0 or rss)  # 이 단계에서 최대 RSS 가 늘어난 양
+        return False
+
+
+def records():
+    with _lock:
+        return {k: dict(v) for k, v in _records.items()}
+
+
+# ---------------------------------------------------------
+# 보고서
+# ---------------------------------------------------------
+def _shown(text):
+    """화면 폭 (한글 등 전각 문자는 2칸)"""
+    return sum(2 if unicodedata.east_asian_width(ch) in "WF" else 1 for ch in text)
+
+
+def _pad(text, width):
+    """화면 폭 기준 왼쪽 정렬"""
+    return text + " " * max(width - _shown(text), 1)
+
+
+def _rpad(text, width):
+    """화면 폭 기준 오른쪽 정렬 (행과 같은 폭을 쓰도록 헤더에 사용)"""
+    return " " * max(width - _shown(text), 0) + text
+
+
+def format_table(recs, total_s):
+    # 폭은 아래 행 포맷과 같게: 호출 6, wall 10, cpu 10, 비율 9 (값 8 + %), peakRSS 13, +RSS 9
+    lines = [_pad("단계", 40) + _rpad("호출", 6) + _rpad("wall(s)", 10) + _rpad("cpu(s)", 10)
+             + _rpad("비율", 9) + _rpad("peakRSS(MB)", 13) + _rpad("+RSS", 9)]
+    for key, r in recs.items():
+        if not r["calls"]:
+            continue  # 아직 실행 중인 단계
+        name = "  " * key.count("/") + key.rsplit("/", 1)[-1]
+        share = r["wall_s"] / total_s * 100 if total_s > 0 else 0.0
+        rss = f"{r['peak_rss_mb']:.0f}" if r["peak_rss_mb"] is not None else "-"
+        lines.append(_pad(name, 40) + f"{r['calls']:>6}{r['wall_s']:>10.3f}{r['cpu_s']:>10.3f}"
+                     f"{share:>8.1f}%{rss:>13}{r['rss_growth_mb']:>9.0f}")
+    lines.append(_pad("(전체 실행)", 40) + f"{'':>6}{total_s:>10.3f}")
+    return "\n".join(lines)
+
+
+def _base_path():
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    return os.path.join(OUTPUT_DIR, f"profile_{_session['script']}_{_session['stamp']}")
+
+
+def report(verbose=False):
+    """지금까지의 단계 기록을 .json / .txt 로 저장 (같은 실행 안에서는 같은 파일을 덮어씀)"""
+    if not ENABLED:
+        return None
+    recs = records()
+    total = time.perf_counter() - _session["t0"]
+    base = _base_path()
+
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump({
+            "script": _session["script"],
+            "started": _session["started"],
+            "mode": PROFILE,
+            "total_wall_s": total,
+            "total_cpu_s": time.process_time() - _session["cpu0"],
+            "peak_rss_mb": peak_rss_mb(),
+            "stages": recs,
+        }, f, ensure_ascii=False, indent=2)
+
+    table = format_table(recs, total)
+    with open(base + ".txt", "w", encoding="utf-8") as f:
+        f.write(table + "\n")
+    if verbose:
+        print(f"\n⏱️ 단계별 실행 시간 ({base}.txt)\n{table}", file=sys.stderr)
+    return base
+
+
+def _start_tracer():
+    if PROFILE == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+
+            profiler = Profiler()
+            profiler.start()
+            return "pyinstrument", profiler
+        except ImportError:
+            print("⚠️ pyinstrument 없음 → cProfile 로 대체", file=sys.stderr)
+    if PROFILE in ("cprofile", "pyinstrument"):
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return "cprofile", profiler
+    return None, None
+
+
+def _finish():
+    base = report(verbose=True)
+    kind, profiler = _session.get("tracer", (None, None))
+    if kind == "pyinstrument":
+        profiler.stop()
+        with open(base + ".html", "w", encoding="utf-8") as f:
+            f.write(profiler.output_html())
+        print(f"🔬 pyinstrument → {base}.html", file=sys.stderr)
+    elif kind == "cprofile":
+        import io
+        import pstats
+
+        profiler.disable()
+        profiler.dump_stats(base + ".prof")
+        buf = io.StringIO()
+        pstats.Stats(profiler, stream=buf).sort_stats("cumulative").print_stats(40)
+        with open(base + ".txt", "a", encoding="utf-8") as f:
+            f.write("\n" + buf.getvalue())
+        print(f"🔬 cProfile → {base}.prof", file=sys.stderr)
+
+
+def _start():
+    script = os.path.splitext(os.path.basename(sys.argv[0] if sys.argv and sys.argv[0] else ""))[0]
+    now = datetime.now()
+    _session.update(script=script or "python", started=now.isoformat(timespec="seconds"),
+                    stamp=now.strftime("%Y%m%d-%H%M%S"),
+                    t0=time.perf_counter(), cpu0=time.process_time())
+    _session["tracer"] = _start_tracer()
+    atexit.register(_finish)
+
+
+if ENABLED:
+    _start()
@@ -2,7 +2,8 @@
 
 from base_map import BaseMap
 import folium
-import pandas as pd
+
+from station_layer import add_station_layer
 
 class RainMap(BaseMap):
     def __init__(self, csv_file, location_csv="data/좌표.csv"):
@@ -24,19 +25,20 @@ class RainMap(BaseMap):
         value_col = [c for c in df.columns if "강수" in c]
         value_col = value_col[0] if value_col else "값"
 
-        for _, row in df.iterrows():
-            if pd.notna(row["위도"]) and pd.notna(row["경도"]):
-                val = row.get(value_col, "N/A")
-                popup_html = f"<div style='white-space:nowrap;'>🌧️ {row['지역']} | 일강수량: {val} mm</div>"
-
-                folium.CircleMarker(
-                    [row["위도"], row["경도"]],
-                    radius=7,
-                    color="blue",
-                    fill=True,
-                    fill_color="blue",
-                    fill_opacity=0.8,
-                    popup=folium.Popup(popup_html, max_width=250)
-                ).add_to(m)
+        val = df[value_col].astype(str) if value_col in df.columns else "N/A"
+        popup_html = (
+            "<div style='white-space:nowrap;'>🌧️ " + df["지역"].astype(str)
+            + " | 일강수량: " + val + " mm</div>"
+        )
+
+        # 모든 지점을 GeoJSON 레이어 하나로 (위경도 없는 행은 자동 제외)
+        add_station_layer(
+            m, df,
+            fill_color="blue",
+            fill_opacity=0.8,
+            popup=popup_html,
+            radius=7,
+            color="blue",
+        )
 
         return m
@@ -0,0 +1,76 @@
+# regression.py
+"""
+그룹별 1차 회귀 일괄 계산 (지점 × 연도 × 장마철여부 등 수백~수천 그룹)
+
+- 그룹마다 LinearRegression 객체를 만들지 않고, 그룹 번호 배열 하나로 np.bincount 합계만 계산
+  n, Σx, Σy → 그룹 평균 → 편차 제곱합/곱합 (평균을 뺀 뒤 더해서 큰 값에서도 정밀도 유지)
+- 기울기/절편/R² 는 정규방정식 닫힌 해, 원점 통과 기울기(환산계수 확인용)도 같이
+- 결과는 그룹 키 + n, 기울기, 절편, R², 원점기울기 DataFrame
+
+    grouped_ols(df, "합계 일사량(MJ/m2)", "예측발전량_PR고정(kWh)", by=["지점명", "연도"])
+"""
+
+import numpy as np
+import pandas as pd
+
+RESULT_COLS = ["n", "기울기", "절편", "R2", "원점기울기"]
+
+
+def group_codes(df, by):
+    """by 컬럼 조합 → (그룹 번호 배열, 그룹 키 DataFrame). 키에 NaN 이 있는 행은 -1"""
+    if not by:
+        return np.zeros(len(df), dtype="int64"), pd.DataFrame(index=[0])
+    key_df = df[list(by)]
+    valid = key_df.notna().all(axis=1).to_numpy()
+    codes = np.full(len(df), -1, dtype="int64")
+    if not valid.any():
+        return codes, pd.DataFrame(columns=list(by))
+    sub, uniques = pd.factorize(pd.MultiIndex.from_frame(key_df[valid]), sort=True)
+    codes[valid] = sub
+    return codes, pd.DataFrame(list(uniques), columns=list(by))
+
+
+def ols_from_codes(codes, x, y, n_groups, min_n=3):
+    """그룹 번호별 (n, 기울기, 절편, R², 원점기울기) 배열. x/y 중 NaN 인 행과 code -1 은 제외"""
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    ok = (codes >= 0) & ~(np.isnan(x) | np.isnan(y))
+    c, x, y = codes[ok], x[ok], y[ok]
+
+    n = np.bincount(c, minlength=n_groups).astype("float64")
+    safe_n = np.where(n > 0, n, np.nan)
+    mx = np.bincount(c, x, n_groups) / safe_n
+    my = np.bincount(c, y, n_groups) / safe_n
+
+    dx = x - mx[c]
+    dy = y - my[c]
+    sxx = np.bincount(c, dx * dx, n_groups)
+    sxy = np.bincount(c, dx * dy, n_groups)
+    syy = np.bincount(c, dy * dy, n_groups)
+    # 원점 통과: Σxy / Σx²
+    xx0 = np.bincount(c, x * x, n_groups)
+    xy0 = np.bincount(c, x * y, n_groups)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = np.where(sxx > 0, sxy / sxx, np.nan)
+        intercept = my - slope * mx
+        r2 = np.where((sxx > 0) & (syy > 0), sxy * sxy / (sxx * syy), np.nan)
+        slope0 = np.where(xx0 > 0, xy0 / xx0, np.nan)
+
+    few = n < min_n
+    for arr in (slope, intercept, r2, slope0):
+        arr[few] = np.nan
+    return n.astype("int64"), slope, intercept, r2, slope0
+
+
+def grouped_ols(df, x_col, y_col, by=(), min_n=3):
+    """by 그룹마다 y = 기울기·x + 절편 (관측 min_n 개 미만 그룹은 NaN)"""
+    codes, keys = group_codes(df, list(by))
+    n, slope, intercept, r2, slope0 = ols_from_codes(
+        codes, pd.to_numeric(df[x_col], errors="coerce"), pd.to_numeric(df[y_col], errors="coerce"),
+        len(keys), min_n,
+    )
+    out = keys.reset_index(drop=True)
+    for col, values in zip(RESULT_COLS, (n, slope, intercept, r2, slope0)):
+        out[col] = values
+    return out
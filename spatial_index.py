@@ -0,0 +1,100 @@
+# spatial_index.py
+"""
+위경도 점 → 행정구역(시도/시군구) 일괄 매핑
+
+- 좌표 변환은 pyproj 로 배열 전체를 한 번에
+- 경계 폴리곤은 shapely STRtree + prepare() 로 색인
+  bbox 후보만 뽑고 contains_xy 로 벡터 판정 (폴리곤 전체 순회 없음)
+- shapely/pyproj/fiona 는 실제로 색인을 만들 때 import (geo_mapping 이 변경 없음으로 끝나면 로드 안 함)
+- 경계 파일만 바꾸면 시군구도 동일하게 사용
+    RegionIndex.from_shapefile("data/bnd_sigungu_00_2024_2Q/bnd_sigungu_00_2024_2Q.shp", "SIGUNGU_NM")
+"""
+
+import json
+
+import numpy as np
+
+UNKNOWN = "UNKNOWN"
+
+
+class RegionIndex:
+    """폴리곤 + 이름 목록에 대한 점 포함 조회"""
+
+    def __init__(self, geoms, names, crs="EPSG:4326"):
+        import shapely
+        from shapely.strtree import STRtree
+
+        self.geoms = np.asarray(geoms, dtype=object)
+        self.names = np.asarray(names, dtype=object)
+        self.crs = crs
+        shapely.prepare(self.geoms)
+        self.tree = STRtree(self.geoms)
+        self._transformers = {}
+
+    @classmethod
+    def from_shapefile(cls, path, name_field, crs="EPSG:5179"):
+        """SHP 경계 (좌표계는 파일 정보 우선, 없으면 crs)"""
+        import fiona
+        from shapely.geometry import shape
+
+        with fiona.open(path) as src:
+            file_crs = src.crs.to_string() if src.crs else None
+            geoms, names = [], []
+            for f in src:
+                geoms.append(shape(f["geometry"]))
+                names.append(f["properties"][name_field])
+        return cls(geoms, names, file_crs or crs)
+
+    @classmethod
+    def from_geojson(cls, path, name_field, crs="EPSG:4326"):
+        from shapely.geometry import shape
+
+        with open(path, encoding="utf-8") as f:
+            fc = json.load(f)
+        geoms = [shape(ft["geometry"]) for ft in fc["features"]]
+        names = [ft["properties"][name_field] for ft in fc["features"]]
+        return cls(geoms, names, crs)
+
+    def _to_index_crs(self, lon, lat):
+        """WGS84 경도/위도 배열 → 경계 좌표계"""
+        if self.crs in ("EPSG:4326", "OGC:CRS84"):
+            return lon, lat
+        tr = self._transformers.get(self.crs)
+        if tr is None:
+            import pyproj
+
+            tr = pyproj.Transformer.from_crs("EPSG:4326", self.crs, always_xy=True)
+            self._transformers[self.crs] = tr
+        return tr.transform(lon, lat)
+
+    def locate(self, lat, lon):
+        """점마다 포함 폴리곤 번호 (없으면 -1). 여러 개면 앞 번호"""
+        import shapely
+
+        lat = np.asarray(lat, dtype="float64")
+        lon = np.asarray(lon, dtype="float64")
+        n = len(lat)
+        result = np.full(n, -1, dtype="int64")
+
+        ok = ~(np.isnan(lat) | np.isnan(lon))
+        if not ok.any():
+            return result
+        x, y = self._to_index_crs(lon[ok], lat[ok])
+        x, y = np.asarray(x), np.asarray(y)
+
+        # 1) bbox 후보 (점 번호, 폴리곤 번호)
+        pidx, gidx = self.tree.query(shapely.points(x, y))
+        # 2) 후보 쌍만 정밀 판정
+        hit = shapely.contains_xy(self.geoms[gidx], x[pidx], y[pidx])
+        pidx, gidx = pidx[hit], gidx[hit]
+
+        first = np.full(len(x), np.iinfo("int64").max, dtype="int64")
+        np.minimum.at(first, pidx, gidx)
+        first[first == np.iinfo("int64").max] = -1
+        result[ok] = first
+        return result
+
+    def lookup(self, lat, lon, default=UNKNOWN):
+        """점마다 이름 (없으면 default)"""
+        i = self.locate(lat, lon)
+        return np.where(i >= 0, self.names[np.clip(i, 0, None)], default)
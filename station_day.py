@@ -0,0 +1,43 @@
+# station_day.py
+"""
+지점-일 long 테이블 → (일 × 지점) float32 배열
+
+- animated_map.py (프레임별 색/크기) 와 forecast.py (특성 배열) 공용
+- 기간 안의 모든 날짜를 행으로 두고, 관측 없는 칸은 NaN
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class StationDayCube:
+    """values[컬럼] : (일 수, 지점 수) float32, 관측 없는 칸은 NaN"""
+
+    def __init__(self, dates, stations, lat, lon, values):
+        self.dates = dates
+        self.stations = stations
+        self.lat = lat
+        self.lon = lon
+        self.values = values
+
+    @classmethod
+    def from_frame(cls, df, value_cols, start, end, station_col="지점명", time_col="일시"):
+        dates = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize())
+        t = pd.to_datetime(df[time_col]).dt.normalize()
+        df = df[(t >= dates[0]) & (t <= dates[-1])]
+        t = t[df.index]
+
+        codes, stations = pd.factorize(df[station_col].astype(str), sort=True)
+        day = ((t - dates[0]) // pd.Timedelta(days=1)).to_numpy()
+
+        # 좌표는 지점별 첫 값 (지점 순서 = stations)
+        first = np.unique(codes, return_index=True)[1]
+        lat = df["위도"].to_numpy(dtype="float64")[first]
+        lon = df["경도"].to_numpy(dtype="float64")[first]
+
+        values = {}
+        for col in value_cols:
+            arr = np.full((len(dates), len(stations)), np.nan, dtype="float32")
+            arr[day, codes] = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype="float32")
+            values[col] = arr
+        return cls(dates, np.asarray(stations, dtype=object), lat, lon, values)
@@ -0,0 +1,148 @@
+# station_layer.py
+"""
+지점 마커 일괄 레이어
+
+- 지점마다 folium.CircleMarker 를 만들지 않고, 날짜 하나의 모든 지점을
+  GeoJSON FeatureCollection 하나로 내보냄
+- 색/투명도/툴팁/팝업은 feature.properties 에 넣고 Leaflet 쪽 pointToLayer 하나로 스타일링
+- canvas=True 면 SVG 대신 L.canvas() 렌더러 사용 (지점/날짜가 많을 때 빠름)
+- add_circle_markers: map.py 대시보드의 값 → 색/투명도/툴팁 마커 (벤치마크도 같은 함수 사용)
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+from branca.element import MacroElement
+from jinja2 import Template
+
+from profiling import stage
+
+
+class StationLayer(MacroElement):
+    """GeoJSON FeatureCollection 을 circleMarker 로 그리는 레이어"""
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        {% if this.canvas %}
+        var {{ this.get_name() }}_renderer = L.canvas({padding: 0.5});
+        {% endif %}
+        var {{ this.get_name() }} = L.geoJson({{ this.data }}, {
+            pointToLayer: function (feature, latlng) {
+                return L.circleMarker(latlng, Object.assign(
+                    {},
+                    {{ this.options|tojson }},
+                    {% if this.canvas %}{renderer: {{ this.get_name() }}_renderer},{% endif %}
+                    feature.properties.style
+                ));
+            },
+            onEachFeature: function (feature, layer) {
+                var p = feature.properties;
+                if (p.tooltip) { layer.bindTooltip(p.tooltip); }
+                if (p.popup) { layer.bindPopup(p.popup, {maxWidth: {{ this.popup_width }}}); }
+            }
+        }).addTo({{ this._parent.get_name() }});
+        {% endmacro %}
+    """)
+
+    def __init__(self, features, radius=11, color=None, canvas=False, popup_width=250):
+        super().__init__()
+        self._name = "StationLayer"
+        self.data = json.dumps(
+            {"type": "FeatureCollection", "features": features},
+            ensure_ascii=False, separators=(",", ":"),
+        )
+        self.options = {
+            "radius": radius,
+            "stroke": color is not None,
+            "color": color,
+            "fill": True,
+        }
+        self.canvas = canvas
+        self.popup_width = popup_width
+
+
+def _as_list(value, n):
+    """스칼라면 n 개로 복제, Series/배열이면 list 로"""
+    if value is None:
+        return [None] * n
+    if isinstance(value, (pd.Series, np.ndarray, list)):
+        return list(pd.Series(value).to_numpy())
+    return [value] * n
+
+
+def station_features(df, fill_color, fill_opacity=0.85, tooltip=None, popup=None,
+                     lat_col="위도", lon_col="경도"):
+    """DataFrame → GeoJSON feature 리스트 (위경도 없는 행 제외)"""
+    ok = df[lat_col].notna() & df[lon_col].notna()
+    n = len(df)
+    lat = df[lat_col].to_numpy(dtype=float).round(5)
+    lon = df[lon_col].to_numpy(dtype=float).round(5)
+
+    colors = _as_list(fill_color, n)
+    opacities = [round(float(o), 3) for o in _as_list(fill_opacity, n)]
+    tooltips = _as_list(tooltip, n)
+    popups = _as_list(popup, n)
+
+    features = []
+    for i in np.flatnonzero(ok.to_numpy()):
+        props = {"style": {"fillColor": colors[i], "fillOpacity": opacities[i]}}
+        if tooltips[i] is not None:
+            props["tooltip"] = tooltips[i]
+        if popups[i] is not None:
+            props["popup"] = popups[i]
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon[i], lat[i]]},
+            "properties": props,
+        })
+    return features
+
+
+def add_station_layer(m, df, fill_color, fill_opacity=0.85, tooltip=None, popup=None,
+                      radius=11, color=None, canvas=False, lat_col="위도", lon_col="경도"):
+    """지도 m 에 지점 레이어 하나 추가. fill_color/fill_opacity/tooltip/popup 은 스칼라 또는 행 단위 Series"""
+    features = station_features(df, fill_color, fill_opacity, tooltip, popup, lat_col, lon_col)
+    layer = StationLayer(features, radius=radius, color=color, canvas=canvas)
+    layer.add_to(m)
+    return layer
+
+
+@stage("마커 레이어")
+def add_circle_markers(m, df, value_col, emoji):
+    """map.py 대시보드 마커: 값이 클수록 진하게, 이모지로 변수 구분 (🌧 강수량 / ☀ 일사량 / ⚡ 발전량)"""
+    if df.empty:
+        return
+
+    base_color = {
+        "🌧": (91, 143, 249),
+        "☀": (255, 107, 107),
+        "⚡": (80, 170, 80)
+    }
+
+    unit_map = {"🌧": "mm", "☀": "MJ/m²", "⚡": "kWh"}
+    label_map = {"🌧": "강수량", "☀": "일사량", "⚡": "예측 발전량"}
+
+    # 값 정규화 → 투명도/색 (행 단위 루프 없이 한 번에 계산)
+    vals = df[value_col].astype(float)
+    vmin, vmax = vals.min(), vals.max()
+    norm = (vals - vmin) / (vmax - vmin + 1e-9)
+    opacity = 0.55 + (norm * 0.75)
+
+    r, g, b = base_color[emoji]
+    fill_color = f"rgba({r}, {g}, {b}, " + opacity.astype(str) + ")"
+
+    tooltip_html = (
+        "<b>" + df["지점명"].astype(str) + "</b><br>"
+        + f"{emoji} {label_map[emoji]} : " + df[value_col].astype(str) + f" {unit_map[emoji]}"
+    )
+
+    # 모든 지점을 GeoJSON 레이어 하나로 (테두리 없음, canvas 렌더링)
+    add_station_layer(
+        m, df,
+        fill_color=fill_color,
+        fill_opacity=opacity,
+        tooltip=tooltip_html,
+        radius=11,         # ★ 기존보다 살짝 크게
+        canvas=True,
+    )
@@ -0,0 +1,102 @@
+# station_names.py
+"""
+관측소 이름 유사도 매칭 (difflib.get_close_matches 대체)
+
+- 한글 음절을 초성/중성/종성 자모로 분해 → 자모 2-gram 집합
+  ("북춘천" vs "춘천", "서귀포" vs "서귀포시" 처럼 글자 단위보다 촘촘하게 비교)
+- 기준 이름 목록으로 2-gram 역색인을 한 번 만들고,
+  조회 이름 전체에서 실제로 겹치는 (조회, 이름) 쌍만 np.unique 로 세어 Dice 점수
+"""
+
+import numpy as np
+import pandas as pd
+
+CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+
+def decompose(text):
+    """한글 음절 → 자모 문자열 (그 외 문자는 그대로, 공백 제거)"""
+    out = []
+    for ch in str(text).replace(" ", ""):
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(CHO[code // 588])
+            out.append(JUNG[(code % 588) // 28])
+            if code % 28:
+                out.append(JONG[code % 28])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def bigrams(text):
+    """자모 2-gram 집합 (양 끝 표시 포함)"""
+    s = f"^{decompose(text)}$"
+    return {s[i:i + 2] for i in range(len(s) - 1)}
+
+
+class StationNameIndex:
+    """기준 이름 목록에 대한 자모 2-gram 역색인"""
+
+    def __init__(self, names):
+        self.names = pd.unique(pd.Series(names).dropna().astype(str))
+        self._exact = {n: i for i, n in enumerate(self.names)}
+
+        self.vocab = {}
+        rows, cols = [], []
+        for i, name in enumerate(self.names):
+            for g in bigrams(name):
+                rows.append(i)
+                cols.append(self.vocab.setdefault(g, len(self.vocab)))
+        rows = np.asarray(rows, dtype="int64")
+        cols = np.asarray(cols, dtype="int64")
+
+        # gram 번호 → 해당 gram 을 가진 이름 번호들 (CSR 형태)
+        order = np.argsort(cols, kind="stable")
+        self._post_names = rows[order]
+        self._post_ptr = np.searchsorted(cols[order], np.arange(len(self.vocab) + 1))
+        self._sizes = np.bincount(rows, minlength=len(self.names))
+
+    def resolve(self, queries, cutoff=0.6):
+        """
+        이름 목록을 한 번에 매칭 → DataFrame[조회명, 매칭명, 점수]
+        정확히 같은 이름은 점수 1, cutoff 미만이면 매칭명 None
+        """
+        queries = list(pd.unique(pd.Series(queries).dropna().astype(str)))
+        nq, nn = len(queries), len(self.names)
+        if nq == 0 or nn == 0:
+            return pd.DataFrame({"조회명": queries, "매칭명": [None] * nq, "점수": [0.0] * nq})
+
+        q_idx, n_idx, q_sizes = [], [], np.zeros(nq, dtype="int64")
+        for qi, q in enumerate(queries):
+            grams = bigrams(q)
+            q_sizes[qi] = len(grams)
+            for g in grams:
+                gi = self.vocab.get(g)
+                if gi is None:
+                    continue
+                post = self._post_names[self._post_ptr[gi]:self._post_ptr[gi + 1]]
+                q_idx.append(np.full(len(post), qi))
+                n_idx.append(post)
+
+        # 실제로 나온 (조회, 이름) 쌍만 공통 gram 수 집계 (조회 × 이름 밀집 행렬 없음)
+        best = np.zeros(nq, dtype="int64")
+        score = np.zeros(nq)
+        if q_idx:
+            pair, shared = np.unique(np.concatenate(q_idx) * nn + np.concatenate(n_idx),
+                                     return_counts=True)
+            pq, pn = pair // nn, pair % nn
+            dice = 2 * shared / (q_sizes[pq] + self._sizes[pn])
+            # 조회별 (점수 내림차순, 이름 번호 오름차순) 첫 쌍 → 동점이면 목록 앞쪽
+            order = np.lexsort((pn, -dice, pq))
+            first = order[np.r_[True, pq[order][1:] != pq[order][:-1]]]
+            best[pq[first]] = pn[first]
+            score[pq[first]] = dice[first]
+
+        match = np.where(score >= cutoff, self.names[best], None).astype(object)
+        for qi, q in enumerate(queries):
+            if q in self._exact:
+                match[qi], score[qi] = q, 1.0
+        return pd.DataFrame({"조회명": queries, "매칭명": match, "점수": score})
@@ -0,0 +1,150 @@
+# streaming.py
+"""
+대용량(시간 단위 자료, 수천 개 AWS 지점 등)용 스트리밍 모드
+
+- CLIMATE_STREAMING=1 이면 summer.py / economic_loss_final_v4.py / make_slides.py / graph1.py 가
+  전체 CSV 를 한 번에 올리지 않고 연도 파티션 단위로 병합·집계
+- CSV → 연도 파티션 Parquet 변환도 chunk 단위 (data_store.table_cache_chunked)
+- 파티션마다 합계/개수 같은 부분 집계만 남기고 합쳐서 평균을 계산 → 메모리는 파티션 크기에 비례
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_store import partition_years, read_cache, table_cache_chunked
+
+STREAMING = os.environ.get("CLIMATE_STREAMING", "").lower() in ("1", "true", "yes", "on")
+
+# 산점도/박스플롯용 표본 최대 행 수 (전체 점을 그릴 수 없으므로 균등 표본)
+SAMPLE_ROWS = 200_000
+
+
+# ---------------------------------------------------------
+# 파티션 순회
+# ---------------------------------------------------------
+def iter_table(path, columns=None, sep=",", encoding="utf-8-sig"):
+    """(연도, 해당 연도 DataFrame) 순회"""
+    cache_dir = table_cache_chunked(path, sep, encoding)
+    for year in partition_years(cache_dir):
+        yield year, read_cache(cache_dir, columns, [("연도", "==", year)])
+
+
+def iter_merged(left_path, right_path, on, left_cols=None, right_cols=None, how="inner"):
+    """
+    두 CSV 를 연도 파티션끼리만 병합해서 (연도, 병합 결과) 순회.
+    on 에 일시가 들어 있으면 같은 키는 항상 같은 연도 → 전체 병합과 결과 동일
+    """
+    left_dir = table_cache_chunked(left_path)
+    right_dir = table_cache_chunked(right_path)
+    right_years = set(partition_years(right_dir))
+
+    for year in partition_years(left_dir):
+        if how == "inner" and year not in right_years:
+            continue
+        left = read_cache(left_dir, left_cols, [("연도", "==", year)])
+        # 없는 연도도 같은 스키마의 빈 프레임으로 읽힘 (left join 용)
+        right = read_cache(right_dir, right_cols, [("연도", "==", year)])
+        drop = [c for c in ("연도",) if c in right.columns and c not in on]
+        yield year, pd.merge(left, right.drop(columns=drop), on=on, how=how)
+
+
+def total_rows(path):
+    """chunk 캐시의 전체 행 수 (Parquet 메타데이터만 읽음)"""
+    import pyarrow.dataset as ds
+
+    cache_dir = table_cache_chunked(path)
+    return ds.dataset(os.path.join(cache_dir, "table"), format="parquet",
+                      partitioning="hive").count_rows()
+
+
+# ---------------------------------------------------------
+# 부분 집계 합치기
+# ---------------------------------------------------------
+def combine_sums(partials, keys):
+    """파티션별 합계/개수 프레임들을 키 기준으로 더함"""
+    partials = [p for p in partials if len(p)]
+    if not partials:
+        return pd.DataFrame(columns=keys)
+    return (
+        pd.concat(partials, ignore_index=True)
+        .groupby(keys, observed=True, dropna=False).sum(numeric_only=True)
+        .reset_index()
+    )
+
+
+class LinearMoments:
+    """1차 회귀(np.polyfit deg=1)용 누적 통계. 파티션별 평균/편차곱을 Chan 방식으로 합침"""
+
+    def __init__(self):
+        self.n = 0
+        self.mx = self.my = 0.0
+        self.sxx = self.sxy = 0.0   # Σ(x-x̄)², Σ(x-x̄)(y-ȳ)
+        self.x_max = -np.inf
+
+    def add(self, x, y):
+        x = np.asarray(x, dtype="float64")
+        y = np.asarray(y, dtype="float64")
+        ok = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[ok], y[ok]
+        nb = len(x)
+        if nb == 0:
+            return
+        mxb, myb = x.mean(), y.mean()
+        dx, dy = x - mxb, y - myb
+
+        n = self.n + nb
+        delta_x, delta_y = mxb - self.mx, myb - self.my
+        self.sxx += (dx * dx).sum() + delta_x * delta_x * self.n * nb / n
+        self.sxy += (dx * dy).sum() + delta_x * delta_y * self.n * nb / n
+        self.mx += delta_x * nb / n
+        self.my += delta_y * nb / n
+        self.n = n
+        self.x_max = max(self.x_max, x.max())
+
+    def coef(self):
+        """[기울기, 절편] (np.polyfit 과 같은 순서)"""
+        slope = self.sxy / self.sxx
+        return np.array([slope, self.my - slope * self.mx])
+
+
+# ---------------------------------------------------------
+# 강수량 구간 × 발전량 (make_slides.py / graph1.py 공용)
+# ---------------------------------------------------------
+def rain_power_stats(weather_path, power_path, power_col, bins, labels=None, right=True,
+                     include_lowest=False, rain_col="일강수량(mm)", sample_rows=SAMPLE_ROWS, seed=0):
+    """
+    파티션 한 번 순회로
+      bins   : 구간별 발전량 합계/개수/평균
+      by_rain: 강수량 값별 발전량 합계/개수 (누적 평균용)
+      moments: 강수량-발전량 1차 회귀 누적 합
+      sample : 산점도/박스플롯용 균등 표본
+    """
+    rate = min(1.0, sample_rows / max(total_rows(weather_path), 1))
+    rng = np.random.default_rng(seed)
+    moments = LinearMoments()
+    bin_parts, rain_parts, samples = [], [], []
+
+    for _, part in iter_merged(weather_path, power_path, on=["지점명", "일시"],
+                               left_cols=["지점명", "일시", rain_col],
+                               right_cols=["지점명", "일시", power_col]):
+        x, y = part[rain_col], part[power_col]
+        moments.add(x, y)
+
+        part["강수량_구간"] = pd.cut(x, bins=bins, labels=labels, right=right,
+                                 include_lowest=include_lowest)
+        bin_parts.append(
+            part.groupby("강수량_구간", observed=False)[power_col]
+            .agg(["sum", "count"]).reset_index()
+        )
+        rain_parts.append(
+            part.groupby(rain_col)[power_col].agg(["sum", "count"]).reset_index()
+        )
+        samples.append(part[rng.random(len(part)) < rate])
+
+    by_bin = combine_sums(bin_parts, ["강수량_구간"])
+    by_bin["mean"] = by_bin["sum"] / by_bin["count"].where(by_bin["count"] > 0)
+    by_rain = combine_sums(rain_parts, [rain_col]).sort_values(rain_col)
+    sample = pd.concat(samples, ignore_index=True) if samples else pd.DataFrame()
+    return {"bins": by_bin, "by_rain": by_rain, "moments": moments, "sample": sample}